@@ -0,0 +1,53 @@
+"""API models and helpers for Course Models."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel, Field
+
+
+class CourseDependentsResponse(BaseModel):
+    course: str
+    known_course: bool
+    transitive: bool
+    dependents: list[str] = Field(default_factory=list)
+    direct_count: int = 0
+    transitive_count: int = 0
+
+
+# Request payload for "what should I take next to unlock the most courses".
+class MostUnlockingRequest(BaseModel):
+    completed: list[str] = Field(default_factory=list, description="Already completed courses")
+    limit: int = Field(default=10, ge=1, le=100)
+
+
+class UnlockingCourse(BaseModel):
+    course: str
+    title: str | None = None
+    units: float | None = None
+    unlocks_count: int
+    direct_dependents: list[str] = Field(default_factory=list)
+
+
+class MostUnlockingResponse(BaseModel):
+    courses: list[UnlockingCourse] = Field(default_factory=list)
+
+
+# Request payload for "everything you can take next term".
+class EligibleCoursesRequest(BaseModel):
+    completed: list[str] = Field(default_factory=list, description="Already completed courses")
+    include_unconditional: bool = Field(
+        default=True,
+        description="Include courses with no prerequisites at all, not just ones unlocked by the completed set.",
+    )
+
+
+class EligibleCourse(BaseModel):
+    course: str
+    title: str | None = None
+    units: float | None = None
+    has_prereqs: bool = False
+
+
+class EligibleCoursesResponse(BaseModel):
+    courses: list[EligibleCourse] = Field(default_factory=list)
+    total: int = 0
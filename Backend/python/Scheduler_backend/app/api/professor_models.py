@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ProfessorRatingLookupResponse(BaseModel):
@@ -19,3 +19,16 @@ class ProfessorRatingLookupResponse(BaseModel):
     profile_url: str | None = None
     legacy_id: int | None = None
     source: str = "ratemyprofessors"
+    upstream_error: bool = Field(
+        default=False,
+        description="True when RateMyProfessors could not be reached, so found=False says nothing about the instructor.",
+    )
+
+
+# Request payload for resolving every instructor on a schedule/term in one call.
+class ProfessorRatingsBulkRequest(BaseModel):
+    names: list[str] = Field(..., max_length=200, description="Instructor names as shown in section listings.")
+
+
+class ProfessorRatingsBulkResponse(BaseModel):
+    results: list[ProfessorRatingLookupResponse] = Field(default_factory=list)
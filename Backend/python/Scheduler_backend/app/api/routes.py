@@ -3,89 +3,565 @@
 # API route dependencies.
 from __future__ import annotations
 
-from fastapi import APIRouter, File, HTTPException, Query, UploadFile
+import hmac
+import logging
+import os
+import threading
+import time
+from typing import Callable
+
+from fastapi import APIRouter, BackgroundTasks, File, Header, HTTPException, Query, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
 
 from app.api.models import GenerateRequest, GenerateResponse
-from app.api.professor_models import ProfessorRatingLookupResponse
-from app.core.normalize import norm_course_code
+from app.api.professor_models import (
+    ProfessorRatingLookupResponse,
+    ProfessorRatingsBulkRequest,
+    ProfessorRatingsBulkResponse,
+)
+from app.api.course_models import (
+    CourseDependentsResponse,
+    EligibleCoursesRequest,
+    EligibleCoursesResponse,
+    MostUnlockingRequest,
+    MostUnlockingResponse,
+)
+from app.core.normalize import norm_course_code, normalize_many, normalize_set
 from app.core.scheduler_engine import generate_plan
 
-from app.core.deps_loader import load_dependency_model_from_supabase
-from app.core.catalog_loader import load_catalog_from_supabase
-from app.core.catalog_merge import merge_catalog_into_dependency_model
+from app.core.deps_loader import local_csv_overlay_path
+from app.core.model_store import ModelSnapshot, ModelStore
+from app.core.deps_index import ReverseDependencyIndex, build_reverse_index, unlock_priority_key
+from app.core.eligibility import EligibilityIndex, build_eligibility_index
 
-from app.api.term_models import TermScheduleRequest, TermScheduleResponse
-from app.api.transcript_models import TranscriptParseResponse
+from app.api.term_models import ExplanationJobResponse, SearchStatsResponse, TermScheduleRequest, TermScheduleResponse
+from app.api.transcript_models import TranscriptJobResponse, TranscriptParseResponse
 from app.core.section_loader import load_section_options_for_courses
-from app.core.section_scheduler import pick_ranked_schedules, normalize_professor_name, section_professor_names
-from app.core.schedule_explainer import generate_schedule_benefits
-from app.core.rmp_client import lookup_professor_rating
-from app.core.transcript_parser import parse_transcript_pdf
+from app.core.section_scheduler import SearchStats, pick_ranked_schedules, normalize_professor_name, section_professor_names
+from app.core.schedule_explainer import (
+    explanation_cache_stats,
+    generate_schedule_benefits_batch,
+    immediate_schedule_benefits,
+)
+from app.core.jobs import Job, JobQueueFullError, JobStore
+from app.core.metrics import PROMETHEUS_CONTENT_TYPE, metrics_enabled, record_search, register_collector, render_metrics, stage
+from app.core.profiling import artifact_path, list_profiles, profile_scope, profile_token, record_profile_input, token_matches
+from app.core.result_cache import ResultCache, request_fingerprint
+from app.core.singleflight import SingleFlight
+from app.core.section_ratings import attach_instructor_ratings, passes_min_rating
+from app.core.upstream import upstream_stats
+from app.core.rmp_client import (
+    iter_professor_ratings,
+    lookup_professor_rating,
+    rating_cache_stats,
+    sync_instructor_directory,
+)
+from app.core.transcript_cache import (
+    known_courses_fingerprint,
+    lookup_cached_transcript,
+    parse_and_cache_transcript,
+    transcript_cache_stats,
+)
+from app.core.transcript_pool import TranscriptPDFError, parse_transcript_pdf_isolated, parse_worker_count
 
 from app.core.section_scheduler import parse_days, parse_time_range, parse_single_time, conflicts
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Versioned dependency model; rebuilt in the background and swapped atomically.
+MODEL_STORE = ModelStore()
+MODEL_STORE.register_derived("reverse_index", build_reverse_index)
+MODEL_STORE.register_derived("eligibility_index", build_eligibility_index)
+RETRY_AFTER_SECONDS = 5
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip() or default)
+    except ValueError:
+        return default
+
+
+# Deferred LLM explanations for /term/schedule; results are polled or streamed by job id.
+# Sizes and TTLs come from the environment in configure_from_env(), once .env has been loaded.
+EXPLANATION_JOBS = JobStore("explanations", max_workers=4, max_jobs=2000, ttl_s=600, max_pending=64)
+
+# Finished /term/schedule responses by canonical request; emptied whenever a new model version is published.
+TERM_SCHEDULE_CACHE = ResultCache("term_schedule", max_entries=1024, ttl_s=60)
+MODEL_STORE.on_swap(lambda snapshot: TERM_SCHEDULE_CACHE.clear())
 
-# Cached data loaded once at startup.
-DEP_MODEL = None
-MERGE_SUMMARY = None
-STARTUP_ERROR = None
+# Concurrent identical solves (same canonical fingerprint) wait on one shared computation.
+TERM_SCHEDULE_FLIGHTS = SingleFlight()
+GENERATE_FLIGHTS = SingleFlight()
 
+# Transcript parses run in worker processes; one dispatcher thread per process, bounded queue.
+TRANSCRIPT_JOBS = JobStore("transcripts", max_workers=2, max_jobs=500, ttl_s=600, max_pending=16)
 
-@router.on_event("startup")
-def startup_load() -> None:
+
+def configure_from_env() -> None:
     """
-    Load all required data from Supabase once at startup.
+    Apply the env-driven job queue and result cache settings.
+
+    Called at app startup rather than import, so values from the local .env
+    file (loaded after this module is imported) are honoured.
     """
-    global DEP_MODEL, MERGE_SUMMARY, STARTUP_ERROR
+    EXPLANATION_JOBS.configure(
+        max_workers=int(_env_float("EXPLANATION_JOB_WORKERS", 4)),
+        ttl_s=_env_float("EXPLANATION_JOB_TTL_SECONDS", 600),
+        max_pending=int(_env_float("EXPLANATION_QUEUE_MAX", 64)),
+    )
+    TERM_SCHEDULE_CACHE.configure(
+        max_entries=int(_env_float("TERM_SCHEDULE_CACHE_SIZE", 1024)),
+        ttl_s=_env_float("TERM_SCHEDULE_CACHE_TTL_SECONDS", 60),
+    )
+    TRANSCRIPT_JOBS.configure(
+        max_workers=parse_worker_count(),
+        ttl_s=_env_float("TRANSCRIPT_JOB_TTL_SECONDS", 600),
+        max_pending=int(_env_float("TRANSCRIPT_QUEUE_MAX", 16)),
+    )
 
-    try:
-        DEP_MODEL = load_dependency_model_from_supabase()
-
-        # If you have a Spring/offered-courses table/view, load & merge it.
-        # If you don't want term-scoped offerings yet, you can skip this merge.
-        catalog = load_catalog_from_supabase()
-        MERGE_SUMMARY = merge_catalog_into_dependency_model(
-            DEP_MODEL,
-            catalog=catalog,
-            add_catalog_only_courses=True
+
+TRANSCRIPT_UPLOAD_CHUNK_BYTES = 1024 * 1024
+TRANSCRIPT_MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+CACHE_EVENT_KEYS = ("hit", "stale", "miss", "stored", "invalidated")
+
+
+# Scrape-time view of the caches, job queues, coalescing and circuit breakers for /metrics.
+def _state_metrics():
+    caches = {
+        "term_schedule": TERM_SCHEDULE_CACHE.snapshot(),
+        "ratings": rating_cache_stats(),
+        "explanations": explanation_cache_stats(),
+        "transcripts": transcript_cache_stats(),
+    }
+    yield (
+        "scheduler_cache_events_total", "counter", "Cache lookups and writes by cache and outcome.",
+        [({"cache": name, "event": key}, stats[key]) for name, stats in caches.items() for key in CACHE_EVENT_KEYS if key in stats],
+    )
+    yield (
+        "scheduler_cache_entries", "gauge", "Entries currently held by each cache.",
+        [({"cache": name}, stats.get("entries", stats.get("memory_entries"))) for name, stats in caches.items()],
+    )
+    yield (
+        "scheduler_jobs", "gauge", "Background jobs by queue and state.",
+        [
+            ({"queue": store.name, "state": state}, count)
+            for store in (EXPLANATION_JOBS, TRANSCRIPT_JOBS)
+            for state, count in store.counts().items()
+        ],
+    )
+    yield (
+        "scheduler_jobs_rejected_total", "counter", "Jobs refused because their queue was full.",
+        [({"queue": store.name}, store.rejected) for store in (EXPLANATION_JOBS, TRANSCRIPT_JOBS)],
+    )
+    yield (
+        "scheduler_coalesced_requests_total", "counter", "Requests answered by another in-flight identical solve.",
+        [({"route": "term_schedule"}, TERM_SCHEDULE_FLIGHTS.coalesced), ({"route": "schedule_generate"}, GENERATE_FLIGHTS.coalesced)],
+    )
+    upstreams = upstream_stats()
+    yield (
+        "scheduler_upstream_circuit_open", "gauge", "1 while an upstream's circuit breaker is open or half-open.",
+        [({"upstream": name}, 0 if stats["circuit"] == "closed" else 1) for name, stats in upstreams.items()],
+    )
+
+
+register_collector(_state_metrics)
+
+
+def start_background_load() -> bool:
+    """
+    Kick off the initial model load and the reload watchers.
+
+    Returns True when a new load was started.
+    """
+    started = MODEL_STORE.reload("startup")
+    watch_csv = os.getenv("MODEL_WATCH_CSV", "1").strip().lower() not in {"0", "false", "no"}
+    MODEL_STORE.start_watchers(
+        interval_s=_env_float("MODEL_RELOAD_INTERVAL_SECONDS", 0),
+        watch_path=local_csv_overlay_path() if watch_csv else None,
+        poll_s=_env_float("MODEL_WATCH_POLL_SECONDS", 30),
+        retry_base_s=_env_float("MODEL_RETRY_BASE_SECONDS", 5),
+        retry_max_s=_env_float("MODEL_RETRY_MAX_SECONDS", 300),
+    )
+    return started
+
+
+def _require_model() -> ModelSnapshot:
+    """Return the current model snapshot, or fail fast while the first load is still running."""
+    snapshot = MODEL_STORE.current()
+    if snapshot is not None:
+        return snapshot
+    if MODEL_STORE.status() in {"pending", "loading"}:
+        raise HTTPException(
+            status_code=503,
+            detail={"message": "Dependency model is still loading", "load": MODEL_STORE.progress()},
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
         )
-        STARTUP_ERROR = None
-    except Exception as exc:
-        DEP_MODEL = None
-        MERGE_SUMMARY = None
-        STARTUP_ERROR = str(exc)
+    raise HTTPException(
+        status_code=500,
+        detail=MODEL_STORE.last_error or "Dependency model not loaded",
+    )
 
 
 @router.get("/health")
 def health():
-    if DEP_MODEL is None:
+    snapshot = MODEL_STORE.current()
+    if snapshot is None:
         return {
             "ok": False,
-            "error": STARTUP_ERROR or "Dependency model not loaded",
+            "error": MODEL_STORE.last_error or "Dependency model not loaded",
+            "load": MODEL_STORE.progress(),
+            "load_timings": MODEL_STORE.last_timings,
         }
     return {
         "ok": True,
-        "courses_in_model": len(DEP_MODEL.courses),
-        "merge_summary": (MERGE_SUMMARY.__dict__ if MERGE_SUMMARY else None),
+        "model_version": snapshot.version,
+        "courses_in_model": len(snapshot.dep_model.courses),
+        "merge_summary": (snapshot.merge_summary.__dict__ if snapshot.merge_summary else None),
+        "load": MODEL_STORE.progress(),
+        "load_timings": snapshot.timings,
     }
 
 
+@router.get("/health/live")
+def health_live():
+    """Liveness: the process is up and serving, whether or not data has loaded."""
+    return {"ok": True}
+
+
+@router.get("/health/ready")
+def health_ready():
+    """Readiness: 200 once a model version is published, 503 with progress until then."""
+    if MODEL_STORE.current() is not None:
+        return {"ok": True, "load": MODEL_STORE.progress()}
+    headers = {"Retry-After": str(RETRY_AFTER_SECONDS)} if MODEL_STORE.status() in {"pending", "loading"} else None
+    return JSONResponse(
+        status_code=503,
+        content={"ok": False, "error": MODEL_STORE.last_error, "load": MODEL_STORE.progress()},
+        headers=headers,
+    )
+
+
+def _require_admin(x_admin_token: str | None) -> None:
+    expected = os.getenv("ADMIN_TOKEN", "").strip()
+    if not expected:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN not set).")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, expected):
+        raise HTTPException(status_code=401, detail="Invalid admin token.")
+
+
+@router.get("/health/upstreams")
+def health_upstreams():
+    """Per-upstream circuit state, call/retry/error counts and recent latency percentiles."""
+    return upstream_stats()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Request, stage, solver and upstream latency histograms plus cache/job gauges, in Prometheus text format."""
+    if not metrics_enabled():
+        raise HTTPException(status_code=404, detail="Metrics are disabled (METRICS_ENABLED=0).")
+    return PlainTextResponse(render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+def _require_profile_token(x_debug_profile: str | None) -> None:
+    if not profile_token():
+        raise HTTPException(status_code=403, detail="Profiling is disabled (DEBUG_PROFILE_TOKEN not set).")
+    if not token_matches(x_debug_profile):
+        raise HTTPException(status_code=401, detail="Invalid debug profile token.")
+
+
+@router.get("/debug/profiles")
+def debug_profiles(x_debug_profile: str | None = Header(default=None)):
+    """Saved request profiles, newest first, with their top functions and artifact kinds."""
+    _require_profile_token(x_debug_profile)
+    return {"profiles": list_profiles()}
+
+
+@router.get("/debug/profiles/{profile_id}/{kind}")
+def debug_profile_artifact(profile_id: str, kind: str, x_debug_profile: str | None = Header(default=None)):
+    """Download one artifact of a saved profile: pstats, speedscope, inputs or summary."""
+    _require_profile_token(x_debug_profile)
+    path = artifact_path(profile_id, kind)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile artifact not found.")
+    media_type = "application/octet-stream" if kind == "pstats" else "application/json"
+    return FileResponse(path, media_type=media_type, filename=path.name)
+
+
+@router.post("/admin/reload", status_code=202)
+def admin_reload(x_admin_token: str | None = Header(default=None)):
+    """Rebuild the dependency model and catalog merge in the background."""
+    _require_admin(x_admin_token)
+    started = MODEL_STORE.reload("admin")
+    return {"started": started, "load": MODEL_STORE.progress()}
+
+
+# Last instructor-directory sync outcome, reported by the sync endpoint.
+_directory_sync_lock = threading.Lock()
+_directory_sync_state: dict = {"running": False, "last_result": None, "last_error": None}
+
+
+def _run_directory_sync() -> None:
+    try:
+        result = sync_instructor_directory()
+        logger.info("Instructor directory synced: %s", result)
+        _directory_sync_state.update(last_result=result, last_error=None)
+    except Exception as exc:
+        logger.error("Instructor directory sync failed: %s", exc)
+        _directory_sync_state["last_error"] = str(exc)
+    finally:
+        with _directory_sync_lock:
+            _directory_sync_state["running"] = False
+
+
+@router.post("/admin/professors/sync", status_code=202)
+def admin_professors_sync(background_tasks: BackgroundTasks, x_admin_token: str | None = Header(default=None)):
+    """Download the school's teacher directory in the background and swap it in when complete."""
+    _require_admin(x_admin_token)
+    with _directory_sync_lock:
+        started = not _directory_sync_state["running"]
+        if started:
+            _directory_sync_state["running"] = True
+    if started:
+        background_tasks.add_task(_run_directory_sync)
+    return {"started": started, **_directory_sync_state}
+
+
+def _reverse_index(snapshot: ModelSnapshot) -> ReverseDependencyIndex:
+    return snapshot.derived("reverse_index", build_reverse_index)
+
+
+def _eligibility_index(snapshot: ModelSnapshot) -> EligibilityIndex:
+    return snapshot.derived("eligibility_index", build_eligibility_index)
+
+
+@router.get("/courses/dependents", response_model=CourseDependentsResponse)
+def course_dependents(
+    course: str = Query(..., min_length=1),
+    transitive: bool = Query(default=False, description="Include every course transitively downstream."),
+):
+    snapshot = _require_model()
+    index = _reverse_index(snapshot)
+    code = norm_course_code(course)
+    direct = index.direct_dependents(code)
+    return CourseDependentsResponse(
+        course=code,
+        known_course=code in snapshot.dep_model.courses,
+        transitive=transitive,
+        dependents=index.transitive_dependents(code) if transitive else direct,
+        direct_count=len(direct),
+        transitive_count=index.descendant_count(code),
+    )
+
+
+@router.post("/courses/most-unlocking", response_model=MostUnlockingResponse)
+def courses_most_unlocking(req: MostUnlockingRequest):
+    snapshot = _require_model()
+    model = snapshot.dep_model
+    index = _reverse_index(snapshot)
+    completed = normalize_set(req.completed)
+    eligible = _eligibility_index(snapshot).eligible_courses(completed)
+
+    courses_out = []
+    for code, unlocks in index.most_unlocking_eligible(model, completed, limit=req.limit, eligible=eligible):
+        meta = model.courses.get(code)
+        courses_out.append({
+            "course": code,
+            "title": meta.title if meta else None,
+            "units": meta.units if meta else None,
+            "unlocks_count": unlocks,
+            "direct_dependents": index.direct_dependents(code),
+        })
+    return MostUnlockingResponse(courses=courses_out)
+
+
+@router.post("/courses/eligible", response_model=EligibleCoursesResponse)
+def courses_eligible(req: EligibleCoursesRequest):
+    """Every course whose prerequisite groups are satisfied by the completed set."""
+    snapshot = _require_model()
+    model = snapshot.dep_model
+    index = _eligibility_index(snapshot)
+    completed = normalize_set(req.completed)
+
+    eligible = index.eligible_courses(completed)
+    if not req.include_unconditional:
+        eligible -= index.unconditional
+
+    courses_out = []
+    for code in sorted(eligible):
+        meta = model.courses.get(code)
+        courses_out.append({
+            "course": code,
+            "title": meta.title if meta else None,
+            "units": meta.units if meta else None,
+            "has_prereqs": code in index.group_counts,
+        })
+    return EligibleCoursesResponse(courses=courses_out, total=len(courses_out))
+
+
 @router.get("/professors/rating", response_model=ProfessorRatingLookupResponse)
 def professor_rating(name: str = Query(..., min_length=1)):
     return lookup_professor_rating(name)
 
 
+@router.post("/professors/ratings", response_model=ProfessorRatingsBulkResponse)
+def professor_ratings_bulk(
+    req: ProfessorRatingsBulkRequest,
+    stream: bool = Query(default=False, description="Stream NDJSON lines as each lookup resolves."),
+):
+    """Resolve every instructor for a schedule or term concurrently in one round trip."""
+    if stream:
+        def _lines():
+            for result in iter_professor_ratings(req.names):
+                yield result.model_dump_json() + "\n"
+
+        return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+    by_query = {result.query: result for result in iter_professor_ratings(req.names)}
+    ordered = []
+    for name in req.names:
+        result = by_query.pop(name.strip(), None)
+        if result is not None:
+            ordered.append(result)
+    return ProfessorRatingsBulkResponse(results=ordered)
+
+
+@router.get("/professors/rating/stats")
+def professor_rating_stats():
+    """Hit/miss/stale counts and upstream latency for the persistent rating cache."""
+    return rating_cache_stats()
+
+
+@router.get("/schedule/explanations/stats")
+def schedule_explanation_stats():
+    """Hit/miss counts and tier sizes for the schedule explanation cache, plus deferred job counts."""
+    return {**explanation_cache_stats(), "jobs": EXPLANATION_JOBS.counts(), "jobs_rejected": EXPLANATION_JOBS.rejected}
+
+
+def _explanation_job_response(job: Job) -> ExplanationJobResponse:
+    return ExplanationJobResponse(
+        job_id=job.id,
+        status=job.status,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        schedules=(job.result or {}).get("schedules", []) if job.status == "done" else [],
+    )
+
+
+@router.get("/schedule/explanations/{job_id}", response_model=ExplanationJobResponse)
+def schedule_explanation_job(job_id: str, wait: float = Query(default=0, ge=0, le=30)):
+    """Deferred explanation status; `wait` long-polls up to that many seconds for completion."""
+    job = EXPLANATION_JOBS.wait(job_id, wait) if wait else EXPLANATION_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired explanation job.")
+    return _explanation_job_response(job)
+
+
+# Shared by the explanation and transcript job streams; `render` turns a Job into its response model.
+def _job_event_stream(store: JobStore, job_id: str, render: Callable[[Job], BaseModel]) -> StreamingResponse:
+    """Server-sent events for one job: an event per status change, keep-alives while it waits, ending when it finishes."""
+
+    def _events():
+        job = store.get(job_id)
+        last_status = None
+        while job is not None:
+            if job.status == last_status:
+                yield ": keep-alive\n\n"
+            else:
+                last_status = job.status
+                yield f"event: {job.status}\ndata: {render(job).model_dump_json()}\n\n"
+                if job.finished:
+                    return
+            job = store.wait(job_id, 15, after_status=last_status)
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/schedule/explanations/{job_id}/events")
+def schedule_explanation_events(job_id: str):
+    """Server-sent events: one event per status change (named after the status), ending with done/failed."""
+    if EXPLANATION_JOBS.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired explanation job.")
+
+    return _job_event_stream(EXPLANATION_JOBS, job_id, _explanation_job_response)
+
+
+def _explain_in_background(candidates, ranking_preference, pending, immediate) -> dict:
+    upgraded = generate_schedule_benefits_batch(
+        [candidates[idx] for idx in pending],
+        ranking_preference,
+        budget_s=_env_float("EXPLANATION_JOB_BUDGET_SECONDS", 20),
+        check_cache=False,
+    )
+    bullets = list(immediate)
+    for idx, upgraded_bullets in zip(pending, upgraded):
+        bullets[idx] = upgraded_bullets
+    return {
+        "schedules": [
+            {"rank": rank, "explanation_bullets": schedule_bullets}
+            for rank, schedule_bullets in enumerate(bullets, start=1)
+        ]
+    }
+
+
+def _generate_fingerprint(req: GenerateRequest, snapshot: ModelSnapshot) -> str:
+    return request_fingerprint({
+        "model_version": snapshot.version,
+        "targets": sorted(normalize_set(req.targets)),
+        "completed": sorted(normalize_set(req.completed)),
+        "max_units": req.max_units,
+        "max_courses": req.max_courses,
+        "terms": req.terms,
+        "start_term_index": req.start_term_index,
+        "include_coreqs": req.include_coreqs,
+        "strict_coreq_same_term": req.strict_coreq_same_term,
+        "unknown_course_policy": req.unknown_course_policy,
+    })
+
+
+@router.get("/schedule/generate/stats")
+def schedule_generate_stats():
+    """How many /schedule/generate plans were computed vs. shared with a concurrent identical request."""
+    return {
+        "executed": GENERATE_FLIGHTS.executed,
+        "coalesced": GENERATE_FLIGHTS.coalesced,
+        "in_flight": GENERATE_FLIGHTS.in_flight(),
+    }
+
+
 @router.post("/schedule/generate", response_model=GenerateResponse)
 def schedule_generate(req: GenerateRequest):
-    if DEP_MODEL is None:
-        raise HTTPException(status_code=500, detail="Dependency model not loaded")
+    snapshot = _require_model()
+    with profile_scope("schedule_generate") as profile:
+        if profile is not None:
+            # A profiled request skips coalescing so the artifact shows its own solve.
+            return _generate_plan_response(req, snapshot)
+    response, shared = GENERATE_FLIGHTS.do(
+        _generate_fingerprint(req, snapshot),
+        lambda: _generate_plan_response(req, snapshot),
+    )
+    # Every caller gets its own copy of a shared result.
+    return response.model_copy(deep=True) if shared else response
 
-    targets = {norm_course_code(c) for c in req.targets if norm_course_code(c)}
-    completed = {norm_course_code(c) for c in req.completed if norm_course_code(c)}
+
+def _generate_plan_response(req: GenerateRequest, snapshot: ModelSnapshot) -> GenerateResponse:
+    model = snapshot.dep_model
+
+    targets = normalize_set(req.targets)
+    completed = normalize_set(req.completed)
 
     if req.unknown_course_policy == "error":
-        unknown = sorted([c for c in targets if c not in DEP_MODEL.courses])
+        unknown = sorted([c for c in targets if c not in model.courses])
         if unknown:
             raise HTTPException(status_code=400, detail={"unknown_courses": unknown})
 
@@ -100,17 +576,21 @@ def schedule_generate(req: GenerateRequest):
             expanded.append(terms[(req.start_term_index + i) % len(terms)])
         terms = expanded
 
-    plan = generate_plan(
-        model=DEP_MODEL,
-        targets=targets,
-        completed=set(completed),
-        terms=terms,
-        max_units=req.max_units,
-        max_courses=req.max_courses,
-        include_prereq_closure=True,
-        include_coreqs=req.include_coreqs,
-        strict_coreq_same_term=req.strict_coreq_same_term,
-    )
+    with stage("plan"):
+        # Rank by unlocks inside this plan's own working set (the same set generate_plan builds).
+        plan_courses = model.dependency_closure(targets) - completed
+        plan = generate_plan(
+            model=model,
+            targets=targets,
+            completed=set(completed),
+            terms=terms,
+            max_units=req.max_units,
+            max_courses=req.max_courses,
+            include_prereq_closure=True,
+            include_coreqs=req.include_coreqs,
+            strict_coreq_same_term=req.strict_coreq_same_term,
+            priority_key=unlock_priority_key(_reverse_index(snapshot), model, within=plan_courses),
+        )
 
     # Convert planner output to API response format.
     plan_out = []
@@ -120,7 +600,7 @@ def schedule_generate(req: GenerateRequest):
         total_units_known = True
 
         for code in term_sched.courses:
-            meta = DEP_MODEL.courses.get(code)
+            meta = model.courses.get(code)
             title = meta.title if meta else None
             units = meta.units if meta else None
 
@@ -140,27 +620,162 @@ def schedule_generate(req: GenerateRequest):
     return GenerateResponse(plan=plan_out, unscheduled=plan.unscheduled, warnings=plan.warnings)
 
 
+def _blocked_time_blocks(blocked_times) -> list[tuple[set[int], int, int]]:
+    blocks = []
+    for b in blocked_times:
+        days = set()
+        for d in b.days:
+            days |= parse_days(d) if len(d) > 1 else parse_days(d)  # supports "M" or "Th"
+        t = parse_time_range(f"{b.start}-{b.end}")
+        if days and t:
+            start_min, end_min = t
+            blocks.append((days, start_min, end_min))
+    return blocks
+
+
+def _ranking_preference(constraints) -> str:
+    return (constraints.ranking_preference or "compact").strip().lower()
+
+
+def _locked_sections_by_course(locked_sections, eligible: set[str]) -> dict[str, str]:
+    # Locks on ineligible courses or with blank ids never reach the solver, so they never reach the cache key.
+    locked_by_course = {}
+    for item in locked_sections:
+        locked_course = norm_course_code(item.course)
+        if locked_course in eligible and item.section_id.strip():
+            locked_by_course[locked_course] = item.section_id.strip()
+    return locked_by_course
+
+
+def _term_schedule_fingerprint(req: TermScheduleRequest, snapshot: ModelSnapshot) -> str:
+    """
+    Hash of everything that decides a /term/schedule response, in canonical form.
+
+    Course codes and professor names are normalized and sorted, times are
+    reduced to minutes and days to day numbers, so requests that differ only in
+    spelling or ordering share a cache entry.
+    """
+    c = req.constraints
+
+    def _minutes(value):
+        if not value:
+            return None
+        parsed = parse_single_time(value)
+        return parsed if parsed is not None else value
+
+    requested = sorted(set(normalize_many(req.requested_courses)))
+    completed = normalize_set(req.completed_courses)
+    tracker = _eligibility_index(snapshot).tracker(completed)
+    locked = _locked_sections_by_course(req.locked_sections, {course for course in requested if tracker.is_eligible(course)})
+    days_off = set()
+    for d in c.days_off:
+        days_off |= parse_days(d)
+
+    return request_fingerprint({
+        "model_version": snapshot.version,
+        "term": req.term,
+        "requested": requested,
+        "completed": sorted(completed),
+        "locked": sorted(locked.items()),
+        "earliest": _minutes(c.earliest_time),
+        "latest": _minutes(c.latest_time),
+        "days_off": sorted(days_off),
+        "buffer": c.buffer_minutes,
+        "blocked": sorted((sorted(days), start, end) for days, start, end in _blocked_time_blocks(c.blocked_times)),
+        "min_rating": c.min_instructor_ratings,
+        "unrated": c.unrated_instructor_policy,
+        "preferred": sorted({normalize_professor_name(n) for n in c.preferred_professors} - {""}),
+        "blocked_professors": sorted({normalize_professor_name(n) for n in c.blocked_professors} - {""}),
+        "ranking": _ranking_preference(c),
+        "max_schedules": c.max_schedules,
+        "defer_explanations": req.defer_explanations,
+    })
+
+
+def _with_finished_explanations(response: TermScheduleResponse) -> TermScheduleResponse:
+    """Fold a cached response's finished explanation job back into its bullets."""
+    if not response.explanation_job_id:
+        return response
+    job = EXPLANATION_JOBS.get(response.explanation_job_id)
+    if job is not None and not job.finished:
+        return response
+    if job is None or job.status == "failed":
+        return response.model_copy(update={"explanation_job_id": None})
+    upgraded = {item["rank"]: item["explanation_bullets"] for item in (job.result or {}).get("schedules", [])}
+    schedules = [
+        candidate.model_copy(update={"explanation_bullets": upgraded.get(candidate.rank, candidate.explanation_bullets)})
+        for candidate in response.generated_schedules
+    ]
+    return response.model_copy(update={"generated_schedules": schedules, "explanation_job_id": None})
+
+
+@router.get("/term/schedule/stats")
+def term_schedule_stats():
+    """Hit/miss counts, size and solve latency of the /term/schedule result cache, plus coalesced solves."""
+    return {
+        **TERM_SCHEDULE_CACHE.snapshot(),
+        "coalesced": TERM_SCHEDULE_FLIGHTS.coalesced,
+        "in_flight": TERM_SCHEDULE_FLIGHTS.in_flight(),
+    }
+
+
 @router.post("/term/schedule", response_model=TermScheduleResponse)
 def term_schedule(req: TermScheduleRequest):
-    if DEP_MODEL is None:
-        raise HTTPException(
-            status_code=500,
-            detail=STARTUP_ERROR or "Dependency model not loaded",
-        )
-    # Normalize requested courses
-    requested = [norm_course_code(c) for c in req.requested_courses if norm_course_code(c)]
-    completed = {norm_course_code(c) for c in req.completed_courses if norm_course_code(c)}
+    snapshot = _require_model()
+    with profile_scope("term_schedule") as profile:
+        if profile is not None:
+            # A profiled request skips the cache and coalescing so the artifact shows a real solve.
+            return _solve_term_schedule(req, snapshot)[0]
+    key = _term_schedule_fingerprint(req, snapshot)
+    cached = TERM_SCHEDULE_CACHE.get(key)
+    if cached is not None:
+        # The cache keeps the stored response read-only; callers get their own copy.
+        return _with_finished_explanations(cached).model_copy(deep=True)
+
+    def _compute() -> TermScheduleResponse:
+        started = time.perf_counter()
+        response, cacheable = _solve_term_schedule(req, snapshot)
+        TERM_SCHEDULE_CACHE.observe_compute_ms((time.perf_counter() - started) * 1000)
+        if cacheable:
+            TERM_SCHEDULE_CACHE.put(key, response.model_copy(deep=True))
+        return response
+
+    response, shared = TERM_SCHEDULE_FLIGHTS.do(key, _compute)
+    return response.model_copy(deep=True) if shared else response
+
+
+def _search_stats_response(stats: SearchStats) -> SearchStatsResponse:
+    return SearchStatsResponse(
+        leaves_checked=stats.leaves,
+        nodes_expanded=stats.nodes,
+        conflict_checks=stats.conflict_checks,
+        pruned_sections=stats.pruned,
+        duplicates_skipped=stats.duplicates,
+        candidates_scored=stats.candidates,
+        max_solutions_checked=stats.max_solutions_checked,
+        budget_exhausted=stats.budget_exhausted,
+        solve_ms=stats.solve_ms,
+    )
+
+
+def _solve_term_schedule(req: TermScheduleRequest, snapshot: ModelSnapshot) -> tuple[TermScheduleResponse, bool]:
+    """Build the /term/schedule response; the flag is False when it reflects a transient upstream gap."""
+    model = snapshot.dep_model
+    # Normalize requested courses (sorted, so the result depends only on the canonical request)
+    requested = sorted(set(normalize_many(req.requested_courses)))
+    completed = normalize_set(req.completed_courses)
     if not requested:
-        return TermScheduleResponse(term=req.term, warnings=["No valid requested_courses provided."])
-
-    blocked_by_prereq = {}
-    eligible_requested = []
-    for course in requested:
-        unmet = DEP_MODEL.unmet_prereq_labels(course, completed) if DEP_MODEL is not None else []
-        if unmet:
-            blocked_by_prereq[course] = unmet
-        else:
-            eligible_requested.append(course)
+        return TermScheduleResponse(term=req.term, warnings=["No valid requested_courses provided."]), True
+
+    with stage("prereq_check"):
+        blocked_by_prereq = {}
+        eligible_requested = []
+        tracker = _eligibility_index(snapshot).tracker(completed)
+        for course in requested:
+            if tracker.is_eligible(course):
+                eligible_requested.append(course)
+                continue
+            blocked_by_prereq[course] = model.unmet_prereq_labels(course, completed)
 
     if not eligible_requested:
         warnings = ["No requested courses are currently eligible because prerequisite requirements are not satisfied."]
@@ -171,10 +786,11 @@ def term_schedule(req: TermScheduleRequest):
             term=req.term,
             unscheduled_courses=sorted(set(requested)),
             warnings=warnings,
-        )
+        ), True
 
     # Load section options from Supabase
-    options_by_course = load_section_options_for_courses(eligible_requested)
+    with stage("load_sections"):
+        options_by_course = load_section_options_for_courses(eligible_requested)
     preferred_professors = {
         normalize_professor_name(name)
         for name in req.constraints.preferred_professors
@@ -185,22 +801,11 @@ def term_schedule(req: TermScheduleRequest):
         for name in req.constraints.blocked_professors
         if normalize_professor_name(name)
     }
-    locked_by_course = {
-        norm_course_code(item.course): item.section_id.strip()
-        for item in req.locked_sections
-        if norm_course_code(item.course) and item.section_id.strip() and norm_course_code(item.course) in set(eligible_requested)
-    }
+    locked_by_course = _locked_sections_by_course(req.locked_sections, set(eligible_requested))
+    ranking_preference = _ranking_preference(req.constraints)
 
     # Build blocked time ranges from the request.
-    blocked_blocks = []
-    for b in req.constraints.blocked_times:
-        days = set()
-        for d in b.days:
-            days |= parse_days(d) if len(d) > 1 else parse_days(d)  # supports "M" or "Th"
-        t = parse_time_range(f"{b.start}-{b.end}")
-        if days and t:
-            start_min, end_min = t
-            blocked_blocks.append((days, start_min, end_min))
+    blocked_blocks = _blocked_time_blocks(req.constraints.blocked_times)
 
     earliest_min = None
     latest_min = None
@@ -218,59 +823,99 @@ def term_schedule(req: TermScheduleRequest):
         days_off_set |= parse_days(d)
 
     # Apply user time/day filters before picking sections.
-    for course, opts in list(options_by_course.items()):
-        kept = []
-        for sec in opts:
-            ok = True
-            if blocked_professors and section_professor_names(sec) & blocked_professors:
-                continue
-            for m in sec.meetings:
-                # days off
-                if m.days & days_off_set:
-                    ok = False
-                    break
-
-                # earliest/latest
-                if earliest_min is not None and m.start_min < earliest_min:
-                    ok = False
-                    break
-                if latest_min is not None and m.end_min > latest_min:
-                    ok = False
-                    break
-
-                # blocked times overlap
-                for bd, bs, be in blocked_blocks:
-                    if not (m.days & bd):
-                        continue
-                    # reuse same overlap logic (no buffer for blocked windows)
-                    if not (m.end_min <= bs or be <= m.start_min):
+    with stage("filter_sections"):
+        for course, opts in list(options_by_course.items()):
+            kept = []
+            for sec in opts:
+                ok = True
+                if blocked_professors and section_professor_names(sec) & blocked_professors:
+                    continue
+                for m in sec.meetings:
+                    # days off
+                    if m.days & days_off_set:
+                        ok = False
+                        break
+
+                    # earliest/latest
+                    if earliest_min is not None and m.start_min < earliest_min:
                         ok = False
                         break
-                if not ok:
-                    break
+                    if latest_min is not None and m.end_min > latest_min:
+                        ok = False
+                        break
+
+                    # blocked times overlap
+                    for bd, bs, be in blocked_blocks:
+                        if not (m.days & bd):
+                            continue
+                        # reuse same overlap logic (no buffer for blocked windows)
+                        if not (m.end_min <= bs or be <= m.start_min):
+                            ok = False
+                            break
+                    if not ok:
+                        break
 
-            if ok:
-                kept.append(sec)
+                if ok:
+                    kept.append(sec)
 
-        options_by_course[course] = kept
+            options_by_course[course] = kept
+
+    # Ratings are batch-prefetched for the surviving sections only, so the
+    # minimum-rating check below is a plain field comparison.
+    rating_warnings = []
+    ratings_complete = True
+    min_rating = req.constraints.min_instructor_ratings
+    if min_rating is not None or ranking_preference == "highest_rated":
+        with stage("ratings_prefetch"):
+            prefetch = attach_instructor_ratings(options_by_course)
+        if not prefetch.complete:
+            ratings_complete = False
+            rating_warnings.append(
+                f"Instructor ratings were unavailable for {prefetch.requested - prefetch.resolved} instructor(s); treated as unrated."
+            )
+        if min_rating is not None:
+            removed = 0
+            for course, opts in list(options_by_course.items()):
+                kept = [
+                    sec for sec in opts
+                    if passes_min_rating(sec, min_rating, req.constraints.unrated_instructor_policy)
+                ]
+                removed += len(opts) - len(kept)
+                options_by_course[course] = kept
+            if removed:
+                rating_warnings.append(f"Instructor rating minimum ({min_rating:g}) removed {removed} section(s).")
 
     # Ranking happens only after hard constraints are enforced, so downstream
     # explanations compare schedules that are already conflict-free and allowed.
     # Pick ranked conflict-free schedules from the remaining sections.
-    ranked, failures = pick_ranked_schedules(
-        options_by_course,
-        buffer_min=req.constraints.buffer_minutes,
-        max_results=req.constraints.max_schedules,
-        ranking_preference=req.constraints.ranking_preference,
-        preferred_sections=locked_by_course,
-        preferred_professors=preferred_professors,
-    )
+    record_profile_input("pick_ranked_schedules", {
+        "options_by_course": options_by_course,
+        "buffer_min": req.constraints.buffer_minutes,
+        "max_results": req.constraints.max_schedules,
+        "ranking_preference": ranking_preference,
+        "preferred_sections": locked_by_course,
+        "preferred_professors": preferred_professors,
+    })
+    search_stats = SearchStats()
+    with stage("search"):
+        ranked, failures = pick_ranked_schedules(
+            options_by_course,
+            buffer_min=req.constraints.buffer_minutes,
+            max_results=req.constraints.max_schedules,
+            ranking_preference=ranking_preference,
+            preferred_sections=locked_by_course,
+            preferred_professors=preferred_professors,
+            stats=search_stats,
+        )
+    record_search(search_stats)
+    search_stats_out = _search_stats_response(search_stats)
     best = ranked[0][0] if ranked else []
 
     if not best:
         unscheduled = sorted(list(set(eligible_requested)))
         unscheduled.extend(sorted(blocked_by_prereq.keys()))
         warnings = ["No conflict-free schedule found for the requested courses."]
+        warnings.extend(rating_warnings)
         if locked_by_course:
             warnings.append("Some locked sections could not be used with the current constraints.")
         if failures:
@@ -282,7 +927,8 @@ def term_schedule(req: TermScheduleRequest):
             term=req.term,
             unscheduled_courses=sorted(set(unscheduled)),
             warnings=warnings,
-        )
+            search_stats=search_stats_out,
+        ), ratings_complete
 
     def _serialize_sections(section_list):
         selected_sections = []
@@ -306,29 +952,52 @@ def term_schedule(req: TermScheduleRequest):
                 "course": sec.course,
                 "section_id": sec.section_id,
                 "meetings": meetings,
+                "instructor_rating": sec.instructor_rating,
             })
         return selected_sections
 
     selected_sections = _serialize_sections(best)
     generated_schedules = []
-    for idx, (secs, score, metrics) in enumerate(ranked, start=1):
-        explanation_bullets = generate_schedule_benefits(
-            secs,
-            metrics,
-            req.constraints.ranking_preference,
-        )
-        generated_schedules.append({
-            "rank": idx,
-            "score": score,
-            "metrics": {
-                "days_used": metrics.days_used,
-                "total_gap_minutes": metrics.total_gap_minutes,
-                "earliest_start": metrics.earliest_start,
-                "latest_end": metrics.latest_end,
-            },
-            "explanation_bullets": explanation_bullets,
-            "selected_sections": _serialize_sections(secs),
-        })
+    candidates = [(secs, metrics) for secs, _, metrics in ranked]
+    explanation_job_id = None
+    explanations_queued = True
+    with stage("explain"):
+        if req.defer_explanations:
+            # Respond with cached/heuristic bullets now; LLM bullets for the rest arrive via the job.
+            all_bullets, pending = immediate_schedule_benefits(candidates, ranking_preference)
+            if pending:
+                try:
+                    job = EXPLANATION_JOBS.submit(
+                        "schedule_explanations",
+                        _explain_in_background,
+                        candidates,
+                        ranking_preference,
+                        pending,
+                        all_bullets,
+                    )
+                    explanation_job_id = job.id
+                except JobQueueFullError:
+                    # The LLM backlog is full: keep the heuristic bullets and don't cache this response,
+                    # so a later identical request can still queue an upgrade.
+                    explanations_queued = False
+        else:
+            # All ranked schedules are explained together under one shared time budget.
+            all_bullets = generate_schedule_benefits_batch(candidates, ranking_preference)
+    with stage("serialize"):
+        for idx, ((secs, score, metrics), explanation_bullets) in enumerate(zip(ranked, all_bullets), start=1):
+            generated_schedules.append({
+                "rank": idx,
+                "score": score,
+                "metrics": {
+                    "days_used": metrics.days_used,
+                    "total_gap_minutes": metrics.total_gap_minutes,
+                    "earliest_start": metrics.earliest_start,
+                    "latest_end": metrics.latest_end,
+                    "avg_instructor_rating": metrics.avg_instructor_rating,
+                },
+                "explanation_bullets": explanation_bullets,
+                "selected_sections": _serialize_sections(secs),
+            })
 
     scheduled_courses = {s["course"] for s in selected_sections}
     unscheduled = sorted([c for c in eligible_requested if c not in scheduled_courses])
@@ -356,6 +1025,11 @@ def term_schedule(req: TermScheduleRequest):
             warnings.append("None of your pinned professors were available in the selected schedule.")
     if blocked_professors and failures:
         warnings.append("Some professor blocks reduced section availability.")
+    warnings.extend(rating_warnings)
+    if search_stats.budget_exhausted:
+        warnings.append(
+            f"Search stopped after checking {search_stats.leaves} schedules; better options may exist than the ones ranked."
+        )
 
     return TermScheduleResponse(
         term=req.term,
@@ -363,27 +1037,49 @@ def term_schedule(req: TermScheduleRequest):
         generated_schedules=generated_schedules,
         unscheduled_courses=sorted(set(unscheduled)),
         warnings=warnings,
-    )
+        explanation_job_id=explanation_job_id,
+        search_stats=search_stats_out,
+    ), ratings_complete and explanations_queued
 
 
-@router.post("/transcript/parse", response_model=TranscriptParseResponse)
-async def transcript_parse(file: UploadFile = File(...)):
-    filename = (file.filename or "").lower()
-    if not filename.endswith(".pdf"):
-        raise HTTPException(status_code=400, detail="Upload a PDF transcript.")
+@router.get("/transcript/parse/stats")
+def transcript_parse_stats():
+    """Hit/miss counts and size of the content-addressed transcript parse cache, plus parse job counts."""
+    return {**transcript_cache_stats(), "jobs": TRANSCRIPT_JOBS.counts()}
 
-    file_bytes = await file.read()
-    if not file_bytes:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
 
-    known_courses = set(DEP_MODEL.courses.keys()) if DEP_MODEL is not None else set()
-    try:
-        parsed = parse_transcript_pdf(file_bytes, known_courses=known_courses)
-    except RuntimeError as exc:
-        raise HTTPException(status_code=500, detail=str(exc)) from exc
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Failed to parse transcript PDF: {exc}") from exc
+def transcript_max_upload_bytes() -> int:
+    return int(_env_float("TRANSCRIPT_MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+
+
+def transcript_max_body_bytes() -> int:
+    # The raw multipart body also carries boundaries and part headers; leave room for them so
+    # a PDF exactly at the limit still reaches _read_upload_limited's exact check.
+    return transcript_max_upload_bytes() + TRANSCRIPT_MULTIPART_OVERHEAD_BYTES
+
+
+async def _read_upload_limited(file: UploadFile) -> bytes:
+    """
+    Read the spooled upload in chunks, refusing it once it passes TRANSCRIPT_MAX_UPLOAD_BYTES.
 
+    BodySizeLimitMiddleware has already capped the raw request body, so this is
+    only the exact per-file check.
+    """
+    limit = transcript_max_upload_bytes()
+    chunks: list[bytes] = []
+    received = 0
+    while True:
+        chunk = await file.read(TRANSCRIPT_UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        received += len(chunk)
+        if received > limit:
+            raise HTTPException(status_code=413, detail=f"Transcript PDF is larger than {limit} bytes.")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _transcript_response(parsed, cache_hit: bool) -> dict:
     return TranscriptParseResponse(
         student={
             "name": parsed.student_name,
@@ -395,4 +1091,107 @@ async def transcript_parse(file: UploadFile = File(...)):
         warnings=parsed.warnings,
         total_pages=parsed.total_pages,
         extracted_text_chars=parsed.extracted_text_chars,
+        ocr_pages=parsed.ocr_pages,
+        cache_hit=cache_hit,
+    ).model_dump()
+
+
+def _parse_transcript_job(file_bytes: bytes, known_courses, catalog_fingerprint: str) -> dict:
+    parsed = parse_and_cache_transcript(
+        file_bytes,
+        known_courses,
+        catalog_fingerprint=catalog_fingerprint,
+        parse_fn=parse_transcript_pdf_isolated,
+    )
+    return _transcript_response(parsed, cache_hit=False)
+
+
+async def _submit_transcript_job(file: UploadFile) -> Job:
+    filename = (file.filename or "").lower()
+    if not filename.endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Upload a PDF transcript.")
+
+    file_bytes = await _read_upload_limited(file)
+    if not file_bytes:
+        raise HTTPException(status_code=400, detail="Uploaded file is empty.")
+
+    snapshot = MODEL_STORE.current()
+    known_courses = (
+        snapshot.derived("known_courses", lambda model: frozenset(model.courses))
+        if snapshot is not None
+        else frozenset()
     )
+    catalog_fingerprint = (
+        snapshot.derived("known_courses_fingerprint", lambda model: known_courses_fingerprint(model.courses))
+        if snapshot is not None
+        else known_courses_fingerprint(known_courses)
+    )
+    # Hits are answered here, before admission, so they never take a queue slot or get a 429.
+    cached = await run_in_threadpool(lookup_cached_transcript, file_bytes, catalog_fingerprint)
+    if cached is not None:
+        return TRANSCRIPT_JOBS.add_done("transcript_parse", _transcript_response(cached, cache_hit=True))
+    try:
+        return TRANSCRIPT_JOBS.submit("transcript_parse", _parse_transcript_job, file_bytes, known_courses, catalog_fingerprint)
+    except JobQueueFullError as exc:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many transcripts are being parsed right now. Try again shortly.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+        ) from exc
+
+
+def _transcript_job_response(job: Job) -> TranscriptJobResponse:
+    return TranscriptJobResponse(
+        job_id=job.id,
+        status=job.status,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+        error=job.error,
+        result=job.result if job.status == "done" else None,
+    )
+
+
+def _raise_for_failed_transcript(job: Job) -> None:
+    status = 400 if job.error_type == TranscriptPDFError.__name__ else 500
+    raise HTTPException(status_code=status, detail=job.error)
+
+
+@router.post("/transcript/parse", response_model=TranscriptParseResponse)
+async def transcript_parse(file: UploadFile = File(...)):
+    """Parse a transcript and wait for it; the work runs in a parse worker process, off the event loop."""
+    submitted = await _submit_transcript_job(file)
+    wait_s = _env_float("TRANSCRIPT_PARSE_WAIT_SECONDS", 120)
+    job = await run_in_threadpool(TRANSCRIPT_JOBS.wait, submitted.id, wait_s)
+    if job is None or not job.finished:
+        raise HTTPException(
+            status_code=504,
+            detail={"message": "Transcript parsing is taking too long; poll the job instead.", "job_id": submitted.id},
+        )
+    if job.status == "failed":
+        _raise_for_failed_transcript(job)
+    return job.result
+
+
+@router.post("/transcript/jobs", response_model=TranscriptJobResponse, status_code=202)
+async def transcript_job_submit(file: UploadFile = File(...)):
+    """Queue a transcript parse and return its job id; poll or stream /transcript/jobs/{job_id}."""
+    job = await _submit_transcript_job(file)
+    return _transcript_job_response(job)
+
+
+@router.get("/transcript/jobs/{job_id}", response_model=TranscriptJobResponse)
+def transcript_job_status(job_id: str, wait: float = Query(default=0, ge=0, le=30)):
+    """Transcript job status and, once done, its parse result; `wait` long-polls up to that many seconds."""
+    job = TRANSCRIPT_JOBS.wait(job_id, wait) if wait else TRANSCRIPT_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired transcript job.")
+    return _transcript_job_response(job)
+
+
+@router.get("/transcript/jobs/{job_id}/events")
+def transcript_job_events(job_id: str):
+    """Server-sent events: one event per status change (named after the status), ending with done/failed."""
+    if TRANSCRIPT_JOBS.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired transcript job.")
+
+    return _job_event_stream(TRANSCRIPT_JOBS, job_id, _transcript_job_response)
@@ -1,7 +1,7 @@
 """API models and helpers for Term Models."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Literal, Optional
 
 
 # One blocked time window provided by the user.
@@ -51,7 +51,11 @@ class TermConstraints(BaseModel):
         default=None,
         ge=0,
         le=5,
-        description="Future feature minimun instructor rating [0-5], section below are filtered out if below minimum"
+        description="Minimum instructor rating [0-5]; sections taught by lower-rated instructors are filtered out"
+    )
+    unrated_instructor_policy: Literal["allow", "exclude"] = Field(
+        default="allow",
+        description="How min_instructor_ratings treats instructors with no ratings: allow | exclude"
     )
     preferred_professors: list[str] = Field(
         default_factory=list,
@@ -63,7 +67,7 @@ class TermConstraints(BaseModel):
     )
     ranking_preference: str = Field(
         default="compact",
-        description="Ranking preference: compact | fewest_days | latest_start | earliest_end"
+        description="Ranking preference: compact | fewest_days | latest_start | earliest_end | highest_rated"
     )
     max_schedules: int = Field(
         default=3,
@@ -85,6 +89,10 @@ class TermScheduleRequest(BaseModel):
     completed_courses: list[str] = Field(default_factory=list)
     locked_sections: list[LockedSection] = Field(default_factory=list)
     constraints: TermConstraints = Field(default_factory=TermConstraints)
+    defer_explanations: bool = Field(
+        default=True,
+        description="Return heuristic explanation bullets immediately and compute LLM bullets in a background job."
+    )
 
 
 # One meeting row in the selected schedule output.
@@ -103,6 +111,7 @@ class SelectedSection(BaseModel):
     course: str
     section_id: str
     meetings: list[SelectedMeeting]
+    instructor_rating: Optional[float] = None
 
 
 class ScheduleCandidate(BaseModel):
@@ -113,6 +122,21 @@ class ScheduleCandidate(BaseModel):
     selected_sections: list[SelectedSection] = Field(default_factory=list)
 
 
+# Work done by the section search for one /term/schedule solve.
+class SearchStatsResponse(BaseModel):
+    leaves_checked: int = Field(description="Complete schedules reached; counts against max_solutions_checked.")
+    nodes_expanded: int = Field(description="Partial schedules extended by one more course.")
+    conflict_checks: int
+    pruned_sections: int = Field(description="Section choices rejected because they conflicted with the partial schedule.")
+    duplicates_skipped: int
+    candidates_scored: int
+    max_solutions_checked: int
+    budget_exhausted: bool = Field(
+        description="True when the search stopped at max_solutions_checked, so better schedules may exist than the ones ranked."
+    )
+    solve_ms: float
+
+
 # Response payload for term schedule generation.
 class TermScheduleResponse(BaseModel):
     term: str
@@ -120,3 +144,27 @@ class TermScheduleResponse(BaseModel):
     generated_schedules: list[ScheduleCandidate] = Field(default_factory=list)
     unscheduled_courses: list[str] = Field(default_factory=list)
     warnings: list[str] = Field(default_factory=list)
+    explanation_job_id: Optional[str] = Field(
+        default=None,
+        description="Poll /schedule/explanations/{id} (or its /events stream) for LLM explanation bullets."
+    )
+    search_stats: Optional[SearchStatsResponse] = Field(
+        default=None,
+        description="Section search counters; absent when no search ran (no eligible courses)."
+    )
+
+
+# Upgraded explanation bullets for one ranked schedule.
+class ScheduleExplanation(BaseModel):
+    rank: int
+    explanation_bullets: list[str] = Field(default_factory=list)
+
+
+# Status of a deferred explanation job.
+class ExplanationJobResponse(BaseModel):
+    job_id: str
+    status: str
+    created_at: float
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    schedules: list[ScheduleExplanation] = Field(default_factory=list)
@@ -34,3 +34,14 @@ class TranscriptParseResponse(BaseModel):
     warnings: list[str] = Field(default_factory=list)
     total_pages: int = 0
     extracted_text_chars: int = 0
+    ocr_pages: list[int] = Field(default_factory=list, description="1-based pages whose text came from OCR.")
+    cache_hit: bool = Field(default=False, description="True when this exact PDF was parsed before against the same catalog.")
+
+
+class TranscriptJobResponse(BaseModel):
+    job_id: str
+    status: str = Field(description="queued, running, done or failed.")
+    created_at: float
+    finished_at: float | None = None
+    error: str | None = None
+    result: TranscriptParseResponse | None = None
@@ -0,0 +1,74 @@
+"""Core scheduling backend logic for Body Limit."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Sequence
+
+from starlette.responses import JSONResponse
+
+
+class BodyTooLargeError(RuntimeError):
+    """The request body passed the configured limit while it was being received."""
+
+
+class BodySizeLimitMiddleware:
+    """
+    ASGI middleware that caps request bodies under some path prefixes.
+
+    A declared Content-Length over the limit is refused before the app runs;
+    otherwise the body is counted as it is received and the request is cut off
+    with 413 as soon as it passes the limit, so Starlette never spools more
+    than that to memory or disk. `max_bytes` is read per request.
+    """
+
+    def __init__(self, app: Any, *, path_prefixes: Sequence[str], max_bytes: Callable[[], int]) -> None:
+        self.app = app
+        self.path_prefixes = tuple(path_prefixes)
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not scope.get("path", "").startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.max_bytes()
+        declared = dict(scope.get("headers") or []).get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            await self._refuse(scope, receive, send, limit)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def _receive() -> Dict[str, Any]:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    exceeded = True
+                    raise BodyTooLargeError(f"request body passed {limit} bytes")
+            return message
+
+        async def _send(message: Dict[str, Any]) -> None:
+            nonlocal response_started
+            if exceeded and not response_started:
+                # Form parsing turns our error into its own 400; the 413 below replaces it.
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, _receive, _send)
+        except BodyTooLargeError:
+            if response_started:
+                raise
+        if exceeded and not response_started:
+            await self._refuse(scope, receive, send, limit)
+
+    @staticmethod
+    async def _refuse(scope: Dict[str, Any], receive: Any, send: Any, limit: int) -> None:
+        response = JSONResponse({"detail": f"Request body is larger than {limit} bytes."}, status_code=413)
+        await response(scope, receive, send)
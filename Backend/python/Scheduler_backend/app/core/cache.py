@@ -0,0 +1,214 @@
+"""Core scheduling backend logic for Cache."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+# Default on-disk location for persistent caches (gitignored, survives restarts on the same volume).
+DEFAULT_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache"
+
+
+# One stored value plus its freshness window.
+@dataclass(frozen=True)
+class CacheEntry:
+    value: Any
+    stored_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class SqliteTTLCache:
+    """
+    Small persistent key/value cache with per-entry TTLs.
+
+    Backed by SQLite in WAL mode so several worker processes can share one file.
+    Values are stored as JSON. `get` returns expired entries too, so callers can
+    serve stale data while they refresh it.
+    """
+
+    def __init__(self, path: Optional[Path], *, namespace: str, max_entries: int = 0) -> None:
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+
+        if path is None:
+            target = ":memory:"
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            target = str(path)
+        self._conn = sqlite3.connect(target, timeout=5.0, check_same_thread=False, isolation_level=None)
+        with self._lock:
+            if path is not None:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS cache_entries_stored_at ON cache_entries (namespace, stored_at)"
+            )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+        if row is None:
+            return None
+        try:
+            value = json.loads(row[0])
+        except ValueError:
+            return None
+        return CacheEntry(value=value, stored_at=row[1], expires_at=row[2])
+
+    def set(self, key: str, value: Any, ttl_s: float) -> None:
+        now = time.time()
+        payload = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, stored_at, expires_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, now, now + ttl_s),
+            )
+            self._writes_since_prune += 1
+            if self.max_entries > 0 and self._writes_since_prune >= max(1, self.max_entries // 10):
+                self._prune_locked()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (self.namespace,))
+
+    def size(self) -> int:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+        return int(row[0]) if row else 0
+
+    def _prune_locked(self) -> None:
+        # Drop the oldest rows beyond max_entries; pruning in batches keeps writes cheap.
+        self._writes_since_prune = 0
+        row = self._conn.execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        overflow = (int(row[0]) if row else 0) - self.max_entries
+        if overflow <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache_entries WHERE namespace = ? ORDER BY stored_at ASC LIMIT ?)",
+            (self.namespace, self.namespace, overflow),
+        )
+
+
+class MemoryLRUCache:
+    """
+    Bounded in-process LRU with an optional per-entry TTL.
+
+    Used as the fast tier in front of SqliteTTLCache (or alone); unlike the
+    SQLite cache it drops expired entries instead of returning them.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not entry.fresh:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def set(self, key: str, value: Any, ttl_s: float = float("inf")) -> None:
+        now = time.time()
+        with self._lock:
+            self._entries[key] = CacheEntry(value=value, stored_at=now, expires_at=now + ttl_s)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def resize(self, max_entries: int) -> None:
+        """Change the bound, evicting the least recently used entries that no longer fit."""
+        with self._lock:
+            self.max_entries = max(1, max_entries)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Hit/miss/latency counters shared by the caches in this package.
+class CacheStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.latency_count = 0
+        self.latency_total_ms = 0.0
+        self.latency_max_ms = 0.0
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def observe_ms(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.latency_count += 1
+            self.latency_total_ms += elapsed_ms
+            self.latency_max_ms = max(self.latency_max_ms, elapsed_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self.counts)
+            lookups = sum(counts.get(k, 0) for k in ("hit", "stale", "miss"))
+            served = counts.get("hit", 0) + counts.get("stale", 0)
+            return {
+                **counts,
+                "hit_rate": round(served / lookups, 4) if lookups else None,
+                "upstream_calls": self.latency_count,
+                "upstream_avg_ms": round(self.latency_total_ms / self.latency_count, 1) if self.latency_count else None,
+                "upstream_max_ms": round(self.latency_max_ms, 1),
+            }
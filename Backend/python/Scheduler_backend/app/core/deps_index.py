@@ -0,0 +1,145 @@
+"""Core scheduling backend logic for Deps Index."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .deps_model import DependencyModel
+
+
+# Reverse prereq adjacency plus precomputed downstream sets, built once per model version.
+@dataclass(frozen=True)
+class ReverseDependencyIndex:
+    dependents: Dict[str, FrozenSet[str]]    # prereq -> courses that list it as a prereq
+    descendants: Dict[str, FrozenSet[str]]   # prereq -> every course transitively downstream
+    by_unlock_count: Tuple[str, ...]         # courses with dependents, most-unlocking first
+
+    def direct_dependents(self, course: str) -> List[str]:
+        return sorted(self.dependents.get(course, frozenset()))
+
+    def transitive_dependents(self, course: str) -> List[str]:
+        return sorted(self.descendants.get(course, frozenset()))
+
+    def descendant_count(self, course: str) -> int:
+        return len(self.descendants.get(course, frozenset()))
+
+    def most_unlocking_eligible(
+        self,
+        model: DependencyModel,
+        completed: Set[str],
+        *,
+        limit: int = 10,
+        eligible: Optional[Set[str]] = None,
+    ) -> List[Tuple[str, int]]:
+        """
+        Return (course, descendant_count) for the not-yet-completed courses whose
+        prereqs are satisfied, ordered by how many downstream courses they unlock.
+
+        Pass a precomputed `eligible` set (see eligibility.py) to skip per-course prereq checks.
+        """
+        out: List[Tuple[str, int]] = []
+        for course in self.by_unlock_count:
+            if course in completed:
+                continue
+            if eligible is not None:
+                if course not in eligible:
+                    continue
+            elif not model.prereqs_satisfied(course, completed):
+                continue
+            out.append((course, len(self.descendants[course])))
+            if len(out) >= limit:
+                break
+        return out
+
+
+def _reachable(start: str, dependents: Dict[str, Set[str]]) -> Set[str]:
+    seen: Set[str] = set()
+    stack = list(dependents.get(start, ()))
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        stack.extend(dependents.get(node, ()))
+    seen.discard(start)
+    return seen
+
+
+def build_reverse_index(model: DependencyModel) -> ReverseDependencyIndex:
+    """
+    Invert `model.prereqs` and compute each course's transitive dependents.
+
+    Descendant sets are filled leaves-first (Kahn order on the reversed graph)
+    so each course unions its children's sets once; courses caught in a prereq
+    cycle fall back to a plain traversal.
+    """
+    dependents: Dict[str, Set[str]] = {}
+    for course, prereqs in model.prereqs.items():
+        for prereq in prereqs:
+            dependents.setdefault(prereq, set()).add(course)
+
+    nodes: Set[str] = set(dependents)
+    for children in dependents.values():
+        nodes.update(children)
+
+    # Process a node only once all of its dependents have their descendant sets.
+    pending_children: Dict[str, int] = {node: len(dependents.get(node, ())) for node in nodes}
+    parents: Dict[str, Set[str]] = {}
+    for parent, children in dependents.items():
+        for child in children:
+            parents.setdefault(child, set()).add(parent)
+
+    descendants: Dict[str, FrozenSet[str]] = {}
+    ready = [node for node, count in pending_children.items() if count == 0]
+    while ready:
+        node = ready.pop()
+        acc: Set[str] = set()
+        for child in dependents.get(node, ()):
+            acc.add(child)
+            acc |= descendants[child]
+        descendants[node] = frozenset(acc)
+        for parent in parents.get(node, ()):
+            pending_children[parent] -= 1
+            if pending_children[parent] == 0:
+                ready.append(parent)
+
+    for node in nodes:
+        if node not in descendants:
+            descendants[node] = frozenset(_reachable(node, dependents))
+
+    with_dependents = [node for node in nodes if descendants[node]]
+    with_dependents.sort(key=lambda c: (-len(descendants[c]), c))
+
+    return ReverseDependencyIndex(
+        dependents={course: frozenset(children) for course, children in dependents.items()},
+        descendants={course: found for course, found in descendants.items() if found},
+        by_unlock_count=tuple(with_dependents),
+    )
+
+
+def unlock_priority_key(
+    index: ReverseDependencyIndex,
+    model: DependencyModel,
+    within: Optional[Set[str]] = None,
+) -> Callable[[str], Tuple[int, int, str]]:
+    """
+    Planner sort key: unlock more downstream courses first, then fewer prereqs, then code.
+
+    With `within` (the plan's working set), only downstream courses inside it
+    count, so a course that gates many courses the student is not planning does
+    not jump ahead.
+    """
+    if within is None:
+        def _unlocks(course: str) -> int:
+            return index.descendant_count(course)
+    else:
+        counts = {course: len(index.descendants.get(course, frozenset()) & within) for course in within}
+
+        def _unlocks(course: str) -> int:
+            return counts.get(course, 0)
+
+    def _key(course: str) -> Tuple[int, int, str]:
+        return (-_unlocks(course), len(model.prereqs.get(course, ())), course)
+
+    return _key
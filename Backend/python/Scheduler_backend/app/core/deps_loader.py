@@ -3,19 +3,31 @@
 from __future__ import annotations
 
 import csv
+import hashlib
 import os
+import pickle
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Set, Any, List
+from typing import Dict, Set, Any, List, Optional
 
 from .deps_model import DependencyModel, CourseMeta
-from .normalize import norm_course_code, split_codes
+from .normalize import alias_fingerprint, norm_course_code, split_codes
 from .supabase_client import get_supabase
 
 
+# Bump when the parsed overlay layout changes so stale cache files are ignored.
+OVERLAY_CACHE_FORMAT = 1
+
+
 def _new_model() -> DependencyModel:
     return DependencyModel(courses={}, prereqs={}, coreqs={})
 
 
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
 def _merge_models(base: DependencyModel, overlay: DependencyModel) -> DependencyModel:
     for code, meta in overlay.courses.items():
         existing = base.courses.get(code)
@@ -78,22 +90,161 @@ def _load_dependency_model_from_local_csv(csv_path: Path) -> DependencyModel:
     return model
 
 
+def local_csv_overlay_path() -> Path:
+    return Path(
+        os.getenv(
+            "DEPS_LOCAL_CSV_PATH",
+            str(Path(__file__).resolve().parents[2] / "data" / "pre_req_filtered.csv"),
+        ).strip()
+    )
+
+
+def _overlay_cache_path(csv_path: Path) -> Path:
+    cache_dir = os.getenv(
+        "DEPS_CACHE_DIR",
+        str(Path(__file__).resolve().parents[2] / ".cache"),
+    ).strip()
+    return Path(cache_dir) / f"{csv_path.stem}.overlay.pickle"
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_overlay_cache(cache_path: Path) -> Optional[dict]:
+    try:
+        with cache_path.open("rb") as handle:
+            cached = pickle.load(handle)
+    except Exception:
+        return None
+    if not isinstance(cached, dict) or cached.get("format") != OVERLAY_CACHE_FORMAT:
+        return None
+    return cached
+
+
+def _write_overlay_cache(cache_path: Path, entry: dict) -> None:
+    # Write to a sibling temp file and rename so a crash never leaves a torn cache.
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("wb") as handle:
+            pickle.dump(entry, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_local_csv_overlay(csv_path: Path, timings: Optional[Dict[str, Any]] = None) -> DependencyModel:
+    """
+    Parse the local prereq CSV overlay, reusing a compiled pickle when possible.
+
+    The cache is keyed on the file's mtime/size first and falls back to a
+    content hash, so a touched-but-unchanged file still hits.
+    """
+    started = time.perf_counter()
+    stats = timings if timings is not None else {}
+
+    if not csv_path.exists():
+        stats["deps_csv_overlay_cache"] = "missing"
+        stats["deps_csv_overlay_ms"] = _elapsed_ms(started)
+        return _new_model()
+
+    cache_enabled = os.getenv("DEPS_CSV_CACHE", "1").strip().lower() not in {"0", "false", "no"}
+    stat = csv_path.stat()
+    cache_path = _overlay_cache_path(csv_path)
+    cached = _read_overlay_cache(cache_path) if cache_enabled else None
+
+    model: Optional[DependencyModel] = None
+    digest: Optional[str] = None
+    # Codes are stored normalized, so a different alias table means a re-parse.
+    if (
+        cached is not None
+        and cached.get("source") == str(csv_path.resolve())
+        and cached.get("aliases") == alias_fingerprint()
+    ):
+        if cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size:
+            model = cached.get("model")
+        else:
+            digest = _file_sha256(csv_path)
+            if digest == cached.get("sha256"):
+                model = cached.get("model")
+                # Refresh the stat key so the next boot skips hashing.
+                _write_overlay_cache(cache_path, {**cached, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size})
+
+    if isinstance(model, DependencyModel):
+        stats["deps_csv_overlay_cache"] = "hit"
+    else:
+        model = _load_dependency_model_from_local_csv(csv_path)
+        stats["deps_csv_overlay_cache"] = "miss" if cache_enabled else "disabled"
+        if cache_enabled:
+            _write_overlay_cache(
+                cache_path,
+                {
+                    "format": OVERLAY_CACHE_FORMAT,
+                    "source": str(csv_path.resolve()),
+                    "aliases": alias_fingerprint(),
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "sha256": digest or _file_sha256(csv_path),
+                    "model": model,
+                },
+            )
+
+    stats["deps_csv_overlay_ms"] = _elapsed_ms(started)
+    return model
+
+
+# Read every row of a table, one PostgREST page at a time.
+def _fetch_all_rows(table: str, select_str: str, page_size: int, order_cols: List[str]) -> List[dict]:
+    sb = get_supabase()
+    all_rows: List[dict] = []
+    start = 0
+    while True:
+        # Without an ORDER BY, Postgres may return rows in a different order per
+        # page, so offset paging could repeat or skip rows.
+        q = sb.table(table).select(select_str)
+        for col in order_cols:
+            q = q.order(col)
+        res = q.range(start, start + page_size - 1).execute()
+        rows = res.data or []
+        if not rows:
+            break
+        all_rows.extend(rows)
+        # If fewer than page_size rows returned, we reached the end
+        if len(rows) < page_size:
+            break
+        start += page_size
+    return all_rows
+
+
 # Build DependencyModel from Supabase using configured table shape.
-def load_dependency_model_from_supabase() -> DependencyModel:
+def load_dependency_model_from_supabase(timings: Optional[Dict[str, Any]] = None) -> DependencyModel:
     """
     Loads prerequisites/corequisites from Supabase and returns DependencyModel.
 
+    The paged Supabase read and the local CSV overlay parse run concurrently.
+    When `timings` is given it is filled with per-stage durations in ms.
     """
+    started = time.perf_counter()
+    stats = timings if timings is not None else {}
+
     mode = os.getenv("DEPS_MODE", "edges_split").strip().lower()
     # Backward-compatible aliases.
     if mode in {"edges", "edge_split"}:
         mode = "edges_split"
     table = os.getenv("DEPS_TABLE", "course_dependencies").strip()
+    page_size = int(os.getenv("DEPS_PAGE_SIZE", "1000").strip() or "1000")
 
     # Common
     course_col = os.getenv("DEPS_COURSE_COL", "course_code").strip()
     title_col = os.getenv("DEPS_TITLE_COL", "").strip()
     units_col = os.getenv("DEPS_UNITS_COL", "").strip()
+    # Unique key to page by; comma-separated for a composite key.
+    order_cols = [c.strip() for c in os.getenv("DEPS_ORDER_COL", course_col).split(",") if c.strip()]
 
     # edges-mode
     required_col = os.getenv("DEPS_REQUIRED_COL", "required_course_code").strip()
@@ -103,8 +254,6 @@ def load_dependency_model_from_supabase() -> DependencyModel:
     prereq_col = os.getenv("DEPS_PREREQ_COL", "prereq_course_codes").strip()
     coreq_col = os.getenv("DEPS_COREQ_COL", "coreq_course_codes").strip()
 
-    sb = get_supabase()
-
     model = _new_model()
 
 
@@ -120,9 +269,27 @@ def load_dependency_model_from_supabase() -> DependencyModel:
         if units_col:
             select_cols.append(units_col)
 
-        res = sb.table(table).select(",".join(select_cols)).execute()
-        rows = res.data or []
+        local_csv_enabled = os.getenv("DEPS_LOCAL_CSV_OVERLAY", "1").strip().lower() not in {"0", "false", "no"}
 
+        def _timed_fetch() -> List[dict]:
+            fetch_started = time.perf_counter()
+            fetched = _fetch_all_rows(table, ",".join(select_cols), page_size, order_cols)
+            stats["deps_fetch_ms"] = _elapsed_ms(fetch_started)
+            stats["deps_rows"] = len(fetched)
+            return fetched
+
+        # The overlay parse is local CPU/disk work, so overlap it with the network read.
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="deps-load") as pool:
+            rows_future = pool.submit(_timed_fetch)
+            overlay_future = (
+                pool.submit(load_local_csv_overlay, local_csv_overlay_path(), stats)
+                if local_csv_enabled
+                else None
+            )
+            rows = rows_future.result()
+            overlay = overlay_future.result() if overlay_future is not None else None
+
+        build_started = time.perf_counter()
         for r in rows:
             course = norm_course_code((r.get(course_col) or "").strip())
             if not course:
@@ -155,15 +322,14 @@ def load_dependency_model_from_supabase() -> DependencyModel:
             if coreq_raw:
                 for c in split_codes(coreq_raw):
                     model.add_coreq(course, c)
+        stats["deps_build_ms"] = _elapsed_ms(build_started)
 
-        local_csv_enabled = os.getenv("DEPS_LOCAL_CSV_OVERLAY", "1").strip().lower() not in {"0", "false", "no"}
-        local_csv_path = os.getenv(
-            "DEPS_LOCAL_CSV_PATH",
-            str(Path(__file__).resolve().parents[2] / "data" / "pre_req_filtered.csv"),
-        ).strip()
-        if local_csv_enabled:
-            model = _merge_models(model, _load_dependency_model_from_local_csv(Path(local_csv_path)))
+        if overlay is not None:
+            merge_started = time.perf_counter()
+            model = _merge_models(model, overlay)
+            stats["deps_overlay_merge_ms"] = _elapsed_ms(merge_started)
 
+        stats["deps_total_ms"] = _elapsed_ms(started)
         return model
 
 
@@ -0,0 +1,100 @@
+"""Core scheduling backend logic for Eligibility."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Set, Tuple
+
+from .deps_model import DependencyModel
+
+
+# Inverted prereq index: which (course, AND-group) slots each completed course satisfies.
+@dataclass(frozen=True)
+class EligibilityIndex:
+    group_counts: Dict[str, int]                       # course -> number of AND-ed prereq groups
+    satisfies: Dict[str, Tuple[Tuple[str, int], ...]]  # prereq -> (course, group index) it satisfies
+    unconditional: FrozenSet[str]                      # courses with no prereqs at all
+
+    def tracker(self, completed: Iterable[str] = ()) -> "EligibilityTracker":
+        tracker = EligibilityTracker(self)
+        tracker.add_many(completed)
+        return tracker
+
+    def eligible_courses(self, completed: Iterable[str], *, include_completed: bool = False) -> Set[str]:
+        return self.tracker(completed).eligible(include_completed=include_completed)
+
+
+class EligibilityTracker:
+    """
+    Per-request eligibility state over an EligibilityIndex.
+
+    Keeps a satisfied-group counter per course, so adding a completed course
+    only touches the groups that course appears in.
+    """
+
+    def __init__(self, index: EligibilityIndex) -> None:
+        self._index = index
+        self._satisfied_slots: Set[Tuple[str, int]] = set()
+        self._satisfied_counts: Dict[str, int] = {}
+        self._unlocked: Set[str] = set()
+        self.completed: Set[str] = set()
+
+    def add(self, course: str) -> Set[str]:
+        """Mark `course` completed and return the courses that just became eligible."""
+        if course in self.completed:
+            return set()
+        self.completed.add(course)
+
+        newly: Set[str] = set()
+        group_counts = self._index.group_counts
+        for slot in self._index.satisfies.get(course, ()):
+            if slot in self._satisfied_slots:
+                continue
+            self._satisfied_slots.add(slot)
+            dependent = slot[0]
+            count = self._satisfied_counts.get(dependent, 0) + 1
+            self._satisfied_counts[dependent] = count
+            if count == group_counts[dependent]:
+                self._unlocked.add(dependent)
+                newly.add(dependent)
+        return newly
+
+    def add_many(self, courses: Iterable[str]) -> Set[str]:
+        newly: Set[str] = set()
+        for course in courses:
+            newly |= self.add(course)
+        return newly
+
+    def is_eligible(self, course: str) -> bool:
+        return course in self._unlocked or course not in self._index.group_counts
+
+    def eligible(self, *, include_completed: bool = False) -> Set[str]:
+        out = set(self._unlocked) | set(self._index.unconditional)
+        if not include_completed:
+            out -= self.completed
+        return out
+
+
+def build_eligibility_index(model: DependencyModel) -> EligibilityIndex:
+    """Invert `model.prereq_groups` (falling back to plain prereqs) for every course in the model."""
+    group_counts: Dict[str, int] = {}
+    satisfies: Dict[str, List[Tuple[str, int]]] = {}
+
+    for course in model.courses:
+        groups = model.prereq_groups.get(course)
+        if not groups:
+            # Mirror unmet_prereq_labels: without OR-groups every prereq is its own AND term.
+            groups = [{code} for code in sorted(model.prereqs.get(course, ()))]
+        if not groups:
+            continue
+        group_counts[course] = len(groups)
+        for group_index, group in enumerate(groups):
+            for option in group:
+                satisfies.setdefault(option, []).append((course, group_index))
+
+    unconditional = frozenset(course for course in model.courses if course not in group_counts)
+    return EligibilityIndex(
+        group_counts=group_counts,
+        satisfies={code: tuple(slots) for code, slots in satisfies.items()},
+        unconditional=unconditional,
+    )
@@ -0,0 +1,202 @@
+"""Core scheduling backend logic for Instructor Directory."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.core.cache import DEFAULT_CACHE_DIR
+
+NON_ALPHA_RE = re.compile(r"[^a-z]")
+
+# Minimum trigram Jaccard similarity for a fuzzy (first-name typo) match among same-last-name teachers.
+FUZZY_MIN_SIMILARITY = 0.5
+
+# scorer(search_name, node) -> sortable penalty tuple; first element < 100 means the last name matched.
+Scorer = Callable[[str, Dict[str, Any]], Tuple[int, int]]
+
+
+def _alpha(text: str) -> str:
+    return NON_ALPHA_RE.sub("", text.lower())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Index-ready view of one teacher node, with name keys precomputed.
+@dataclass(frozen=True)
+class _Entry:
+    node: Dict[str, Any]
+    first: str
+    last: str
+    full: str
+
+
+class InstructorDirectory:
+    """
+    In-memory index over a school's full teacher list.
+
+    Lookups go through last-name buckets (optionally narrowed by first
+    initial) and fall back to a trigram index for misspelled first names, so
+    only a handful of nodes are ever scored per query. The last name must
+    always match exactly; anything else is left to the live search.
+    """
+
+    def __init__(self, teachers: Sequence[Dict[str, Any]], *, school_id: str | None, school_name: str | None, synced_at: float) -> None:
+        self.school_id = school_id
+        self.school_name = school_name
+        self.synced_at = synced_at
+        self._entries: List[_Entry] = []
+        self._by_last: Dict[str, List[int]] = {}
+        self._by_initial_last: Dict[Tuple[str, str], List[int]] = {}
+        self._by_trigram: Dict[str, List[int]] = {}
+
+        for node in teachers:
+            first = _alpha(str(node.get("firstName") or ""))
+            last = _alpha(str(node.get("lastName") or ""))
+            if not last:
+                continue
+            idx = len(self._entries)
+            entry = _Entry(node=node, first=first, last=last, full=first + last)
+            self._entries.append(entry)
+            self._by_last.setdefault(last, []).append(idx)
+            if first:
+                self._by_initial_last.setdefault((first[0], last), []).append(idx)
+            for gram in _trigrams(entry.full):
+                self._by_trigram.setdefault(gram, []).append(idx)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _last_name_keys(normalized_name: str) -> Tuple[Optional[str], Set[str]]:
+        """(first initial or None, normalized strings that may be the query's last name)."""
+        tokens = [_alpha(t) for t in normalized_name.split() if _alpha(t)]
+        if not tokens:
+            return None, set()
+        # Section listings use "Last F"; everything else is "First [Middle] Last".
+        if len(tokens) >= 2 and len(tokens[-1]) == 1:
+            return tokens[-1], {"".join(tokens[:-1])}
+        return None, {tokens[-1], "".join(tokens[1:]), tokens[0], "".join(tokens)} - {""}
+
+    def _candidates(self, normalized_name: str) -> List[int]:
+        initial, last_names = self._last_name_keys(normalized_name)
+        if initial is not None:
+            (last,) = last_names
+            narrowed = self._by_initial_last.get((initial, last))
+            if narrowed:
+                return narrowed
+            return self._by_last.get(last, [])
+
+        found: List[int] = []
+        for key in last_names:
+            found.extend(self._by_last.get(key, []))
+        return found
+
+    def _fuzzy_candidates(self, normalized_name: str, last_names: Set[str], limit: int = 5) -> List[Tuple[float, int]]:
+        target = _alpha(normalized_name)
+        grams = _trigrams(target)
+        if not grams:
+            return []
+        overlap: Dict[int, int] = {}
+        for gram in grams:
+            for idx in self._by_trigram.get(gram, ()):
+                overlap[idx] = overlap.get(idx, 0) + 1
+
+        scored = []
+        for idx, shared in overlap.items():
+            if self._entries[idx].last not in last_names:
+                continue
+            other = len(_trigrams(self._entries[idx].full))
+            similarity = shared / (len(grams) + other - shared)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                scored.append((similarity, idx))
+        scored.sort(reverse=True)
+        return scored[:limit]
+
+    def match(self, normalized_name: str, scorer: Scorer) -> Optional[Dict[str, Any]]:
+        """Best teacher node for `normalized_name`, or None when the directory has no confident match."""
+        candidates = self._candidates(normalized_name)
+        if candidates:
+            best = min((self._entries[i].node for i in set(candidates)), key=lambda n: scorer(normalized_name, n))
+            if scorer(normalized_name, best)[0] < 100:
+                return best
+
+        # Trigram similarity decides; the scorer only breaks ties (e.g. by rating count). Only
+        # first-name spellings are forgiven: a different last name is a different teacher, and a
+        # miss here still falls through to the rating cache and a live search.
+        _, last_names = self._last_name_keys(normalized_name)
+        fuzzy = self._fuzzy_candidates(normalized_name, last_names)
+        if fuzzy:
+            _, idx = min(fuzzy, key=lambda pair: (-pair[0], scorer(normalized_name, self._entries[pair[1]].node)))
+            return self._entries[idx].node
+        return None
+
+
+def directory_path() -> Path:
+    configured = os.getenv("RMP_DIRECTORY_PATH", "").strip()
+    return Path(configured) if configured else DEFAULT_CACHE_DIR / "instructor_directory.json"
+
+
+def save_directory(path: Path, teachers: Sequence[Dict[str, Any]], *, school_id: str | None, school_name: str | None) -> None:
+    """Write the synced teacher list atomically (temp file + rename)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    payload = {
+        "school_id": school_id,
+        "school_name": school_name,
+        "synced_at": time.time(),
+        "teachers": list(teachers),
+    }
+    with tmp_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def load_directory(path: Path) -> Optional[InstructorDirectory]:
+    try:
+        with path.open(encoding="utf-8") as handle:
+            payload = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    teachers = payload.get("teachers") or []
+    if not isinstance(teachers, list):
+        return None
+    return InstructorDirectory(
+        teachers,
+        school_id=payload.get("school_id"),
+        school_name=payload.get("school_name"),
+        synced_at=float(payload.get("synced_at") or 0),
+    )
+
+
+_directory: Optional[InstructorDirectory] = None
+_directory_loaded = False
+_directory_lock = threading.Lock()
+
+
+def get_directory() -> Optional[InstructorDirectory]:
+    """The current directory, loaded from disk on first use (None when never synced)."""
+    global _directory, _directory_loaded
+    if _directory_loaded:
+        return _directory
+    with _directory_lock:
+        if not _directory_loaded:
+            _directory = load_directory(directory_path())
+            _directory_loaded = True
+    return _directory
+
+
+def set_directory(directory: Optional[InstructorDirectory]) -> None:
+    global _directory, _directory_loaded
+    with _directory_lock:
+        _directory = directory
+        _directory_loaded = True
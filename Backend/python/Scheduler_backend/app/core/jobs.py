@@ -0,0 +1,203 @@
+"""Core scheduling backend logic for Jobs."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JOB_STATES = ("queued", "running", "done", "failed")
+
+
+class JobQueueFullError(RuntimeError):
+    """The store already holds its maximum number of unfinished jobs."""
+
+
+# One background unit of work; mutated only by its JobStore under the store's condition.
+@dataclass
+class Job:
+    id: str
+    kind: str
+    status: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in {"done", "failed"}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error,
+            "error_type": self.error_type,
+        }
+
+
+class JobStore:
+    """
+    In-process job registry backed by an executor.
+
+    Finished jobs are kept for `ttl_s` so clients can poll for them, and the
+    registry never holds more than `max_jobs` entries (oldest finished first).
+    With `max_pending`, submit() refuses new work while that many jobs are
+    still queued or running. Waiters block on a shared condition instead of
+    sleeping in a poll loop. The store's own thread pool is only created on the
+    first submit, so configure() can still resize it at startup.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_workers: int = 4,
+        max_jobs: int = 1000,
+        ttl_s: float = 600.0,
+        max_pending: int = 0,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self.name = name
+        self.max_jobs = max(1, max_jobs)
+        self.ttl_s = ttl_s
+        self.max_pending = max(0, max_pending)
+        self.max_workers = max(1, max_workers)
+        self._executor = executor
+        self._jobs: Dict[str, Job] = {}
+        self._cond = threading.Condition()
+        self.rejected = 0
+
+    def configure(
+        self,
+        *,
+        max_workers: Optional[int] = None,
+        ttl_s: Optional[float] = None,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        """Apply settings read after construction; a worker count only takes effect before the first submit."""
+        with self._cond:
+            if max_workers is not None:
+                if self._executor is not None:
+                    logger.warning("%s: executor already running; ignoring max_workers=%s", self.name, max_workers)
+                else:
+                    self.max_workers = max(1, max_workers)
+            if ttl_s is not None:
+                self.ttl_s = ttl_s
+            if max_pending is not None:
+                self.max_pending = max(0, max_pending)
+
+    def _get_executor(self) -> Executor:
+        with self._cond:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"job-{self.name}")
+            return self._executor
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Job:
+        job = Job(id=uuid.uuid4().hex, kind=kind)
+        with self._cond:
+            self._prune_locked()
+            if self.max_pending and self._pending_locked() >= self.max_pending:
+                self.rejected += 1
+                raise JobQueueFullError(f"{self.name}: {self.max_pending} jobs already pending")
+            self._jobs[job.id] = job
+        self._get_executor().submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def add_done(self, kind: str, result: Any) -> Job:
+        """Register a job whose result is already known; it takes no queue slot and is never refused."""
+        now = time.time()
+        job = Job(id=uuid.uuid4().hex, kind=kind, status="done", started_at=now, finished_at=now, result=result)
+        with self._cond:
+            self._prune_locked()
+            self._jobs[job.id] = job
+            self._cond.notify_all()
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        with self._cond:
+            job.status = "running"
+            job.started_at = time.time()
+            self._cond.notify_all()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as exc:
+            logger.warning("Job %s (%s) failed: %s", job.id, job.kind, exc)
+            with self._cond:
+                job.status = "failed"
+                job.error = str(exc) or type(exc).__name__
+                job.error_type = type(exc).__name__
+                job.finished_at = time.time()
+                self._cond.notify_all()
+            return
+        with self._cond:
+            job.status = "done"
+            job.result = result
+            job.finished_at = time.time()
+            self._cond.notify_all()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout_s: float, *, after_status: Optional[str] = None) -> Optional[Job]:
+        """
+        Block until the job finishes (or, with `after_status`, until its status differs from it).
+
+        Returns the job (possibly still pending when the timeout ran out), or None if unknown.
+        """
+        deadline = time.monotonic() + max(0.0, timeout_s)
+        with self._cond:
+            job = self._jobs.get(job_id)
+            while job is not None and not job.finished and (after_status is None or job.status == after_status):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return job
+
+    def counts(self) -> Dict[str, int]:
+        with self._cond:
+            out = {state: 0 for state in JOB_STATES}
+            for job in self._jobs.values():
+                out[job.status] = out.get(job.status, 0) + 1
+            return out
+
+    def pending(self) -> int:
+        with self._cond:
+            return self._pending_locked()
+
+    def _pending_locked(self) -> int:
+        return sum(1 for job in self._jobs.values() if not job.finished)
+
+    def _prune_locked(self) -> None:
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and job.finished_at is not None and now - job.finished_at > self.ttl_s
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+        overflow = len(self._jobs) - self.max_jobs + 1
+        if overflow > 0:
+            finished: List[Job] = sorted(
+                (job for job in self._jobs.values() if job.finished),
+                key=lambda job: job.finished_at or 0,
+            )
+            for job in finished[:overflow]:
+                del self._jobs[job.id]
@@ -0,0 +1,288 @@
+"""Core scheduling backend logic for Metrics."""
+
+from __future__ import annotations
+
+import contextlib
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Request latency buckets (seconds); stage timings reuse them.
+DEFAULT_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Solver search sizes (leaves / nodes per solve).
+SEARCH_SIZE_BUCKETS = (1, 10, 100, 1000, 5000, 10000, 20000, 50000, 100000, 500000)
+
+# (metric name, type, help, [(labels, value), ...]) produced at scrape time.
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def metrics_enabled() -> bool:
+    return os.getenv("METRICS_ENABLED", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+# Read on first use rather than at import, so METRICS_ENABLED from the local .env file applies.
+_enabled: Optional[bool] = None
+
+
+def _metrics_on() -> bool:
+    global _enabled
+    if _enabled is None:
+        _enabled = metrics_enabled()
+    return _enabled
+
+
+def server_timing_enabled() -> bool:
+    return os.getenv("SERVER_TIMING", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels_text(self.labelnames, labels)} {_number(value)}" for labels, value in values]
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus text format (one series per label tuple)."""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS_S) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts..., +Inf count], running sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            snapshot = sorted((labels, list(counts), total[0]) for labels, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts, total in snapshot:
+            running = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                running += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels_text(self.labelnames, labels, le)} {running}")
+            lines.append(f"{self.name}_sum{_labels_text(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels_text(self.labelnames, labels)} {running}")
+        return lines
+
+
+_metrics: Dict[str, Any] = {}
+_collectors: List[Callable[[], Iterable[Sample]]] = []
+_registry_lock = threading.Lock()
+
+
+def counter(name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+    with _registry_lock:
+        existing = _metrics.get(name)
+        if existing is None:
+            existing = _metrics[name] = Counter(name, help_text, labelnames)
+        return existing
+
+
+def histogram(name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS_S) -> Histogram:
+    with _registry_lock:
+        existing = _metrics.get(name)
+        if existing is None:
+            existing = _metrics[name] = Histogram(name, help_text, labelnames, buckets)
+        return existing
+
+
+def register_collector(collect: Callable[[], Iterable[Sample]]) -> None:
+    """Add a callback that reports point-in-time values (cache sizes, hit counts, ...) at scrape time."""
+    with _registry_lock:
+        _collectors.append(collect)
+
+
+def render_metrics() -> str:
+    with _registry_lock:
+        metrics = [_metrics[name] for name in sorted(_metrics)]
+        collectors = list(_collectors)
+    lines: List[str] = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    for collect in collectors:
+        try:
+            samples = list(collect())
+        except Exception as exc:   # a broken collector must not take the endpoint down
+            lines.append(f"# collector {getattr(collect, '__name__', 'collector')} failed: {_escape(str(exc))}")
+            continue
+        for name, kind, help_text, values in samples:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for labels, value in values:
+                if value is None:
+                    continue
+                lines.append(f"{name}{_labels_text(list(labels), list(labels.values()))} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+HTTP_REQUEST_SECONDS = histogram(
+    "scheduler_http_request_duration_seconds",
+    "Wall time per HTTP request, by route template and status.",
+    ("method", "route", "status"),
+)
+STAGE_SECONDS = histogram(
+    "scheduler_stage_duration_seconds",
+    "Wall time per named processing stage inside a request.",
+    ("stage",),
+)
+UPSTREAM_SECONDS = histogram(
+    "scheduler_upstream_request_duration_seconds",
+    "Latency of each upstream HTTP attempt, by upstream and status (network_error when none).",
+    ("upstream", "status"),
+)
+SEARCH_EVENTS = counter(
+    "scheduler_search_events_total",
+    "Section search work: nodes expanded, leaves reached, conflict checks, pruned branches, duplicates, candidates.",
+    ("event",),
+)
+SEARCH_BUDGET_EXHAUSTED = counter(
+    "scheduler_search_budget_exhausted_total",
+    "Solves that stopped at max_solutions_checked, so their ranking may be truncated.",
+)
+SEARCH_LEAVES = histogram(
+    "scheduler_search_leaves",
+    "Complete schedules checked per solve.",
+    buckets=SEARCH_SIZE_BUCKETS,
+)
+
+
+_request_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_timings", default=None)
+
+
+class _Stage:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> "_Stage":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        elapsed = time.perf_counter() - self.started
+        STAGE_SECONDS.observe(elapsed, self.name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((self.name, elapsed))
+
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+def stage(name: str):
+    """Time a block as `name`; a shared no-op when METRICS_ENABLED is off."""
+    return _Stage(name) if _metrics_on() else _NULL_STAGE
+
+
+def record_search(stats: Any) -> None:
+    """Fold one solve's SearchStats into the solver counters."""
+    if not _metrics_on():
+        return
+    for event in ("nodes", "leaves", "conflict_checks", "pruned", "duplicates", "candidates"):
+        SEARCH_EVENTS.inc(getattr(stats, event), event)
+    SEARCH_LEAVES.observe(stats.leaves)
+    if stats.budget_exhausted:
+        SEARCH_BUDGET_EXHAUSTED.inc()
+
+
+def observe_upstream(upstream: str, elapsed_s: float, status: Optional[int]) -> None:
+    if _metrics_on():
+        UPSTREAM_SECONDS.observe(elapsed_s, upstream, str(status) if status is not None else "network_error")
+
+
+def _server_timing_header(timings: List[Tuple[str, float]], total_s: float) -> bytes:
+    parts = [f"{name};dur={elapsed * 1000:.1f}" for name, elapsed in timings]
+    parts.append(f"total;dur={total_s * 1000:.1f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that times every HTTP request by route template.
+
+    With SERVER_TIMING on it also collects the request's stage timings and
+    returns them in a `Server-Timing` header. Streaming responses only carry
+    the stages finished before their headers were sent.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+        self.server_timing = server_timing_enabled()
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not _metrics_on():
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        timings: Optional[List[Tuple[str, float]]] = [] if self.server_timing else None
+        token = _request_timings.set(timings)
+        status = 500
+
+        async def _send(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if timings is not None:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing_header(timings, time.perf_counter() - started)))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _request_timings.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, scope.get("method", ""), route, str(status))
+
@@ -0,0 +1,302 @@
+"""Core scheduling backend logic for Model Store."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .catalog_loader import load_catalog_from_supabase
+from .catalog_merge import MergeSummary, merge_catalog_into_dependency_model
+from .deps_loader import load_dependency_model_from_supabase
+from .deps_model import DependencyModel
+
+logger = logging.getLogger(__name__)
+
+# Floor for the watcher's poll interval so a zero setting cannot spin.
+MIN_WATCH_TICK_SECONDS = 0.1
+
+# builder(set_stage, timings) -> (model, merge summary)
+ModelBuilder = Callable[[Callable[[str], None], Dict[str, Any]], Tuple[DependencyModel, Optional[MergeSummary]]]
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+# One immutable, fully merged model version. Requests hold a snapshot for their whole lifetime.
+@dataclass
+class ModelSnapshot:
+    version: int
+    dep_model: DependencyModel
+    merge_summary: Optional[MergeSummary]
+    loaded_at: float
+    timings: Dict[str, Any]
+    reason: str
+    _derived: Dict[str, Any] = field(default_factory=dict, repr=False)
+    _derived_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def derived(self, name: str, factory: Callable[[DependencyModel], Any]) -> Any:
+        """
+        Memoize an artifact computed from this version's model.
+
+        Derived caches live on the snapshot, so a swap to a new version drops them.
+        """
+        value = self._derived.get(name)
+        if value is not None:
+            return value
+        with self._derived_lock:
+            value = self._derived.get(name)
+            if value is None:
+                value = factory(self.dep_model)
+                self._derived[name] = value
+        return value
+
+
+def load_merged_model(set_stage: Callable[[str], None], timings: Dict[str, Any]) -> Tuple[DependencyModel, Optional[MergeSummary]]:
+    """Load dependencies + catalog from Supabase and merge them into a fresh model."""
+    set_stage("dependencies")
+    dep_model = load_dependency_model_from_supabase(timings)
+
+    # If you have a Spring/offered-courses table/view, load & merge it.
+    # If you don't want term-scoped offerings yet, you can skip this merge.
+    set_stage("catalog")
+    stage_started = time.perf_counter()
+    catalog = load_catalog_from_supabase()
+    timings["catalog_fetch_ms"] = _elapsed_ms(stage_started)
+
+    set_stage("catalog_merge")
+    stage_started = time.perf_counter()
+    merge_summary = merge_catalog_into_dependency_model(
+        dep_model,
+        catalog=catalog,
+        add_catalog_only_courses=True
+    )
+    timings["catalog_merge_ms"] = _elapsed_ms(stage_started)
+    return dep_model, merge_summary
+
+
+class ModelStore:
+    """
+    Versioned holder for the dependency model.
+
+    Rebuilds run on a background thread and the finished snapshot is swapped in
+    with a single reference assignment; a failed rebuild keeps serving the
+    previous version.
+    """
+
+    def __init__(self, builder: ModelBuilder = load_merged_model) -> None:
+        self._builder = builder
+        self._lock = threading.Lock()
+        self._snapshot: Optional[ModelSnapshot] = None
+        self._next_version = 1
+        self._loading = False
+        self._listeners: List[Callable[[ModelSnapshot], None]] = []
+        self._derived_factories: Dict[str, Callable[[DependencyModel], Any]] = {}
+        self._stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+
+        self.stage: Optional[str] = None
+        self.reason: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.last_timings: Dict[str, Any] = {}
+
+    def current(self) -> Optional[ModelSnapshot]:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else 0
+
+    @property
+    def loading(self) -> bool:
+        return self._loading
+
+    def status(self) -> str:
+        if self._snapshot is not None:
+            return "ready"
+        if self._loading:
+            return "loading"
+        if self.last_error is not None:
+            return "failed"
+        return "pending"
+
+    def progress(self) -> Dict[str, Any]:
+        progress: Dict[str, Any] = {
+            "status": self.status(),
+            "version": self.version,
+            "reloading": self._loading and self._snapshot is not None,
+            "stage": self.stage,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if self.started_at is not None:
+            end = self.finished_at if not self._loading and self.finished_at else time.time()
+            progress["elapsed_s"] = round(end - self.started_at, 2)
+        if self.last_error is not None:
+            progress["last_error"] = self.last_error
+        return progress
+
+    def register_derived(self, name: str, factory: Callable[[DependencyModel], Any]) -> None:
+        """Build `factory(model)` eagerly with every new version, before it is published."""
+        self._derived_factories[name] = factory
+
+    def on_swap(self, callback: Callable[[ModelSnapshot], None]) -> None:
+        """Register a hook that runs after each new version is published."""
+        self._listeners.append(callback)
+
+    def reload(self, reason: str = "manual", *, wait: bool = False) -> bool:
+        """
+        Start a background rebuild unless one is already running.
+
+        Returns True when a new rebuild was started.
+        """
+        with self._lock:
+            if self._loading:
+                return False
+            self._loading = True
+            self.stage = None
+            self.reason = reason
+            self.started_at = time.time()
+            self.finished_at = None
+
+        thread = threading.Thread(target=self._rebuild, args=(reason,), name="model-reload", daemon=True)
+        thread.start()
+        if wait:
+            thread.join()
+        return True
+
+    def _set_stage(self, stage: str) -> None:
+        self.stage = stage
+
+    def _rebuild(self, reason: str) -> None:
+        started = time.perf_counter()
+        timings: Dict[str, Any] = {}
+        snapshot: Optional[ModelSnapshot] = None
+        try:
+            dep_model, merge_summary = self._builder(self._set_stage, timings)
+
+            derived: Dict[str, Any] = {}
+            for name, factory in self._derived_factories.items():
+                self._set_stage(name)
+                stage_started = time.perf_counter()
+                derived[name] = factory(dep_model)
+                timings[f"{name}_ms"] = _elapsed_ms(stage_started)
+            timings["total_ms"] = _elapsed_ms(started)
+            with self._lock:
+                snapshot = ModelSnapshot(
+                    version=self._next_version,
+                    dep_model=dep_model,
+                    merge_summary=merge_summary,
+                    loaded_at=time.time(),
+                    timings=timings,
+                    reason=reason,
+                    _derived=derived,
+                )
+                self._next_version += 1
+                # Publish only a fully merged model so requests never see a half-built one.
+                self._snapshot = snapshot
+            self.last_error = None
+        except Exception as exc:
+            timings["total_ms"] = _elapsed_ms(started)
+            self.last_error = str(exc)
+            logger.error("Model load (%s) failed: %s", reason, exc)
+        finally:
+            self.last_timings = timings
+            self.stage = None
+            self.finished_at = time.time()
+            self._loading = False
+
+        logger.info(
+            "Model load (%s) %s: %s",
+            reason,
+            f"published v{snapshot.version}" if snapshot is not None else "failed",
+            ", ".join(f"{key}={value}" for key, value in timings.items()),
+        )
+        if snapshot is not None:
+            for callback in self._listeners:
+                try:
+                    callback(snapshot)
+                except Exception:
+                    logger.exception("Model swap hook failed")
+
+    def start_watchers(
+        self,
+        *,
+        interval_s: float = 0,
+        watch_path: Optional[Path] = None,
+        poll_s: float = 30,
+        retry_base_s: float = 5,
+        retry_max_s: float = 300,
+    ) -> None:
+        """
+        Rebuild on a timer (`interval_s` > 0) and/or when `watch_path` changes on disk.
+
+        A failed rebuild (including the first load) is retried after
+        `retry_base_s`, doubling up to `retry_max_s`, until one succeeds. A file
+        change seen while another rebuild is running stays pending until a
+        rebuild for it can start.
+        """
+        if self._watcher is not None:
+            return
+
+        def _mtime() -> Optional[int]:
+            try:
+                return watch_path.stat().st_mtime_ns if watch_path is not None else None
+            except OSError:
+                return None
+
+        def _loop() -> None:
+            seen_mtime = _mtime()
+            csv_pending = False
+            last_load = time.monotonic()
+            retry_delay = retry_base_s
+            retry_at: Optional[float] = None
+            tick = min(poll_s, interval_s) if interval_s > 0 else poll_s
+            while True:
+                # Poll faster until the first version is up, so a failed first load is noticed quickly.
+                wait = tick if self._snapshot is not None else min(tick, retry_base_s)
+                if retry_at is not None:
+                    wait = min(wait, retry_at - time.monotonic())
+                if self._stop.wait(max(wait, MIN_WATCH_TICK_SECONDS)):
+                    return
+                now = time.monotonic()
+
+                mtime = _mtime()
+                if watch_path is not None and mtime != seen_mtime:
+                    seen_mtime = mtime
+                    csv_pending = True
+                if self._loading:
+                    continue
+
+                if self.last_error is None:
+                    retry_at, retry_delay = None, retry_base_s
+                elif retry_at is None:
+                    retry_at = now + retry_delay
+
+                if csv_pending:
+                    if self.reload("csv_changed"):
+                        csv_pending = False
+                        last_load = now
+                    continue
+                if retry_at is not None and now >= retry_at:
+                    if self.reload("retry"):
+                        last_load = now
+                        retry_at, retry_delay = None, min(retry_delay * 2, retry_max_s)
+                    continue
+                if interval_s > 0 and now - last_load >= interval_s:
+                    if self.reload("timer"):
+                        last_load = now
+
+        self._watcher = threading.Thread(target=_loop, name="model-watch", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
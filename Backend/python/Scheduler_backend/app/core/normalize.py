@@ -1,28 +1,137 @@
 """Helpers for normalizing course code strings."""
 
+import hashlib
+import json
+import os
 import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
 
 
 # Match department + number + optional suffix in common course formats.
-def norm_course_code(s: str) -> str:
-    """Return a normalized course code key."""
+COURSE_TOKEN_RE = re.compile(r"\b([A-Z][A-Z/]{1,10})\s*([0-9]{2,3})([A-Z]?)\b")
 
-    COURSE_TOKEN_RE = re.compile(r"\b([A-Z][A-Z/]{1,10})\s*([0-9]{2,3})([A-Z]?)\b")
-    
-    if not s:
-        return ""
-    
+# Built-in aliases for cross-listed/renamed departments and courses.
+# Keys and values are normalized forms (no spaces, upper case).
+DEFAULT_DEPARTMENT_ALIASES: Dict[str, str] = {
+    "AST": "A/ST",
+}
+DEFAULT_COURSE_ALIASES: Dict[str, str] = {}
+
+_department_aliases: Dict[str, str] = dict(DEFAULT_DEPARTMENT_ALIASES)
+_course_aliases: Dict[str, str] = dict(DEFAULT_COURSE_ALIASES)
+
+
+def _cache_size() -> int:
+    try:
+        return max(0, int(os.getenv("COURSE_CODE_CACHE_SIZE", "32768").strip() or "32768"))
+    except ValueError:
+        return 32768
+
+
+@lru_cache(maxsize=_cache_size())
+def _norm_course_code_cached(s: str) -> str:
     s = s.strip().upper()
     m = COURSE_TOKEN_RE.search(s)
     if not m:
-        return s.replace(" ", "")
+        code = s.replace(" ", "")
+        return _course_aliases.get(code, code)
     dept, num, suff = m.group(1), m.group(2), m.group(3)
-    return f"{dept}{num}{suff}"
+    dept = _department_aliases.get(dept, dept)
+    code = f"{dept}{num}{suff}"
+    return _course_aliases.get(code, code)
+
+
+def norm_course_code(s: str) -> str:
+    """Return a normalized course code key."""
+    if not s:
+        return ""
+    return _norm_course_code_cached(s)
+
+
+def normalize_many(codes: Iterable[Optional[str]], *, dedupe: bool = False) -> List[str]:
+    """
+    Normalize a batch of raw codes in one pass, dropping blanks.
+
+    Order is preserved; with `dedupe` only the first occurrence of each code is kept.
+    """
+    out: List[str] = []
+    seen: Set[str] = set()
+    for raw in codes:
+        if not raw:
+            continue
+        code = _norm_course_code_cached(str(raw))
+        if not code:
+            continue
+        if dedupe:
+            if code in seen:
+                continue
+            seen.add(code)
+        out.append(code)
+    return out
+
+
+def normalize_set(codes: Iterable[Optional[str]]) -> Set[str]:
+    return set(normalize_many(codes))
 
 
 # Split pipe-delimited values and normalize each code.
 def split_codes(cell: str) -> list[str]:
     if not cell:
         return []
-    parts = [p.strip() for p in str(cell).split("|") if p.strip()]
-    return [norm_course_code(p) for p in parts if norm_course_code(p)]
+    return normalize_many(str(cell).split("|"))
+
+
+def set_course_aliases(
+    departments: Optional[Dict[str, str]] = None,
+    courses: Optional[Dict[str, str]] = None,
+) -> None:
+    """Replace the alias tables (merged over the built-in defaults) and drop memoized results."""
+    global _department_aliases, _course_aliases
+
+    def _clean(table: Optional[Dict[str, str]]) -> Dict[str, str]:
+        return {
+            str(k).strip().upper().replace(" ", ""): str(v).strip().upper().replace(" ", "")
+            for k, v in (table or {}).items()
+            if str(k).strip() and str(v).strip()
+        }
+
+    _department_aliases = {**DEFAULT_DEPARTMENT_ALIASES, **_clean(departments)}
+    _course_aliases = {**DEFAULT_COURSE_ALIASES, **_clean(courses)}
+    _norm_course_code_cached.cache_clear()
+
+
+def load_course_aliases_from_file(path: Path) -> None:
+    """
+    Load aliases from JSON shaped like:
+      {"departments": {"AST": "A/ST"}, "courses": {"CECS 228H": "CECS 228"}}
+    """
+    with path.open(encoding="utf-8") as handle:
+        data = json.load(handle)
+    set_course_aliases(
+        departments=data.get("departments") or {},
+        courses=data.get("courses") or {},
+    )
+
+
+def alias_fingerprint() -> str:
+    """Stable hash of the active alias tables, for keying caches of normalized data."""
+    payload = json.dumps(
+        {"departments": _department_aliases, "courses": _course_aliases},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def normalize_cache_info():
+    return _norm_course_code_cached.cache_info()
+
+
+def load_configured_course_aliases() -> bool:
+    """Apply COURSE_ALIASES_PATH if set. Call once at startup, before any data loads."""
+    aliases_path = os.getenv("COURSE_ALIASES_PATH", "").strip()
+    if not aliases_path or not Path(aliases_path).exists():
+        return False
+    load_course_aliases_from_file(Path(aliases_path))
+    return True
@@ -0,0 +1,372 @@
+"""Core scheduling backend logic for Profiling."""
+
+from __future__ import annotations
+
+import cProfile
+import hmac
+import json
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field, is_dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from app.core.cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+PROFILE_HEADER = "x-debug-profile"
+PROFILE_QUERY_PARAM = "debug_profile"
+# Artifact kind -> file suffix; the download endpoint only serves these.
+ARTIFACT_SUFFIXES = {
+    "pstats": ".pstats",
+    "speedscope": ".speedscope.json",
+    "inputs": ".inputs.json",
+    "summary": ".summary.json",
+}
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{16}$")
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip() or default)
+    except ValueError:
+        return default
+
+
+def profile_token() -> str:
+    return os.getenv("DEBUG_PROFILE_TOKEN", "").strip()
+
+
+def profile_dir() -> Path:
+    configured = os.getenv("PROFILE_DIR", "").strip()
+    return Path(configured) if configured else DEFAULT_CACHE_DIR / "profiles"
+
+
+def token_matches(candidate: Optional[str]) -> bool:
+    expected = profile_token()
+    return bool(expected and candidate and hmac.compare_digest(candidate, expected))
+
+
+# One profiled request: filled in by profile_scope, read back by ProfilingMiddleware.
+@dataclass
+class ProfileRequest:
+    id: str
+    mode: str
+    path: str
+    started_at: float = field(default_factory=time.time)
+    scope: Optional[str] = None
+    status: str = "pending"     # pending | done | busy | not_profiled
+    elapsed_ms: Optional[float] = None
+    top: List[Dict[str, Any]] = field(default_factory=list)
+    artifacts: List[str] = field(default_factory=list)
+    inputs: Dict[str, Any] = field(default_factory=dict)
+
+
+_current_profile: ContextVar[Optional[ProfileRequest]] = ContextVar("current_profile", default=None)
+# cProfile and the sampler both cost real time; one profiled request at a time keeps a debug flag from hurting others.
+_profile_slot = threading.Lock()
+
+
+def record_profile_input(name: str, value: Any) -> None:
+    """Keep a hot function's input (e.g. the solver's options) with the current profile, for replay."""
+    request = _current_profile.get()
+    if request is not None:
+        request.inputs[name] = value   # serialized after the profiler stops, so it stays out of the profile
+
+
+def _jsonable(value: Any) -> Any:
+    if is_dataclass(value) and not isinstance(value, type):
+        return _jsonable(asdict(value))
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted(_jsonable(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack every `interval_s` into speedscope's sampled format."""
+
+    def __init__(self, target_thread_id: int, interval_s: float) -> None:
+        super().__init__(name="profile-sampler", daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval_s = interval_s
+        self.frames: List[Dict[str, Any]] = []
+        self.frame_index: Dict[Tuple[str, str, int], int] = {}
+        self.samples: List[List[int]] = []
+        self.weights: List[float] = []
+        self._stop_event = threading.Event()
+
+    def _frame_id(self, code) -> int:
+        key = (code.co_filename, code.co_name, code.co_firstlineno)
+        index = self.frame_index.get(key)
+        if index is None:
+            index = self.frame_index[key] = len(self.frames)
+            self.frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+        return index
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop_event.wait(self.interval_s):
+            frame = sys._current_frames().get(self.target_thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_id(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples.append(stack)
+            self.weights.append((now - last) * 1000)
+            last = now
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def speedscope(self, name: str) -> Dict[str, Any]:
+        total = sum(self.weights)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "scheduler-backend",
+            "shared": {"frames": self.frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": total,
+                "samples": self.samples,
+                "weights": self.weights,
+            }],
+        }
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        self_ms: Dict[int, float] = {}
+        total_ms: Dict[int, float] = {}
+        for stack, weight in zip(self.samples, self.weights):
+            if stack:
+                self_ms[stack[-1]] = self_ms.get(stack[-1], 0.0) + weight
+            for frame_id in set(stack):
+                total_ms[frame_id] = total_ms.get(frame_id, 0.0) + weight
+        ranked = sorted(self_ms.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [
+            {
+                "function": _function_label(self.frames[frame_id]["file"], self.frames[frame_id]["line"], self.frames[frame_id]["name"]),
+                "self_ms": round(weight, 2),
+                "cum_ms": round(total_ms.get(frame_id, 0.0), 2),
+            }
+            for frame_id, weight in ranked
+        ]
+
+
+def _function_label(filename: str, line: int, name: str) -> str:
+    # Paths inside the app are shortened to app/...; library paths to their last two parts.
+    parts = Path(filename).parts
+    short = "/".join(parts[parts.index("app"):]) if "app" in parts else "/".join(parts[-2:])
+    return f"{short}:{line}({name})"
+
+
+def _cprofile_top(profiler: cProfile.Profile, limit: int) -> List[Dict[str, Any]]:
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]   # by self time
+    return [
+        {
+            "function": _function_label(filename, line, name),
+            "calls": calls,
+            "self_ms": round(tottime * 1000, 2),
+            "cum_ms": round(cumtime * 1000, 2),
+        }
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in rows
+    ]
+
+
+def _prune_artifacts(directory: Path) -> None:
+    max_profiles = int(_env_number("PROFILE_MAX_ARTIFACTS", 50))
+    retention_s = _env_number("PROFILE_RETENTION_SECONDS", 86400)
+    summaries = sorted(directory.glob("*" + ARTIFACT_SUFFIXES["summary"]), key=lambda path: path.stat().st_mtime, reverse=True)
+    cutoff = time.time() - retention_s
+    for index, summary in enumerate(summaries):
+        if index >= max_profiles or summary.stat().st_mtime < cutoff:
+            profile_id = summary.name.split(".", 1)[0]
+            for suffix in ARTIFACT_SUFFIXES.values():
+                (directory / f"{profile_id}{suffix}").unlink(missing_ok=True)
+
+
+def _write_artifacts(request: ProfileRequest, profiler: Optional[cProfile.Profile], sampler: Optional[_StackSampler]) -> None:
+    directory = profile_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    if profiler is not None:
+        profiler.dump_stats(str(directory / f"{request.id}{ARTIFACT_SUFFIXES['pstats']}"))
+        request.artifacts.append("pstats")
+    if sampler is not None:
+        payload = sampler.speedscope(f"{request.scope} {request.path}")
+        (directory / f"{request.id}{ARTIFACT_SUFFIXES['speedscope']}").write_text(json.dumps(payload), encoding="utf-8")
+        request.artifacts.append("speedscope")
+    if request.inputs:
+        (directory / f"{request.id}{ARTIFACT_SUFFIXES['inputs']}").write_text(json.dumps(_jsonable(request.inputs), default=str), encoding="utf-8")
+        request.artifacts.append("inputs")
+    request.artifacts.append("summary")
+    summary = {key: value for key, value in asdict(request).items() if key != "inputs"}
+    (directory / f"{request.id}{ARTIFACT_SUFFIXES['summary']}").write_text(json.dumps(summary), encoding="utf-8")
+    _prune_artifacts(directory)
+
+
+class profile_scope:
+    """
+    Profile the enclosed block on the current thread when the request asked for it.
+
+    Sync routes wrap their work in this; the middleware only marks the request,
+    because cProfile and the stack sampler both follow a single thread. Yields
+    the ProfileRequest, or None when the request is not being profiled (or
+    another profiled request holds the slot).
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.request: Optional[ProfileRequest] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._started = 0.0
+
+    def __enter__(self) -> Optional[ProfileRequest]:
+        request = _current_profile.get()
+        if request is None or request.status != "pending":
+            return None
+        if not _profile_slot.acquire(blocking=False):
+            request.status = "busy"
+            return None
+        self.request = request
+        request.scope = self.name
+        self._started = time.perf_counter()
+        if request.mode == "sample":
+            interval_s = max(0.0005, _env_number("PROFILE_SAMPLE_INTERVAL_MS", 2) / 1000)
+            self._sampler = _StackSampler(threading.get_ident(), interval_s)
+            self._sampler.start()
+        else:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return request
+
+    def __exit__(self, *exc_info: Any) -> None:
+        request = self.request
+        if request is None:
+            return
+        try:
+            if self._profiler is not None:
+                self._profiler.disable()
+            if self._sampler is not None:
+                self._sampler.stop()
+            request.elapsed_ms = round((time.perf_counter() - self._started) * 1000, 2)
+            limit = int(_env_number("PROFILE_TOP_N", 10))
+            request.top = _cprofile_top(self._profiler, limit) if self._profiler is not None else self._sampler.top(limit)
+            _write_artifacts(request, self._profiler, self._sampler)
+            request.status = "done"
+        except Exception:
+            # A failed artifact write must not fail the request being debugged.
+            logger.exception("Could not save profile %s", request.id)
+            request.status = "failed"
+        finally:
+            _profile_slot.release()
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    directory = profile_dir()
+    if not directory.exists():
+        return []
+    out = []
+    for summary in sorted(directory.glob("*" + ARTIFACT_SUFFIXES["summary"]), key=lambda path: path.stat().st_mtime, reverse=True):
+        try:
+            out.append(json.loads(summary.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def artifact_path(profile_id: str, kind: str) -> Optional[Path]:
+    if not _PROFILE_ID_RE.match(profile_id) or kind not in ARTIFACT_SUFFIXES:
+        return None
+    path = profile_dir() / f"{profile_id}{ARTIFACT_SUFFIXES[kind]}"
+    return path if path.exists() else None
+
+
+def _summary_header(request: ProfileRequest) -> bytes:
+    if request.status != "done":
+        return request.status.encode("latin-1")
+    if not request.top:
+        return b"no samples (request shorter than the sampling interval)"
+    parts = [f"{row['function']} self={row['self_ms']}ms" for row in request.top[:5]]
+    return "; ".join(parts).encode("latin-1", "replace")
+
+
+def _requested_profile(scope: Dict[str, Any]) -> Tuple[Optional[str], str]:
+    token = None
+    mode = os.getenv("PROFILE_MODE", "cprofile").strip().lower()
+    for name, value in scope.get("headers", []):
+        if name == PROFILE_HEADER.encode("latin-1"):
+            token = value.decode("latin-1")
+        elif name == b"x-debug-profile-mode":
+            mode = value.decode("latin-1").strip().lower()
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    if token is None and query.get(PROFILE_QUERY_PARAM):
+        token = query[PROFILE_QUERY_PARAM][0]
+    if query.get("debug_profile_mode"):
+        mode = query["debug_profile_mode"][0].strip().lower()
+    return token, (mode if mode in PROFILE_MODES else "cprofile")
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that marks requests carrying a valid debug profile token.
+
+    The token comes from the `X-Debug-Profile` header or the `debug_profile`
+    query parameter and must equal DEBUG_PROFILE_TOKEN (profiling is off when
+    that is unset). Marked responses carry the profile id and a short
+    top-functions summary in headers; the artifacts are served by
+    /debug/profiles.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not profile_token():
+            await self.app(scope, receive, send)
+            return
+        token, mode = _requested_profile(scope)
+        if not token_matches(token):
+            await self.app(scope, receive, send)
+            return
+
+        request = ProfileRequest(id=uuid.uuid4().hex[:16], mode=mode, path=scope.get("path", ""))
+        context_token = _current_profile.set(request)
+
+        async def _send(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                if request.status == "pending":
+                    request.status = "not_profiled"   # the route has no profile_scope
+                headers = list(message.get("headers", []))
+                headers.append((b"x-debug-profile-id", request.id.encode("latin-1")))
+                headers.append((b"x-debug-profile-summary", _summary_header(request)))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            _current_profile.reset(context_token)
+
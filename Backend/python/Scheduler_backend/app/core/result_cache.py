@@ -0,0 +1,73 @@
+"""Core scheduling backend logic for Result Cache."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from app.core.cache import CacheStats, MemoryLRUCache
+
+
+def request_fingerprint(canonical: Any) -> str:
+    """Stable hash of an already-canonicalized request (sorted lists, normalized codes)."""
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """
+    Bounded LRU of finished responses keyed by request fingerprint.
+
+    Entries expire after `ttl_s`, and clear() drops everything (called when the
+    model is swapped). Values are stored as-is, so callers must treat them as
+    read-only and copy before changing anything.
+    """
+
+    def __init__(self, name: str, *, max_entries: int = 1024, ttl_s: float = 60.0) -> None:
+        self.name = name
+        self.ttl_s = ttl_s
+        self._entries = MemoryLRUCache(max_entries)
+        self.stats = CacheStats()
+
+    def configure(self, *, max_entries: Optional[int] = None, ttl_s: Optional[float] = None) -> None:
+        """Apply settings read after construction (e.g. from the environment at app startup)."""
+        if max_entries is not None:
+            self._entries.resize(max_entries)
+        if ttl_s is not None:
+            self.ttl_s = ttl_s
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_s > 0
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self.enabled:
+            return None
+        value = self._entries.get(key)
+        self.stats.incr("hit" if value is not None else "miss")
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        if self.enabled:
+            self._entries.set(key, value, self.ttl_s)
+            self.stats.incr("stored")
+
+    def observe_compute_ms(self, elapsed_ms: float) -> None:
+        self.stats.observe_ms(elapsed_ms)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.stats.incr("invalidated")
+
+    def snapshot(self) -> Dict[str, Any]:
+        counts = self.stats.snapshot()
+        return {
+            **{key: counts[key] for key in ("hit", "miss", "stored", "invalidated", "hit_rate") if key in counts},
+            "entries": self._entries.size(),
+            "max_entries": self._entries.max_entries,
+            "ttl_s": self.ttl_s,
+            "compute_count": counts["upstream_calls"],
+            "compute_avg_ms": counts["upstream_avg_ms"],
+            "compute_max_ms": counts["upstream_max_ms"],
+        }
@@ -3,14 +3,28 @@
 from __future__ import annotations
 
 import base64
+import logging
 import os
 import re
-from functools import lru_cache
-from typing import Any
-
-import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from pathlib import Path
+from typing import Any, Iterable, Iterator
 
 from app.api.professor_models import ProfessorRatingLookupResponse
+from app.core.cache import DEFAULT_CACHE_DIR, CacheStats, SqliteTTLCache
+from app.core.instructor_directory import (
+    InstructorDirectory,
+    directory_path,
+    get_directory,
+    save_directory,
+    set_directory,
+)
+from app.core.singleflight import SingleFlight
+from app.core.upstream import UpstreamClient, UpstreamError, get_upstream
+
+logger = logging.getLogger(__name__)
 
 RMP_GRAPHQL_URL = "https://www.ratemyprofessors.com/graphql"
 RMP_SEARCH_SCHOOLS_QUERY = """
@@ -66,8 +80,56 @@ query TeacherSearchResultsPageQuery(
   }
 }
 """.strip()
-DEFAULT_SCHOOL_NAME = os.getenv("RMP_SCHOOL_NAME", "California State University Long Beach")
+RMP_DIRECTORY_QUERY = """
+query TeacherDirectoryPageQuery($query: TeacherSearchQuery!, $first: Int!, $after: String) {
+  search: newSearch {
+    teachers(query: $query, first: $first, after: $after) {
+      edges {
+        cursor
+        node {
+          id
+          legacyId
+          firstName
+          lastName
+          department
+          avgRating
+          avgDifficulty
+          wouldTakeAgainPercent
+          numRatings
+          school {
+            id
+            name
+          }
+        }
+      }
+      pageInfo {
+        hasNextPage
+        endCursor
+      }
+    }
+  }
+}
+""".strip()
+DEFAULT_SCHOOL_NAME = "California State University Long Beach"
 REQUEST_TIMEOUT_SECONDS = 8
+RMP_HEADERS = {
+    "Authorization": "Basic dGVzdDp0ZXN0",
+    "Content-Type": "application/json",
+    "Referer": "https://www.ratemyprofessors.com/",
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "application/json",
+}
+
+# Rating cache freshness. Found professors change slowly; misses are re-checked sooner
+# so newly added instructors show up, and upstream failures are retried quickly.
+RATING_CACHE_NAMESPACE = "rmp_rating_v1"
+
+
+def _env_seconds(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip() or default)
+    except ValueError:
+        return default
 
 
 def _coerce_float(value: Any) -> float | None:
@@ -193,33 +255,64 @@ def _score_match(search_name: str, node: dict[str, Any]) -> tuple[int, int]:
     return (last_name_penalty + first_initial_penalty + distance, ratings_penalty)
 
 
+def _school_name() -> str:
+    # Read per call, like RMP_GRAPHQL_URL, so a value from the local .env file applies.
+    return os.getenv("RMP_SCHOOL_NAME", "").strip() or DEFAULT_SCHOOL_NAME
+
+
+def _bulk_lookup_concurrency() -> int:
+    try:
+        return max(1, int(os.getenv("RMP_BULK_CONCURRENCY", "16").strip() or "16"))
+    except ValueError:
+        return 16
+
+
+def _rmp_upstream() -> UpstreamClient:
+    # Shared pooled client for every RMP call, sized for the bulk lookup fan-out plus background refreshes.
+    # Created on first use, after .env is loaded, like the OpenAI client.
+    return get_upstream(
+        "rmp",
+        max_concurrency=_bulk_lookup_concurrency() + 4,
+        read_timeout_s=4.0,
+        deadline_s=REQUEST_TIMEOUT_SECONDS,
+        retries=1,
+        acquire_timeout_s=2.0,
+    )
+
+
+def _graphql_url() -> str:
+    # Read per call so a local stand-in server (tools/fake_rmp_server.py) can be swapped in.
+    return os.getenv("RMP_GRAPHQL_URL", RMP_GRAPHQL_URL).strip() or RMP_GRAPHQL_URL
+
+
 def _request_graphql(headers: dict[str, str], payload: dict[str, Any]) -> dict[str, Any] | None:
     try:
-        response = requests.post(
-            RMP_GRAPHQL_URL,
-            headers=headers,
-            json=payload,
-            timeout=REQUEST_TIMEOUT_SECONDS,
-        )
-        response.raise_for_status()
-        body = response.json()
-    except Exception:
+        body = _rmp_upstream().post_json(_graphql_url(), payload, headers=headers)
+    except UpstreamError as exc:
+        logger.debug("RMP request failed: %s", exc)
         return None
 
-    if body.get("errors"):
+    if not isinstance(body, dict) or body.get("errors"):
         return None
     return body
 
 
-@lru_cache(maxsize=16)
+_SCHOOL_IDS: dict[tuple[str, str], tuple[str, str]] = {}
+
+
 def _resolve_school_id(headers_key: str, school_name: str) -> tuple[str | None, str]:
-    headers = {
-        "Authorization": headers_key,
-        "Content-Type": "application/json",
-        "Referer": "https://www.ratemyprofessors.com/",
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "application/json",
-    }
+    # Only successful resolutions are remembered, so a transient outage is retried.
+    cached = _SCHOOL_IDS.get((headers_key, school_name))
+    if cached is not None:
+        return cached
+    resolved = _resolve_school_id_uncached(headers_key, school_name)
+    if resolved[0]:
+        _SCHOOL_IDS[(headers_key, school_name)] = (resolved[0], resolved[1])
+    return resolved
+
+
+def _resolve_school_id_uncached(headers_key: str, school_name: str) -> tuple[str | None, str]:
+    headers = {**RMP_HEADERS, "Authorization": headers_key}
     payload = {
         "query": RMP_SEARCH_SCHOOLS_QUERY,
         "variables": {
@@ -254,24 +347,20 @@ def _resolve_school_id(headers_key: str, school_name: str) -> tuple[str | None,
     return (best.get("id"), str(best.get("name") or school_name))
 
 
-@lru_cache(maxsize=512)
-def lookup_professor_rating(name: str) -> ProfessorRatingLookupResponse:
-    normalized_name = _normalize_instructor_name(name)
-    if not normalized_name:
-        return ProfessorRatingLookupResponse(query=name, normalized_name=None, found=False)
+def _fetch_professor_rating(name: str, normalized_name: str) -> tuple[ProfessorRatingLookupResponse, bool]:
+    """
+    Query RMP for one instructor.
 
-    headers = {
-        "Authorization": "Basic dGVzdDp0ZXN0",
-        "Content-Type": "application/json",
-        "Referer": "https://www.ratemyprofessors.com/",
-        "User-Agent": "Mozilla/5.0",
-        "Accept": "application/json",
-    }
-    school_id, resolved_school_name = _resolve_school_id(headers["Authorization"], DEFAULT_SCHOOL_NAME)
+    Returns (response, upstream_ok); upstream_ok is False when the answer is
+    "not found" only because every upstream call failed.
+    """
+    headers = dict(RMP_HEADERS)
+    school_id, resolved_school_name = _resolve_school_id(headers["Authorization"], _school_name())
     if not school_id:
-        return ProfessorRatingLookupResponse(query=name, normalized_name=normalized_name, found=False)
+        return ProfessorRatingLookupResponse(query=name, normalized_name=normalized_name, found=False), False
 
     nodes: list[dict[str, Any]] = []
+    any_response = False
 
     for search_text in _candidate_search_texts(normalized_name):
         payload = {
@@ -289,6 +378,7 @@ def lookup_professor_rating(name: str) -> ProfessorRatingLookupResponse:
         body = _request_graphql(headers, payload)
         if not body:
             continue
+        any_response = True
 
         edges = (
             body.get("data", {})
@@ -301,9 +391,18 @@ def lookup_professor_rating(name: str) -> ProfessorRatingLookupResponse:
             break
 
     if not nodes:
-        return ProfessorRatingLookupResponse(query=name, normalized_name=normalized_name, found=False)
+        return ProfessorRatingLookupResponse(query=name, normalized_name=normalized_name, found=False), any_response
 
     best = sorted(nodes, key=lambda node: _score_match(normalized_name, node))[0]
+    return _response_from_node(name, normalized_name, best, resolved_school_name), True
+
+
+def _response_from_node(
+    name: str,
+    normalized_name: str,
+    best: dict[str, Any],
+    resolved_school_name: str | None,
+) -> ProfessorRatingLookupResponse:
     matched_name = f"{best.get('firstName', '')} {best.get('lastName', '')}".strip() or None
     legacy_id = _coerce_int(best.get("legacyId"))
 
@@ -325,3 +424,241 @@ def lookup_professor_rating(name: str) -> ProfessorRatingLookupResponse:
         profile_url=profile_url,
         legacy_id=legacy_id,
     )
+
+
+_rating_cache: SqliteTTLCache | None = None
+_rating_cache_lock = threading.Lock()
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="rmp-refresh")
+_refreshing: set[str] = set()
+RATING_CACHE_STATS = CacheStats()
+_rating_flights = SingleFlight()
+_bulk_pool: ThreadPoolExecutor | None = None
+_bulk_pool_lock = threading.Lock()
+
+
+def _get_bulk_pool() -> ThreadPoolExecutor:
+    # Sized from RMP_BULK_CONCURRENCY on first use rather than at import.
+    global _bulk_pool
+    if _bulk_pool is None:
+        with _bulk_pool_lock:
+            if _bulk_pool is None:
+                _bulk_pool = ThreadPoolExecutor(max_workers=_bulk_lookup_concurrency(), thread_name_prefix="rmp-bulk")
+    return _bulk_pool
+
+
+def _get_rating_cache() -> SqliteTTLCache:
+    global _rating_cache
+    if _rating_cache is not None:
+        return _rating_cache
+    with _rating_cache_lock:
+        if _rating_cache is None:
+            configured = os.getenv("RMP_CACHE_PATH", str(DEFAULT_CACHE_DIR / "ratings.sqlite3")).strip()
+            path = Path(configured) if configured and configured != ":memory:" else None
+            try:
+                _rating_cache = SqliteTTLCache(path, namespace=RATING_CACHE_NAMESPACE, max_entries=20_000)
+            except Exception as exc:
+                logger.warning("Rating cache at %s unavailable (%s); using in-memory cache", configured, exc)
+                _rating_cache = SqliteTTLCache(None, namespace=RATING_CACHE_NAMESPACE, max_entries=20_000)
+    return _rating_cache
+
+
+def _rating_cache_key(normalized_name: str) -> str:
+    return f"{_school_name().lower()}|{normalized_name.lower()}"
+
+
+def _fetch_and_store(name: str, normalized_name: str) -> ProfessorRatingLookupResponse:
+    started = time.perf_counter()
+    response, upstream_ok = _fetch_professor_rating(name, normalized_name)
+    RATING_CACHE_STATS.observe_ms((time.perf_counter() - started) * 1000)
+
+    if not upstream_ok:
+        RATING_CACHE_STATS.incr("upstream_error")
+        response = response.model_copy(update={"upstream_error": True})
+        ttl = _env_seconds("RMP_CACHE_ERROR_TTL_SECONDS", 60)
+    elif response.found:
+        ttl = _env_seconds("RMP_CACHE_HIT_TTL_SECONDS", 7 * 24 * 3600)
+    else:
+        ttl = _env_seconds("RMP_CACHE_MISS_TTL_SECONDS", 6 * 3600)
+
+    if ttl > 0:
+        try:
+            _get_rating_cache().set(_rating_cache_key(normalized_name), response.model_dump(), ttl)
+        except Exception as exc:
+            logger.warning("Rating cache write failed: %s", exc)
+    return response
+
+
+def _refresh_in_background(name: str, normalized_name: str) -> None:
+    key = _rating_cache_key(normalized_name)
+    with _rating_cache_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def _run() -> None:
+        try:
+            _fetch_and_store(name, normalized_name)
+            RATING_CACHE_STATS.incr("refreshed")
+        except Exception as exc:
+            logger.warning("Background rating refresh for %r failed: %s", normalized_name, exc)
+        finally:
+            with _rating_cache_lock:
+                _refreshing.discard(key)
+
+    _refresh_pool.submit(_run)
+
+
+def lookup_professor_rating(name: str) -> ProfessorRatingLookupResponse:
+    """
+    Resolve an instructor's RMP rating through the shared persistent cache.
+
+    Fresh entries are served directly; expired ones are served stale while a
+    background refresh runs; only true misses wait on upstream.
+    """
+    normalized_name = _normalize_instructor_name(name)
+    if not normalized_name:
+        return ProfessorRatingLookupResponse(query=name, normalized_name=None, found=False)
+
+    # A synced school directory answers most names without any network or cache I/O.
+    directory = get_directory()
+    if directory is not None:
+        node = directory.match(normalized_name, _score_match)
+        if node is not None:
+            RATING_CACHE_STATS.incr("directory_hit")
+            return _response_from_node(name, normalized_name, node, directory.school_name)
+        RATING_CACHE_STATS.incr("directory_miss")
+
+    entry = None
+    try:
+        entry = _get_rating_cache().get(_rating_cache_key(normalized_name))
+    except Exception as exc:
+        logger.warning("Rating cache read failed: %s", exc)
+
+    if entry is not None and isinstance(entry.value, dict):
+        cached = ProfessorRatingLookupResponse(**{**entry.value, "query": name})
+        if entry.fresh:
+            # A briefly cached outage spares upstream a retry storm but is not an answer.
+            RATING_CACHE_STATS.incr("cached_error" if cached.upstream_error else "hit")
+        else:
+            RATING_CACHE_STATS.incr("stale")
+            _refresh_in_background(name, normalized_name)
+        return cached
+
+    RATING_CACHE_STATS.incr("miss")
+    # Concurrent misses for the same instructor share one upstream lookup.
+    response, shared = _rating_flights.do(
+        _rating_cache_key(normalized_name),
+        lambda: _fetch_and_store(name, normalized_name),
+    )
+    if shared:
+        RATING_CACHE_STATS.incr("coalesced")
+        response = response.model_copy(update={"query": name})
+    return response
+
+
+def iter_professor_ratings(names: Iterable[str], timeout_s: float | None = None) -> Iterator[ProfessorRatingLookupResponse]:
+    """
+    Resolve many instructors concurrently, yielding each result as soon as it is ready.
+
+    Duplicate names are looked up once and yielded once. With `timeout_s`, names
+    still pending when it runs out are skipped (their lookups finish in the
+    background and land in the cache).
+    """
+    unique: list[str] = []
+    seen: set[str] = set()
+    for name in names:
+        cleaned = (name or "").strip()
+        if cleaned and cleaned not in seen:
+            seen.add(cleaned)
+            unique.append(cleaned)
+
+    futures = {_get_bulk_pool().submit(lookup_professor_rating, name): name for name in unique}
+    try:
+        for future in as_completed(futures, timeout=timeout_s):
+            try:
+                yield future.result()
+            except Exception as exc:
+                logger.warning("Rating lookup for %r failed: %s", futures[future], exc)
+                yield ProfessorRatingLookupResponse(query=futures[future], found=False, upstream_error=True)
+    except FuturesTimeoutError:
+        pending = sum(1 for future in futures if not future.done())
+        logger.warning("Rating lookups timed out after %.1fs with %d still pending", timeout_s, pending)
+
+
+def lookup_professor_ratings(names: Iterable[str]) -> dict[str, ProfessorRatingLookupResponse]:
+    """Bulk form of lookup_professor_rating keyed by the original query string."""
+    return {response.query: response for response in iter_professor_ratings(names)}
+
+
+def rating_cache_stats() -> dict[str, Any]:
+    stats = RATING_CACHE_STATS.snapshot()
+    try:
+        stats["entries"] = _get_rating_cache().size()
+    except Exception:
+        stats["entries"] = None
+    directory = get_directory()
+    stats["directory_teachers"] = len(directory) if directory is not None else None
+    stats["directory_synced_at"] = directory.synced_at if directory is not None else None
+    return stats
+
+
+def sync_instructor_directory(school_name: str | None = None, page_size: int = 1000) -> dict[str, Any]:
+    """
+    Download the school's full teacher list page by page and install it as the local directory.
+
+    The previous directory stays active if any page fails, so a partial sync never
+    replaces a complete one.
+    """
+    started = time.perf_counter()
+    target_school = school_name or _school_name()
+    headers = dict(RMP_HEADERS)
+    school_id, resolved_school_name = _resolve_school_id(headers["Authorization"], target_school)
+    if not school_id:
+        raise RuntimeError(f"Could not resolve RMP school id for '{target_school}'.")
+
+    teachers: list[dict[str, Any]] = []
+    after = ""
+    pages = 0
+    while True:
+        payload = {
+            "query": RMP_DIRECTORY_QUERY,
+            "variables": {
+                "query": {"text": "", "schoolID": school_id},
+                "first": page_size,
+                "after": after,
+            },
+        }
+        body = _request_graphql(headers, payload)
+        if not body:
+            raise RuntimeError(f"Directory page {pages + 1} request failed; keeping the previous directory.")
+        pages += 1
+
+        connection = body.get("data", {}).get("search", {}).get("teachers", {})
+        for edge in connection.get("edges", []):
+            if isinstance(edge, dict) and isinstance(edge.get("node"), dict):
+                teachers.append(edge["node"])
+
+        page_info = connection.get("pageInfo") or {}
+        next_cursor = page_info.get("endCursor")
+        if not page_info.get("hasNextPage") or not next_cursor or next_cursor == after:
+            break
+        after = next_cursor
+
+    path = directory_path()
+    save_directory(path, teachers, school_id=school_id, school_name=resolved_school_name)
+    directory = InstructorDirectory(
+        teachers,
+        school_id=school_id,
+        school_name=resolved_school_name,
+        synced_at=time.time(),
+    )
+    set_directory(directory)
+    return {
+        "school_id": school_id,
+        "school_name": resolved_school_name,
+        "teachers": len(teachers),
+        "indexed": len(directory),
+        "pages": pages,
+        "path": str(path),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
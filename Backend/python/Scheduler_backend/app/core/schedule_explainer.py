@@ -2,13 +2,32 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import os
-from urllib import request, error
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
+from app.core.cache import CacheStats, MemoryLRUCache, SqliteTTLCache
 from app.core.section_scheduler import ScheduleMetrics
 from app.core.section_models import SectionOption
+from app.core.upstream import CircuitOpenError, UpstreamClient, get_upstream
+
+logger = logging.getLogger(__name__)
+
+OPENAI_CHAT_COMPLETIONS_URL = "https://api.openai.com/v1/chat/completions"
+
+# Bump whenever the prompts or bullet post-processing change so cached explanations are not reused.
+EXPLANATION_PROMPT_VERSION = 2
+EXPLANATION_CACHE_NAMESPACE = "schedule_explanation_v1"
+
+# Per-schedule fallback calls when the batched call fails; matches the OpenAI client's connection cap.
+_fallback_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="explain")
 
 
 def _fmt_min(total_min: int) -> str:
@@ -29,12 +48,154 @@ def _heuristic_bullets(metrics: ScheduleMetrics, preference: str) -> list[str]:
         bullets.append("Ranked to prioritize later starts so mornings are less packed.")
     elif p == "earliest_end":
         bullets.append("Ranked to prioritize earlier end times to free up evenings.")
+    elif p == "highest_rated":
+        if metrics.avg_instructor_rating is not None:
+            bullets.append(f"Ranked to favor highly rated instructors (average {metrics.avg_instructor_rating:.1f}/5).")
+        else:
+            bullets.append("Ranked to favor highly rated instructors; none of these instructors have ratings yet.")
     else:
         bullets.append("Ranked to balance fewer days, tighter schedules, and earlier finishes.")
     return bullets[:3]
 
 
-def _call_openai_for_bullets(prompt: str) -> list[str]:
+def _openai_upstream() -> UpstreamClient:
+    # No retries by default: a slow explanation is worth less than the heuristic one right now.
+    return get_upstream("openai", max_concurrency=8, read_timeout_s=8.0, deadline_s=8.0, retries=0, acquire_timeout_s=0.5)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)).strip() or default)
+    except ValueError:
+        return default
+
+
+EXPLANATION_CACHE_STATS = CacheStats()
+_memory_cache: Optional[MemoryLRUCache] = None
+_memory_cache_lock = threading.Lock()
+_disk_cache: Optional[SqliteTTLCache] = None
+_disk_cache_ready = False
+_disk_cache_lock = threading.Lock()
+
+
+def _get_memory_cache() -> MemoryLRUCache:
+    # Sized from EXPLANATION_CACHE_SIZE on first use rather than at import, so a value from .env applies.
+    global _memory_cache
+    if _memory_cache is None:
+        with _memory_cache_lock:
+            if _memory_cache is None:
+                _memory_cache = MemoryLRUCache(_env_int("EXPLANATION_CACHE_SIZE", 4096))
+    return _memory_cache
+
+
+def _get_disk_cache() -> Optional[SqliteTTLCache]:
+    # The persistent tier is opt-in: set EXPLANATION_CACHE_PATH to share explanations across workers/restarts.
+    global _disk_cache, _disk_cache_ready
+    if _disk_cache_ready:
+        return _disk_cache
+    with _disk_cache_lock:
+        if not _disk_cache_ready:
+            configured = os.getenv("EXPLANATION_CACHE_PATH", "").strip()
+            if configured:
+                try:
+                    _disk_cache = SqliteTTLCache(
+                        Path(configured),
+                        namespace=EXPLANATION_CACHE_NAMESPACE,
+                        max_entries=_env_int("EXPLANATION_CACHE_DISK_SIZE", 50_000),
+                    )
+                except Exception as exc:
+                    logger.warning("Explanation cache at %s unavailable (%s); memory tier only", configured, exc)
+            _disk_cache_ready = True
+    return _disk_cache
+
+
+def explanation_cache_key(
+    sections: Sequence[SectionOption],
+    metrics: ScheduleMetrics,
+    ranking_preference: str,
+) -> str:
+    """Canonical hash of everything the LLM sees, so equal schedules share one explanation."""
+    payload = {
+        "v": EXPLANATION_PROMPT_VERSION,
+        "model": os.getenv("OPENAI_MODEL", "gpt-4o-mini").strip() or "gpt-4o-mini",
+        "preference": (ranking_preference or "compact").strip().lower(),
+        "metrics": asdict(metrics),
+        "sections": sorted([s.course, s.section_id.strip()] for s in sections),
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[list[str]]:
+    bullets = _get_memory_cache().get(key)
+    if bullets is not None:
+        EXPLANATION_CACHE_STATS.incr("hit")
+        EXPLANATION_CACHE_STATS.incr("hit_memory")
+        return list(bullets)
+
+    disk = _get_disk_cache()
+    if disk is not None:
+        try:
+            entry = disk.get(key)
+        except Exception as exc:
+            logger.warning("Explanation cache read failed: %s", exc)
+            entry = None
+        if entry is not None and entry.fresh and isinstance(entry.value, list):
+            EXPLANATION_CACHE_STATS.incr("hit")
+            EXPLANATION_CACHE_STATS.incr("hit_disk")
+            _get_memory_cache().set(key, list(entry.value))
+            return list(entry.value)
+
+    EXPLANATION_CACHE_STATS.incr("miss")
+    return None
+
+
+def _cache_put(key: str, bullets: list[str]) -> None:
+    # Only LLM answers are cached; heuristic fallbacks are cheap and should be retried next time.
+    ttl = float(_env_int("EXPLANATION_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+    _get_memory_cache().set(key, list(bullets), ttl)
+    disk = _get_disk_cache()
+    if disk is not None:
+        try:
+            disk.set(key, list(bullets), ttl)
+        except Exception as exc:
+            logger.warning("Explanation cache write failed: %s", exc)
+
+
+def explanation_cache_stats() -> Dict[str, Any]:
+    stats = EXPLANATION_CACHE_STATS.snapshot()
+    stats["memory_entries"] = _get_memory_cache().size()
+    disk = _get_disk_cache()
+    stats["disk_entries"] = disk.size() if disk is not None else None
+    return stats
+
+
+def _explanation_budget_seconds() -> float:
+    try:
+        return float(os.getenv("EXPLANATION_BUDGET_SECONDS", "4").strip() or "4")
+    except ValueError:
+        return 4.0
+
+
+# Everything a malformed or failed LLM answer can raise on the way to clean bullets.
+LLM_ERRORS = (json.JSONDecodeError, KeyError, IndexError, TypeError, AttributeError, ValueError, RuntimeError)
+
+SINGLE_SYSTEM_PROMPT = (
+    "You explain schedule quality for college students. "
+    "Return strict JSON: {\"bullets\":[\"...\",\"...\",\"...\"]} "
+    "with 2-3 concise bullets."
+)
+BATCH_SYSTEM_PROMPT = (
+    "You explain schedule quality for college students. "
+    "You are given several numbered candidate schedules. "
+    "Return strict JSON: {\"schedules\":[{\"index\":1,\"bullets\":[\"...\",\"...\"]}, ...]} "
+    "with one entry per schedule and 2-3 concise bullets each. "
+    "Describe each schedule on its own terms; never compare it with or mention the other schedules "
+    "or their numbers, because each explanation is cached and shown independently."
+)
+
+
+def _chat_json(system_prompt: str, prompt: str, deadline_s: float | None = None) -> dict:
     api_key = os.getenv("OPENAI_API_KEY", "").strip()
     if not api_key:
         raise RuntimeError("OPENAI_API_KEY missing")
@@ -43,60 +204,194 @@ def _call_openai_for_bullets(prompt: str) -> list[str]:
     payload = {
         "model": model,
         "messages": [
-            {
-                "role": "system",
-                "content": (
-                    "You explain schedule quality for college students. "
-                    "Return strict JSON: {\"bullets\":[\"...\",\"...\",\"...\"]} "
-                    "with 2-3 concise bullets."
-                ),
-            },
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
         ],
         "temperature": 0.2,
+        "response_format": {"type": "json_object"},
     }
 
-    req = request.Request(
-        url="https://api.openai.com/v1/chat/completions",
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}",
-        },
-        method="POST",
+    body = _openai_upstream().post_json(
+        OPENAI_CHAT_COMPLETIONS_URL,
+        payload,
+        headers={"Authorization": f"Bearer {api_key}"},
+        deadline_s=deadline_s,
     )
+    return json.loads(body["choices"][0]["message"]["content"])
 
-    with request.urlopen(req, timeout=8) as resp:
-        body = json.loads(resp.read().decode("utf-8"))
 
-    content = body["choices"][0]["message"]["content"]
-    parsed = json.loads(content)
-    bullets = parsed.get("bullets", [])
-    cleaned = [str(b).strip() for b in bullets if str(b).strip()]
+def _clean_bullets(bullets) -> list[str]:
+    cleaned = [str(b).strip() for b in (bullets or []) if str(b).strip()]
     if not cleaned:
         raise RuntimeError("LLM returned empty bullets")
     return cleaned[:3]
 
 
-def generate_schedule_benefits(
-    sections: List[SectionOption],
-    metrics: ScheduleMetrics,
-    ranking_preference: str,
-) -> list[str]:
+def _call_openai_for_bullets(prompt: str, deadline_s: float | None = None) -> list[str]:
+    return _clean_bullets(_chat_json(SINGLE_SYSTEM_PROMPT, prompt, deadline_s).get("bullets"))
+
+
+def _schedule_facts(sections: List[SectionOption], metrics: ScheduleMetrics) -> str:
     section_preview = []
     for s in sections[:10]:
         section_preview.append(f"{s.course} sec {s.section_id}")
-    prompt = (
-        f"Ranking preference: {ranking_preference}\n"
+    return (
         f"Days used: {metrics.days_used}\n"
         f"Total gap minutes: {metrics.total_gap_minutes}\n"
         f"Earliest start: {_fmt_min(metrics.earliest_start)}\n"
         f"Latest end: {_fmt_min(metrics.latest_end)}\n"
         f"Sections: {', '.join(section_preview)}\n"
-        "Give 2-3 bullets on why this schedule is beneficial."
     )
 
+
+def _single_prompt(sections: List[SectionOption], metrics: ScheduleMetrics, ranking_preference: str) -> str:
+    return (
+        f"Ranking preference: {ranking_preference}\n"
+        + _schedule_facts(sections, metrics)
+        + "Give 2-3 bullets on why this schedule is beneficial."
+    )
+
+
+def generate_schedule_benefits(
+    sections: List[SectionOption],
+    metrics: ScheduleMetrics,
+    ranking_preference: str,
+) -> list[str]:
+    key = explanation_cache_key(sections, metrics, ranking_preference)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
     try:
-        return _call_openai_for_bullets(prompt)
-    except (error.URLError, error.HTTPError, json.JSONDecodeError, KeyError, RuntimeError):
+        bullets = _call_openai_for_bullets(_single_prompt(sections, metrics, ranking_preference))
+    except LLM_ERRORS:
         return _heuristic_bullets(metrics, ranking_preference)
+    _cache_put(key, bullets)
+    return bullets
+
+
+def _call_openai_batch(
+    candidates: Sequence[Tuple[List[SectionOption], ScheduleMetrics]],
+    ranking_preference: str,
+    deadline_s: float,
+) -> Dict[int, list[str]]:
+    blocks = [
+        f"Schedule {idx}:\n{_schedule_facts(sections, metrics)}"
+        for idx, (sections, metrics) in enumerate(candidates, start=1)
+    ]
+    prompt = (
+        f"Ranking preference: {ranking_preference}\n\n"
+        + "\n".join(blocks)
+        + f"\nGive 2-3 bullets for each of the {len(candidates)} schedules on why it is beneficial."
+    )
+    parsed = _chat_json(BATCH_SYSTEM_PROMPT, prompt, deadline_s)
+
+    out: Dict[int, list[str]] = {}
+    for entry in parsed.get("schedules") or []:
+        try:
+            idx = int(entry.get("index"))
+            if 1 <= idx <= len(candidates):
+                out[idx - 1] = _clean_bullets(entry.get("bullets"))
+        except LLM_ERRORS:
+            continue
+    return out
+
+
+def generate_schedule_benefits_batch(
+    candidates: Sequence[Tuple[List[SectionOption], ScheduleMetrics]],
+    ranking_preference: str,
+    *,
+    budget_s: float | None = None,
+    check_cache: bool = True,
+) -> List[list[str]]:
+    """
+    Explain every ranked schedule within one shared time budget.
+
+    Cached explanations are reused first. One structured LLM call covers the
+    rest; schedules it left out (or all of them, if it failed) are retried as
+    parallel per-schedule calls with whatever budget remains, and anything
+    still missing gets heuristic bullets.
+    """
+    results: List[list[str] | None] = [None] * len(candidates)
+    if not candidates:
+        return []
+    if not os.getenv("OPENAI_API_KEY", "").strip():
+        return [_heuristic_bullets(metrics, ranking_preference) for _, metrics in candidates]
+
+    keys = [explanation_cache_key(sections, metrics, ranking_preference) for sections, metrics in candidates]
+    if check_cache:
+        for idx, key in enumerate(keys):
+            results[idx] = _cache_get(key)
+    uncached = [idx for idx, bullets in enumerate(results) if bullets is None]
+
+    budget = _explanation_budget_seconds() if budget_s is None else budget_s
+    deadline = time.monotonic() + budget
+    circuit_open = False
+    fetched: Dict[int, list[str]] = {}
+
+    if uncached and budget > 0:
+        started = time.perf_counter()
+        try:
+            answered = _call_openai_batch([candidates[idx] for idx in uncached], ranking_preference, budget)
+            EXPLANATION_CACHE_STATS.observe_ms((time.perf_counter() - started) * 1000)
+            for position, bullets in answered.items():
+                fetched[uncached[position]] = bullets
+        except CircuitOpenError:
+            circuit_open = True
+        except LLM_ERRORS as exc:
+            logger.info("Batched explanation call failed (%s); falling back per schedule", exc)
+
+    missing = [idx for idx in uncached if idx not in fetched]
+    remaining = deadline - time.monotonic()
+    # Below ~half a second a fresh LLM round trip cannot finish, so go straight to heuristics.
+    if missing and not circuit_open and remaining > 0.5:
+        futures = {
+            _fallback_pool.submit(
+                _call_openai_for_bullets,
+                _single_prompt(candidates[idx][0], candidates[idx][1], ranking_preference),
+                remaining,
+            ): idx
+            for idx in missing
+        }
+        done, _ = wait(futures, timeout=remaining)
+        for future in done:
+            try:
+                fetched[futures[future]] = future.result()
+            except LLM_ERRORS:
+                pass
+
+    for idx, bullets in fetched.items():
+        results[idx] = bullets
+        _cache_put(keys[idx], bullets)
+
+    return [
+        bullets if bullets is not None else _heuristic_bullets(candidates[idx][1], ranking_preference)
+        for idx, bullets in enumerate(results)
+    ]
+
+
+def llm_explanations_enabled() -> bool:
+    return bool(os.getenv("OPENAI_API_KEY", "").strip())
+
+
+def immediate_schedule_benefits(
+    candidates: Sequence[Tuple[List[SectionOption], ScheduleMetrics]],
+    ranking_preference: str,
+) -> Tuple[List[list[str]], List[int]]:
+    """
+    Bullets that can be returned without waiting on the LLM: cached answers, else heuristics.
+
+    Also returns the indexes that only have heuristic bullets and are worth a deferred LLM call.
+    """
+    bullets: List[list[str]] = []
+    pending: List[int] = []
+    use_llm = llm_explanations_enabled()
+    for idx, (sections, metrics) in enumerate(candidates):
+        cached = _cache_get(explanation_cache_key(sections, metrics, ranking_preference)) if use_llm else None
+        if cached is not None:
+            bullets.append(cached)
+        else:
+            bullets.append(_heuristic_bullets(metrics, ranking_preference))
+            if use_llm:
+                pending.append(idx)
+    return bullets, pending
+
@@ -2,7 +2,7 @@
 
 # app/core/scheduler_engine.py
 from __future__ import annotations
-from typing import Set, List, Dict, Optional
+from typing import Any, Callable, Set, List, Dict, Optional
 from .deps_model import DependencyModel
 from .scheduling_models import TermSchedule, SchedulePlan
 
@@ -24,6 +24,7 @@ def generate_plan(
     include_prereq_closure: bool = True,
     include_coreqs: bool = True,
     strict_coreq_same_term: bool = False,
+    priority_key: Optional[Callable[[str], Any]] = None,
 ) -> SchedulePlan:
     # Build a term-by-term plan that respects prereqs, coreqs, and limits.
     warnings: List[str] = []
@@ -67,8 +68,10 @@ def generate_plan(
         if not remaining:
             break
 
+        # Default priority: fewest prereqs first. Callers can pass an unlock-aware key
+        # (see deps_index.unlock_priority_key) to front-load courses that gate the most.
         available = sorted([c for c in remaining if is_available(c)],
-                           key=lambda c: (len(model.all_prereqs(c)), c))
+                           key=priority_key or (lambda c: (len(model.all_prereqs(c)), c)))
 
         if not available:
             # deadlock: blocked by external prereqs or constraints
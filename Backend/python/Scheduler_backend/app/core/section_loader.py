@@ -6,8 +6,9 @@ import os
 from typing import Dict, List, Any, Tuple
 from collections import defaultdict
 
+from app.core.metrics import stage
 from app.core.supabase_client import get_supabase
-from app.core.normalize import norm_course_code
+from app.core.normalize import norm_course_code, normalize_set
 from app.core.section_models import SectionOption, MeetingBlock
 from app.core.section_scheduler import parse_days, parse_time_range
 
@@ -38,7 +39,7 @@ def load_section_options_for_courses(
     inst_col = _get_env("SECTION_INSTRUCTOR_COL", "instructor")
     comm_col = _get_env("SECTION_COMMENTS_COL", "comment")
 
-    norm_courses = [norm_course_code(c) for c in courses if norm_course_code(c)]
+    norm_courses = normalize_set(courses)
     if not norm_courses:
         return {}
 
@@ -46,23 +47,24 @@ def load_section_options_for_courses(
     select_cols = [course_col, section_col, type_col, day_col, time_col, loc_col, inst_col, comm_col]
     select_str = ",".join(select_cols)
 
-    all_rows: List[dict] = []
-    start = 0
-    while True:
-        q = (
-            sb.table(table)
-            .select(select_str)
-            .range(start, start + page_size - 1)
-        )
+    with stage("sections_fetch"):
+        all_rows: List[dict] = []
+        start = 0
+        while True:
+            q = (
+                sb.table(table)
+                .select(select_str)
+                .range(start, start + page_size - 1)
+            )
 
-        res = q.execute()
-        rows = res.data or []
-        if not rows:
-            break
-        all_rows.extend(rows)
-        if len(rows) < page_size:
-            break
-        start += page_size
+            res = q.execute()
+            rows = res.data or []
+            if not rows:
+                break
+            all_rows.extend(rows)
+            if len(rows) < page_size:
+                break
+            start += page_size
 
     # Group meeting rows into (course, section_id)
     grouped: Dict[Tuple[str, str], List[MeetingBlock]] = defaultdict(list)
@@ -25,3 +25,4 @@ class SectionOption:
     meetings: List[MeetingBlock]
     location: Optional[str] = None
     instructor: Optional[str] = None
+    instructor_rating: Optional[float] = None   # RMP average, attached before filtering/ranking
@@ -0,0 +1,106 @@
+"""Core scheduling backend logic for Section Ratings."""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, replace
+from typing import Dict, Iterable, List, Optional, Set
+
+from app.api.professor_models import ProfessorRatingLookupResponse
+from app.core.rmp_client import iter_professor_ratings
+from app.core.section_models import SectionOption
+
+
+# How sections whose instructor has no rating are treated by a minimum-rating filter.
+UNRATED_POLICIES = {"allow", "exclude"}
+
+
+def _prefetch_timeout_seconds() -> float:
+    try:
+        return float(os.getenv("RMP_PREFETCH_TIMEOUT_SECONDS", "6").strip() or "6")
+    except ValueError:
+        return 6.0
+
+
+# Outcome of one batch prefetch, reported back as warnings.
+@dataclass(frozen=True)
+class RatingPrefetch:
+    ratings: Dict[str, Optional[float]]   # raw instructor name -> average (None when unrated)
+    requested: int
+    resolved: int                          # answered by RMP; upstream errors and timeouts are not
+    errors: int = 0
+
+    @property
+    def complete(self) -> bool:
+        return self.resolved >= self.requested
+
+
+def section_instructor_names(sec: SectionOption) -> List[str]:
+    """Raw instructor strings for a section (section-level first, then per meeting), deduped."""
+    names: List[str] = []
+    for raw in [sec.instructor, *(m.instructor for m in sec.meetings)]:
+        cleaned = (raw or "").strip()
+        if cleaned and cleaned not in names:
+            names.append(cleaned)
+    return names
+
+
+def _rating_value(response: ProfessorRatingLookupResponse) -> Optional[float]:
+    # RMP reports 0.0 for professors nobody has rated yet.
+    if not response.found or response.avg_rating is None or not response.num_ratings:
+        return None
+    return response.avg_rating
+
+
+def prefetch_instructor_ratings(
+    names: Iterable[str],
+    *,
+    timeout_s: Optional[float] = None,
+) -> RatingPrefetch:
+    """Resolve every distinct instructor concurrently, giving up on stragglers after `timeout_s`."""
+    unique: Set[str] = {name.strip() for name in names if name and name.strip()}
+    budget = _prefetch_timeout_seconds() if timeout_s is None else timeout_s
+    ratings: Dict[str, Optional[float]] = {}
+    errors = 0
+    for response in iter_professor_ratings(sorted(unique), timeout_s=budget):
+        if response.upstream_error:
+            # Unknown, not unrated: the instructor stays unrated here but the prefetch is incomplete.
+            errors += 1
+            continue
+        ratings[response.query] = _rating_value(response)
+    return RatingPrefetch(ratings=ratings, requested=len(unique), resolved=len(ratings), errors=errors)
+
+
+def attach_instructor_ratings(
+    options_by_course: Dict[str, List[SectionOption]],
+    *,
+    timeout_s: Optional[float] = None,
+) -> RatingPrefetch:
+    """
+    Batch-prefetch ratings for every instructor in `options_by_course` and attach them in place.
+
+    A co-taught section gets its lowest instructor rating, so a minimum-rating
+    filter never admits a section on the strength of one co-instructor.
+    """
+    names = [name for opts in options_by_course.values() for sec in opts for name in section_instructor_names(sec)]
+    prefetch = prefetch_instructor_ratings(names, timeout_s=timeout_s)
+
+    for course, opts in options_by_course.items():
+        rated: List[SectionOption] = []
+        for sec in opts:
+            values = [
+                prefetch.ratings[name]
+                for name in section_instructor_names(sec)
+                if prefetch.ratings.get(name) is not None
+            ]
+            rated.append(replace(sec, instructor_rating=min(values)) if values else sec)
+        options_by_course[course] = rated
+    return prefetch
+
+
+def passes_min_rating(sec: SectionOption, min_rating: Optional[float], unrated_policy: str = "allow") -> bool:
+    if min_rating is None:
+        return True
+    if sec.instructor_rating is None:
+        return unrated_policy != "exclude"
+    return sec.instructor_rating >= min_rating
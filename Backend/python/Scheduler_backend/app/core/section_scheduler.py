@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import re
+import time
 from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass
 from app.core.deps_model import DependencyModel
 
 from app.core.section_models import SectionOption, MeetingBlock
-from app.core.normalize import norm_course_code
+from app.core.normalize import norm_course_code, normalize_set
 
 
 # --- Parsing helpers ---
@@ -240,12 +241,17 @@ def score_schedule(chosen: List[SectionOption]) -> int:
     return -(day_penalty + gap_penalty)
 
 
+# Stand-in rating for unrated instructors when ranking by rating (mid-scale, neither rewarded nor punished).
+UNRATED_RANKING_RATING = 2.5
+
+
 @dataclass(frozen=True)
 class ScheduleMetrics:
     days_used: int
     total_gap_minutes: int
     earliest_start: int
     latest_end: int
+    avg_instructor_rating: Optional[float] = None   # over rated sections only
 
 
 def compute_schedule_metrics(chosen: List[SectionOption]) -> ScheduleMetrics:
@@ -274,11 +280,14 @@ def compute_schedule_metrics(chosen: List[SectionOption]) -> ScheduleMetrics:
     if earliest_start == 24 * 60:
         earliest_start = 0
 
+    ratings = [sec.instructor_rating for sec in chosen if sec.instructor_rating is not None]
+
     return ScheduleMetrics(
         days_used=len(days_used_set),
         total_gap_minutes=total_gap,
         earliest_start=earliest_start,
         latest_end=latest_end,
+        avg_instructor_rating=round(sum(ratings) / len(ratings), 2) if ratings else None,
     )
 
 
@@ -298,6 +307,13 @@ def score_schedule_by_preference(
         base = m.earliest_start * 100 - m.days_used * 1000 - m.total_gap_minutes
     elif p == "earliest_end":
         base = -(m.latest_end * 100 + m.total_gap_minutes * 10 + m.days_used * 1000)
+    elif p == "highest_rated":
+        # Mean rating over every section (unrated count as mid-scale), then compactness as a tiebreak.
+        mean_rating = sum(
+            sec.instructor_rating if sec.instructor_rating is not None else UNRATED_RANKING_RATING
+            for sec in chosen
+        ) / max(1, len(chosen))
+        base = int(mean_rating * 100000) - (m.days_used * 1000 + m.total_gap_minutes)
     else:
         # compact (default): fewer days + fewer gaps + earlier finish.
         base = -(m.days_used * 100000 + m.total_gap_minutes * 10 + m.latest_end)
@@ -332,11 +348,7 @@ def filter_prereq_eligible_courses(
       failures: course -> reason
     """
 
-    normalized_completed = {
-        norm_course_code(c)
-        for c in completed
-        if norm_course_code(c)
-    }
+    normalized_completed = normalize_set(completed)
 
     eligible: List[str] = []
     failures: Dict[str, str] = {}
@@ -361,6 +373,20 @@ def filter_prereq_eligible_courses(
 
     return eligible, failures
 
+# Work done by one pick_ranked_schedules call; filled in when the search finishes.
+@dataclass
+class SearchStats:
+    nodes: int = 0              # partial schedules expanded (one per course level visited)
+    leaves: int = 0             # complete schedules reached (counts against max_solutions_checked)
+    conflict_checks: int = 0    # section_conflicts calls
+    pruned: int = 0             # sections rejected by a conflict
+    duplicates: int = 0         # complete schedules already seen
+    candidates: int = 0         # distinct schedules scored
+    budget_exhausted: bool = False
+    max_solutions_checked: int = 0
+    solve_ms: float = 0.0
+
+
 def pick_ranked_schedules(
     options_by_course: Dict[str, List[SectionOption]],
     *,
@@ -370,11 +396,15 @@ def pick_ranked_schedules(
     ranking_preference: str = "compact",
     preferred_sections: Optional[Dict[str, str]] = None,
     preferred_professors: Optional[Set[str]] = None,
+    stats: Optional[SearchStats] = None,
 ) -> Tuple[List[Tuple[List[SectionOption], int, ScheduleMetrics]], Dict[str, str]]:
     """
     Returns ranked schedules:
       [ (sections, score, metrics), ... ]
+
+    Pass a SearchStats as `stats` to get the search counters back.
     """
+    started = time.perf_counter()
     courses = list(options_by_course.keys())
     courses.sort(key=lambda c: len(options_by_course.get(c, [])))
 
@@ -384,6 +414,8 @@ def pick_ranked_schedules(
             failures[c] = "No sections available after filtering."
 
     checked = 0
+    nodes = conflict_checks = pruned = duplicates = 0
+    budget_exhausted = False
     candidates: List[Tuple[List[SectionOption], int, ScheduleMetrics]] = []
     seen_keys: Set[Tuple[Tuple[str, str], ...]] = set()
 
@@ -391,13 +423,15 @@ def pick_ranked_schedules(
         return tuple(sorted((s.course, s.section_id) for s in chosen))
 
     def backtrack(i: int, chosen: List[SectionOption]):
-        nonlocal checked
+        nonlocal checked, nodes, conflict_checks, pruned, duplicates, budget_exhausted
         if checked >= max_solutions_checked:
+            budget_exhausted = True
             return
         if i == len(courses):
             checked += 1
             key = _schedule_key(chosen)
             if key in seen_keys:
+                duplicates += 1
                 return
             seen_keys.add(key)
             score = score_schedule_by_preference(
@@ -410,6 +444,7 @@ def pick_ranked_schedules(
             candidates.append((chosen.copy(), score, metrics))
             return
 
+        nodes += 1
         course = courses[i]
         opts = options_by_course.get(course, [])
         if not opts:
@@ -417,15 +452,27 @@ def pick_ranked_schedules(
             return
 
         for sec in opts:
+            conflict_checks += 1
             if section_conflicts(sec, chosen, buffer_min=buffer_min):
+                pruned += 1
                 continue
             chosen.append(sec)
             backtrack(i + 1, chosen)
             chosen.pop()
 
     backtrack(0, [])
-
     candidates.sort(key=lambda t: t[1], reverse=True)
+
+    if stats is not None:
+        stats.nodes = nodes
+        stats.leaves = checked
+        stats.conflict_checks = conflict_checks
+        stats.pruned = pruned
+        stats.duplicates = duplicates
+        stats.candidates = len(candidates)
+        stats.budget_exhausted = budget_exhausted
+        stats.max_solutions_checked = max_solutions_checked
+        stats.solve_ms = round((time.perf_counter() - started) * 1000, 3)
     return candidates[: max(1, max_results)], failures
 
 def pick_sections(
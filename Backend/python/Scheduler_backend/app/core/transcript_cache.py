@@ -0,0 +1,169 @@
+"""Core scheduling backend logic for Transcript Cache."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from app.core.cache import DEFAULT_CACHE_DIR, CacheStats, SqliteTTLCache
+from app.core.normalize import alias_fingerprint
+from app.core.transcript_parser import ParsedTranscript, parse_transcript_pdf
+from app.core.transcript_rules import configured_rule_set
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever parsing, page selection or OCR merging changes what a PDF parses to.
+TRANSCRIPT_PARSER_VERSION = 5
+TRANSCRIPT_CACHE_NAMESPACE = "transcript_parse"
+
+TRANSCRIPT_CACHE_STATS = CacheStats()
+_transcript_cache: Optional[SqliteTTLCache] = None
+_transcript_cache_ready = False
+_transcript_cache_lock = threading.Lock()
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip() or default)
+    except ValueError:
+        return default
+
+
+def _get_transcript_cache() -> Optional[SqliteTTLCache]:
+    global _transcript_cache, _transcript_cache_ready
+    if _transcript_cache_ready:
+        return _transcript_cache
+    with _transcript_cache_lock:
+        if not _transcript_cache_ready:
+            configured = os.getenv("TRANSCRIPT_CACHE_PATH", str(DEFAULT_CACHE_DIR / "transcripts.sqlite3")).strip()
+            max_entries = int(_env_number("TRANSCRIPT_CACHE_MAX_ENTRIES", 2000))
+            if configured.lower() in {"", "0", "off", "false", "no"}:
+                _transcript_cache = None
+            else:
+                path = None if configured == ":memory:" else Path(configured)
+                try:
+                    _transcript_cache = SqliteTTLCache(path, namespace=TRANSCRIPT_CACHE_NAMESPACE, max_entries=max_entries)
+                except Exception as exc:
+                    logger.warning("Transcript cache at %s unavailable (%s); using in-memory cache", configured, exc)
+                    _transcript_cache = SqliteTTLCache(None, namespace=TRANSCRIPT_CACHE_NAMESPACE, max_entries=max_entries)
+            _transcript_cache_ready = True
+    return _transcript_cache
+
+
+def known_courses_fingerprint(known_courses: Iterable[str]) -> str:
+    """Order-independent hash of the catalog codes used for `matched_catalog`/confidence."""
+    digest = hashlib.sha256()
+    for code in sorted(known_courses):
+        digest.update(code.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()[:16]
+
+
+def transcript_cache_key(file_bytes: bytes, catalog_fingerprint: str) -> str:
+    content = hashlib.sha256(file_bytes).hexdigest()
+    ocr_threshold = os.getenv("TRANSCRIPT_OCR_MIN_PAGE_CHARS", "40").strip()
+    return (
+        f"v{TRANSCRIPT_PARSER_VERSION}|{configured_rule_set()}|{catalog_fingerprint}|"
+        f"{alias_fingerprint()}|ocr{ocr_threshold}|{content}"
+    )
+
+
+def _cacheable(parsed: ParsedTranscript) -> bool:
+    # A result degraded by a transient OCR failure should be recomputed next time, not pinned.
+    return not any("OCR fallback was unavailable or failed" in warning for warning in parsed.warnings)
+
+
+def lookup_cached_transcript(file_bytes: bytes, catalog_fingerprint: str) -> Optional[ParsedTranscript]:
+    """
+    The cached parse of this PDF against this catalog, or None on a miss.
+
+    Cheap enough to run before admitting a parse job, so hits never wait for
+    (or are refused by) the parse queue.
+    """
+    cache = _get_transcript_cache()
+    if cache is None:
+        return None
+
+    key = transcript_cache_key(file_bytes, catalog_fingerprint)
+    try:
+        entry = cache.get(key)
+    except Exception as exc:
+        logger.warning("Transcript cache read failed: %s", exc)
+        entry = None
+    if entry is not None and entry.fresh and isinstance(entry.value, dict):
+        try:
+            parsed = ParsedTranscript(**entry.value)
+            TRANSCRIPT_CACHE_STATS.incr("hit")
+            return parsed
+        except TypeError as exc:
+            # ParsedTranscript changed without a TRANSCRIPT_PARSER_VERSION bump; drop the row so
+            # it is not re-read (and re-missed) on every upload of this PDF.
+            TRANSCRIPT_CACHE_STATS.incr("invalid")
+            logger.warning(
+                "Dropping transcript cache entry that no longer matches ParsedTranscript (%s); "
+                "bump TRANSCRIPT_PARSER_VERSION when its fields change",
+                exc,
+            )
+            try:
+                cache.delete(key)
+            except Exception as delete_exc:
+                logger.warning("Transcript cache delete failed: %s", delete_exc)
+
+    TRANSCRIPT_CACHE_STATS.incr("miss")
+    return None
+
+
+def parse_and_cache_transcript(
+    file_bytes: bytes,
+    known_courses: Iterable[str],
+    *,
+    catalog_fingerprint: Optional[str] = None,
+    parse_fn: Callable[..., ParsedTranscript] = parse_transcript_pdf,
+) -> ParsedTranscript:
+    """Parse without looking the PDF up first (the caller already missed) and store a cacheable result."""
+    known = known_courses if isinstance(known_courses, (set, frozenset)) else set(known_courses)
+    parsed = parse_fn(file_bytes, known)
+    cache = _get_transcript_cache()
+    if cache is not None and _cacheable(parsed):
+        key = transcript_cache_key(file_bytes, catalog_fingerprint or known_courses_fingerprint(known))
+        try:
+            cache.set(key, asdict(parsed), _env_number("TRANSCRIPT_CACHE_TTL_SECONDS", 30 * 24 * 3600))
+        except Exception as exc:
+            logger.warning("Transcript cache write failed: %s", exc)
+    return parsed
+
+
+def parse_transcript_pdf_cached(
+    file_bytes: bytes,
+    known_courses: Iterable[str],
+    *,
+    catalog_fingerprint: Optional[str] = None,
+    parse_fn: Callable[..., ParsedTranscript] = parse_transcript_pdf,
+) -> Tuple[ParsedTranscript, bool]:
+    """
+    parse_transcript_pdf behind a content-addressed cache.
+
+    Returns (parsed, cache_hit). `catalog_fingerprint` may be passed in when the
+    caller already has one for `known_courses` (it is cached per model snapshot);
+    `parse_fn` lets misses run somewhere else, e.g. in a worker process.
+    """
+    known = known_courses if isinstance(known_courses, (set, frozenset)) else set(known_courses)
+    fingerprint = catalog_fingerprint or known_courses_fingerprint(known)
+    cached = lookup_cached_transcript(file_bytes, fingerprint)
+    if cached is not None:
+        return cached, True
+    return parse_and_cache_transcript(file_bytes, known, catalog_fingerprint=fingerprint, parse_fn=parse_fn), False
+
+
+def transcript_cache_stats() -> Dict[str, Any]:
+    counts = TRANSCRIPT_CACHE_STATS.snapshot()
+    cache = _get_transcript_cache()
+    stats = {key: counts[key] for key in ("hit", "miss", "invalid", "hit_rate") if key in counts}
+    stats["enabled"] = cache is not None
+    stats["entries"] = cache.size() if cache is not None else None
+    return stats
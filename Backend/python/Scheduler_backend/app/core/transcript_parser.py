@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from io import BytesIO
+import os
 import re
+import shlex
 import subprocess
-import tempfile
-from pathlib import Path
+import threading
 
 from app.core.normalize import norm_course_code
+from app.core.transcript_rules import COURSE, TERM, UNPARSED, LineClassifier, get_classifier
 
 try:
     from pypdf import PdfReader
@@ -31,22 +34,11 @@ GRADE_TOKENS = {
     "P", "NP", "CR", "NC", "W", "AU", "I", "IP",
 }
 
-SUMMARY_LINE_RE = re.compile(
-    r"\b(?:Term|Course Trans|Transfer Term|Combined|Cum|Transfer Cum|Combined Cum)\s+GPA\b",
-    re.IGNORECASE,
-)
-
-TERM_RE = re.compile(r"\b(Spring|Summer|Fall|Winter)\s+20\d{2}\b", re.IGNORECASE)
-COURSE_LINE_RE = re.compile(
-    r"^\s*"
-    r"(?P<subject>[A-Z][A-Z/&]{1,7}(?:\s+[A-Z/&]{1,4})?)"
-    r"\s+"
-    r"(?P<number>[A-Z]?\d{1,3}[A-Z]{0,2})"
-    r"(?:\s+[-:]?\s*(?P<rest>.+))?$"
-)
-NAME_RE = re.compile(r"\b(?:name|student name)\s*:\s*(.+)$", re.IGNORECASE)
-ID_RE = re.compile(r"\b(?:student id|campus id|emplid)\s*:\s*([A-Z0-9-]+)\b", re.IGNORECASE)
+NUMBER_TOKEN_RE = re.compile(r"\d+(?:\.\d+)?")
 UNITS_AT_END_RE = re.compile(r"(?P<units>\d+(?:\.\d+)?)\s*$")
+NO_COURSES_WARNING = (
+    "No course rows were confidently detected. Transcript formatting may need institution-specific parsing rules."
+)
 
 
 @dataclass
@@ -59,71 +51,142 @@ class ParsedTranscript:
     warnings: list[str]
     total_pages: int
     extracted_text_chars: int
+    ocr_pages: list[int] = field(default_factory=list)   # 1-based pages whose text came from OCR
 
 
-def _extract_pdf_text(file_bytes: bytes) -> tuple[str, int]:
+def _extract_pdf_pages(file_bytes: bytes) -> list[str]:
     if PdfReader is None:
         raise RuntimeError("Missing dependency: pypdf is required for transcript PDF parsing.")
 
     reader = PdfReader(BytesIO(file_bytes))
-    pages: list[str] = []
-    for page in reader.pages:
-        pages.append(page.extract_text() or "")
-    return "\n".join(pages), len(reader.pages)
+    return [page.extract_text() or "" for page in reader.pages]
+
+
+def _ocr_min_page_chars() -> int:
+    try:
+        return int(os.getenv("TRANSCRIPT_OCR_MIN_PAGE_CHARS", "40").strip() or "40")
+    except ValueError:
+        return 40
+
+
+# Text quality of one page: letters and digits, which broken font encodings turn into symbols.
+def _readable_chars(text: str) -> int:
+    return sum(1 for ch in text if ch.isalnum())
+
+
+def _page_needs_ocr(text: str) -> bool:
+    # Scanned pages have no (or almost no) text layer; broken font encodings leave mostly symbols.
+    stripped = "".join(text.split())
+    if not stripped:
+        return True
+    readable = _readable_chars(stripped)
+    return readable < _ocr_min_page_chars() or readable / len(stripped) < 0.6
+
+
+def _ocr_into_pages(file_bytes: bytes, page_texts: list[str], page_indexes: list[int]) -> tuple[list[int], int]:
+    """
+    OCR `page_indexes` and swap in each page's OCR text where it reads better than the text layer.
+
+    Returns (pages that now use OCR text, total page count seen by the renderer).
+    """
+    ocr_texts, rendered_pages = _ocr_pages(file_bytes, page_indexes)
+    replaced: list[int] = []
+    for index, ocr_text in sorted(ocr_texts.items()):
+        if index < len(page_texts) and _readable_chars(ocr_text) <= _readable_chars(page_texts[index]):
+            continue
+        while len(page_texts) <= index:
+            page_texts.append("")
+        page_texts[index] = ocr_text
+        replaced.append(index)
+    return replaced, rendered_pages
+
+
+def _ocr_worker_count() -> int:
+    try:
+        configured = int(os.getenv("TRANSCRIPT_OCR_WORKERS", "0").strip() or "0")
+    except ValueError:
+        configured = 0
+    return configured if configured > 0 else max(1, min(4, os.cpu_count() or 1))
+
+
+# Shared across requests so concurrent uploads cannot oversubscribe the CPU with tesseract processes.
+_ocr_pool: ThreadPoolExecutor | None = None
+_ocr_pool_lock = threading.Lock()
+
+
+def _get_ocr_pool() -> ThreadPoolExecutor:
+    global _ocr_pool
+    if _ocr_pool is None:
+        with _ocr_pool_lock:
+            if _ocr_pool is None:
+                _ocr_pool = ThreadPoolExecutor(max_workers=_ocr_worker_count(), thread_name_prefix="transcript-ocr")
+    return _ocr_pool
+
+
+def configure_ocr_pool(workers: int) -> None:
+    """Replace the shared OCR pool with one of `workers` threads (benchmarks, tuning)."""
+    global _ocr_pool
+    with _ocr_pool_lock:
+        previous = _ocr_pool
+        _ocr_pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="transcript-ocr")
+    if previous is not None:
+        previous.shutdown(wait=False)
+
+
+def _tesseract_command() -> list[str]:
+    return shlex.split(os.getenv("TESSERACT_CMD", "tesseract").strip() or "tesseract")
 
 
-def _run_tesseract(image_path: Path) -> str:
+def _run_tesseract(image_png: bytes) -> str:
+    # Image in via stdin, text out via stdout: no temp files. One OpenMP thread per
+    # process, because parallelism comes from running several pages at once.
     proc = subprocess.run(
-        ["tesseract", str(image_path), "stdout"],
+        [*_tesseract_command(), "stdin", "stdout"],
+        input=image_png,
         capture_output=True,
-        text=True,
         check=False,
+        env={**os.environ, "OMP_THREAD_LIMIT": "1"},
     )
     if proc.returncode != 0:
-        stderr = proc.stderr.strip() or "unknown OCR error"
+        stderr = proc.stderr.decode("utf-8", "replace").strip() or "unknown OCR error"
         raise RuntimeError(f"Tesseract failed: {stderr}")
-    return proc.stdout
+    return proc.stdout.decode("utf-8", "replace")
 
 
-def _extract_pdf_text_with_ocr(file_bytes: bytes) -> tuple[str, int]:
+def _ocr_pages(file_bytes: bytes, page_indexes: list[int] | None = None) -> tuple[dict[int, str], int]:
+    """
+    OCR the given 0-based pages (all pages when None) across the shared pool.
+
+    Pages are rendered in order on the calling thread and handed to tesseract as
+    soon as each is ready, so rendering overlaps with OCR of earlier pages.
+    Returns ({page_index: text}, total_pages).
+    """
     if fitz is None:
         raise RuntimeError("Missing dependency: PyMuPDF is required for OCR fallback.")
 
     doc = fitz.open(stream=file_bytes, filetype="pdf")
-    pages: list[str] = []
-    with tempfile.TemporaryDirectory(prefix="scheduleu-transcript-ocr-") as tmpdir:
-        tmp_path = Path(tmpdir)
-        for index, page in enumerate(doc, start=1):
-            pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
-            image_path = tmp_path / f"page-{index}.png"
-            pix.save(str(image_path))
-            pages.append(_run_tesseract(image_path))
-    return "\n".join(pages), len(doc)
-
-
-def _clean_line(line: str) -> str:
-    return re.sub(r"\s+", " ", line).strip()
-
-
-def _is_summary_line(line: str) -> bool:
-    return bool(SUMMARY_LINE_RE.search(line))
-
-
-def _detect_student_info(lines: list[str]) -> tuple[str | None, str | None]:
-    student_name = None
-    student_id = None
-    for line in lines[:40]:
-        if student_name is None:
-            match = NAME_RE.search(line)
-            if match:
-                student_name = match.group(1).strip(" :")
-        if student_id is None:
-            match = ID_RE.search(line)
-            if match:
-                student_id = match.group(1).strip()
-        if student_name and student_id:
-            break
-    return student_name, student_id
+    try:
+        targets = list(range(len(doc))) if page_indexes is None else [i for i in page_indexes if 0 <= i < len(doc)]
+        pool = _get_ocr_pool()
+        futures = {}
+        for index in targets:
+            pix = doc[index].get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
+            futures[index] = pool.submit(_run_tesseract, pix.tobytes("png"))
+        texts: dict[int, str] = {}
+        for index in targets:
+            try:
+                texts[index] = futures[index].result()
+            except Exception as exc:
+                # Name the page so a partial failure is not reported as a generic OCR outage.
+                raise RuntimeError(f"page {index + 1}: {exc}") from exc
+        return texts, len(doc)
+    finally:
+        doc.close()
+
+
+def _extract_pdf_text_with_ocr(file_bytes: bytes) -> tuple[str, int]:
+    texts, total_pages = _ocr_pages(file_bytes)
+    return "\n".join(texts[index] for index in sorted(texts)), total_pages
 
 
 def _split_rest(rest: str) -> tuple[str | None, str | None, float | None]:
@@ -137,7 +200,7 @@ def _split_rest(rest: str) -> tuple[str | None, str | None, float | None]:
     title_tokens: list[str] = []
     for token in text.split():
         upper = token.upper()
-        if re.fullmatch(r"\d+(?:\.\d+)?", token):
+        if NUMBER_TOKEN_RE.fullmatch(token):
             break
         if upper in GRADE_TOKENS:
             break
@@ -150,12 +213,8 @@ def _split_rest(rest: str) -> tuple[str | None, str | None, float | None]:
     return title, None, units
 
 
-def _line_to_course(line: str, current_term: str | None, known_courses: set[str]) -> dict | None:
-    match = COURSE_LINE_RE.match(line)
-    if not match:
-        return None
-
-    subject = re.sub(r"\s+", " ", match.group("subject").upper()).strip()
+def _line_to_course(line: str, match: re.Match, current_term: str | None, known_courses: set[str]) -> dict:
+    subject = " ".join(match.group("subject").upper().split())
     number = match.group("number").upper().strip()
     rest = match.group("rest") or ""
     title, grade, units = _split_rest(rest)
@@ -185,40 +244,33 @@ def _line_to_course(line: str, current_term: str | None, known_courses: set[str]
     }
 
 
-def _parse_text_to_courses(text: str, known_courses: set[str]) -> tuple[str | None, str | None, list[dict], list[dict], list[str], list[str]]:
-    lines = [_clean_line(line) for line in text.splitlines()]
-    lines = [line for line in lines if line]
-
-    student_name, student_id = _detect_student_info(lines)
+def _parse_text_to_courses(
+    text: str,
+    known_courses: set[str],
+    classifier: LineClassifier | None = None,
+) -> tuple[str | None, str | None, list[dict], list[dict], list[str], list[str]]:
+    classifier = classifier or get_classifier()
+    info_lines = classifier.rules.student_info_lines
 
+    student_name: str | None = None
+    student_id: str | None = None
     current_term: str | None = None
     courses: list[dict] = []
     unmatched_lines: list[str] = []
 
-    for line in lines:
-        if _is_summary_line(line):
-            continue
-
-        term_match = TERM_RE.search(line)
-        if term_match:
-            current_term = term_match.group(0).title()
-            continue
-
-        course = _line_to_course(line, current_term, known_courses)
-        if course:
-            courses.append(course)
-            continue
-
-        if (
-            not _is_summary_line(line)
-            and re.search(r"\b(?:[A-Z]?\d{1,3}[A-Z]?|\d{1,3}[A-Z]?)\b", line)
-            and re.search(r"\b[A-Z]{2,5}\b", line)
-        ):
+    for position, (label, line, match) in enumerate(classifier.iter_lines(text)):
+        if position < info_lines and (student_name is None or student_id is None):
+            name, found_id = classifier.student_info(line)
+            student_name = student_name or name
+            student_id = student_id or found_id
+
+        if label == TERM:
+            current_term = match.group("term_text").title()
+        elif label == COURSE:
+            courses.append(_line_to_course(line, match, current_term, known_courses))
+        elif label == UNPARSED:
             unmatched_lines.append(line)
 
-    if not courses:
-        warnings.append("No course rows were confidently detected. Transcript formatting may need institution-specific parsing rules.")
-
     term_map: dict[str, list[dict]] = {}
     for course in courses:
         term_key = course["term"] or "Unknown Term"
@@ -230,6 +282,8 @@ def _parse_text_to_courses(text: str, known_courses: set[str]) -> tuple[str | No
     ]
 
     warnings: list[str] = []
+    if not courses:
+        warnings.append(NO_COURSES_WARNING)
     if unmatched_lines:
         warnings.append("Some lines looked course-like but could not be parsed. Review the unmatched lines.")
 
@@ -237,55 +291,74 @@ def _parse_text_to_courses(text: str, known_courses: set[str]) -> tuple[str | No
 
 
 def parse_transcript_pdf(file_bytes: bytes, known_courses: set[str]) -> ParsedTranscript:
+    """
+    Extract course rows from a transcript PDF.
+
+    Each page's text layer is scored and only pages that look scanned or
+    garbled are OCR'd; their text is merged back page by page. If no course
+    rows turn up at all, the remaining pages are OCR'd as a last resort.
+    """
     warnings: list[str] = []
 
-    text, total_pages = _extract_pdf_text(file_bytes)
+    page_texts = _extract_pdf_pages(file_bytes)
+    total_pages = len(page_texts)
+    ocr_pages: list[int] = []
+    attempted: set[int] = set()
+    ocr_failed = False
+
+    needs_ocr = [index for index, page_text in enumerate(page_texts) if _page_needs_ocr(page_text)]
+    if needs_ocr:
+        attempted.update(needs_ocr)
+        try:
+            replaced, rendered_pages = _ocr_into_pages(file_bytes, page_texts, needs_ocr)
+            ocr_pages.extend(replaced)
+            total_pages = max(total_pages, rendered_pages)
+        except Exception as exc:
+            ocr_failed = True
+            warnings.append(f"OCR fallback was unavailable or failed: {exc}")
+
+    text = "\n".join(page_texts)
     student_name, student_id, courses, grouped_by_term, unmatched_lines, parse_warnings = _parse_text_to_courses(
         text,
         known_courses,
     )
-    warnings.extend(parse_warnings)
 
-    should_try_ocr = not text.strip() or len(courses) == 0
-    if should_try_ocr:
-        ocr_text = ""
+    remaining = [index for index in range(total_pages) if index not in attempted]
+    if not courses and remaining and not ocr_failed:
+        # Text layer looked fine but yielded nothing (e.g. text drawn as vector outlines): try OCR everywhere else.
+        candidate_texts = list(page_texts)
         try:
-            ocr_text, ocr_pages = _extract_pdf_text_with_ocr(file_bytes)
-            total_pages = max(total_pages, ocr_pages)
-            (
-                ocr_student_name,
-                ocr_student_id,
-                ocr_courses,
-                ocr_grouped_by_term,
-                ocr_unmatched_lines,
-                ocr_parse_warnings,
-            ) = _parse_text_to_courses(ocr_text, known_courses)
-
-            if len(ocr_courses) > len(courses):
-                text = ocr_text
-                student_name = ocr_student_name or student_name
-                student_id = ocr_student_id or student_id
-                courses = ocr_courses
-                grouped_by_term = ocr_grouped_by_term
-                unmatched_lines = ocr_unmatched_lines
-                warnings = [w for w in warnings if "could not be parsed" not in w]
-                warnings.extend(ocr_parse_warnings)
-                warnings.append("Used OCR fallback because direct PDF text extraction was empty or insufficient.")
+            replaced, rendered_pages = _ocr_into_pages(file_bytes, candidate_texts, remaining)
+            total_pages = max(total_pages, rendered_pages)
+            candidate_text = "\n".join(candidate_texts)
+            candidate = _parse_text_to_courses(candidate_text, known_courses)
+            if len(candidate[2]) > len(courses):
+                text = candidate_text
+                student_name = candidate[0] or student_name
+                student_id = candidate[1] or student_id
+                courses, grouped_by_term, unmatched_lines, parse_warnings = candidate[2], candidate[3], candidate[4], candidate[5]
+                ocr_pages.extend(replaced)
             elif not text.strip():
                 warnings.append("OCR fallback ran, but still could not confidently detect course rows.")
         except Exception as exc:
             warnings.append(f"OCR fallback was unavailable or failed: {exc}")
 
+    # The no-courses warning goes last, after the OCR notes, as it always has.
+    warnings.extend(warning for warning in parse_warnings if warning != NO_COURSES_WARNING)
+    ocr_pages = sorted(set(ocr_pages))
+    if ocr_pages:
+        warnings.append(
+            f"Used OCR for {len(ocr_pages)} of {total_pages} page(s) where the PDF text layer was missing or unreadable."
+        )
+
     return ParsedTranscript(
         student_name=student_name,
         student_id=student_id,
         courses=courses,
         grouped_by_term=grouped_by_term,
         unmatched_lines=unmatched_lines,
-        warnings=warnings + (
-            ["No course rows were confidently detected. Transcript formatting may need institution-specific parsing rules."]
-            if not courses else []
-        ),
+        warnings=warnings + ([NO_COURSES_WARNING] if not courses else []),
         total_pages=total_pages,
         extracted_text_chars=len(text),
+        ocr_pages=[index + 1 for index in ocr_pages],
     )
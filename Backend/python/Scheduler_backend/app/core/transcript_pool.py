@@ -0,0 +1,96 @@
+"""Core scheduling backend logic for Transcript Pool."""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import FrozenSet, Iterable, Optional
+
+from app.core.metrics import stage
+from app.core.transcript_parser import ParsedTranscript, configure_ocr_pool, parse_transcript_pdf
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptPDFError(ValueError):
+    """The upload could not be read as a transcript PDF (as opposed to a server-side failure)."""
+
+
+def parse_worker_count() -> int:
+    try:
+        configured = int(os.getenv("TRANSCRIPT_PARSE_WORKERS", "0").strip() or "0")
+    except ValueError:
+        configured = 0
+    if configured > 0:
+        return configured
+    return max(1, min(2, os.cpu_count() or 1))
+
+
+def _init_worker(ocr_workers: int) -> None:
+    # Each parse process gets a share of the cores for its OCR threads instead of all of them.
+    if not os.getenv("TRANSCRIPT_OCR_WORKERS", "").strip():
+        configure_ocr_pool(ocr_workers)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is not None:
+        return _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = parse_worker_count()
+            # spawn, not fork: the server process is full of threads and open sqlite handles.
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(max(1, (os.cpu_count() or 1) // workers),),
+            )
+    return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is broken:
+            _pool = None
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_parse_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def parse_transcript_pdf_isolated(file_bytes: bytes, known_courses: Iterable[str]) -> ParsedTranscript:
+    """
+    Run parse_transcript_pdf in a worker process and block for the result.
+
+    Server-side failures (missing OCR dependencies, a crashed worker) surface as
+    RuntimeError; anything else means the PDF itself was unreadable and is
+    raised as TranscriptPDFError.
+    """
+    known: FrozenSet[str] = known_courses if isinstance(known_courses, frozenset) else frozenset(known_courses)
+    pool = _get_pool()
+    try:
+        with stage("transcript_parse"):
+            return pool.submit(parse_transcript_pdf, file_bytes, known).result()
+    except BrokenProcessPool as exc:
+        logger.warning("Transcript parse worker died; restarting the pool: %s", exc)
+        _reset_pool(pool)
+        raise RuntimeError("Transcript parser worker crashed; try again.") from exc
+    except RuntimeError:
+        raise
+    except Exception as exc:
+        raise TranscriptPDFError(f"Failed to parse transcript PDF: {exc}") from exc
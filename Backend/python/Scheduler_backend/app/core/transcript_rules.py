@@ -0,0 +1,143 @@
+"""Core scheduling backend logic for Transcript Rules."""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple
+
+# Line labels; the classifier tries summary, term, course, then course-like.
+SUMMARY = "summary"
+TERM = "term"
+COURSE = "course"
+UNPARSED = "unparsed"   # looks course-like (a code-ish token and an upper-case word) but did not parse
+NOISE = "noise"
+
+
+# One institution's transcript layout, as regex fragments (no anchors, no flags).
+@dataclass(frozen=True)
+class TranscriptRules:
+    name: str
+    summary: str
+    term: str
+    course: str
+    student_name: str
+    student_id: str
+    course_like_number: str = r"\b(?:[A-Z]?\d{1,3}[A-Z]?|\d{1,3}[A-Z]?)\b"
+    course_like_word: str = r"\b[A-Z]{2,5}\b"
+    student_info_lines: int = 40
+
+
+DEFAULT_RULES = TranscriptRules(
+    name="default",
+    summary=r"\b(?:Term|Course Trans|Transfer Term|Combined|Cum|Transfer Cum|Combined Cum)\s+GPA\b",
+    term=r"\b(?:Spring|Summer|Fall|Winter)\s+20\d{2}\b",
+    course=(
+        r"(?P<subject>[A-Z][A-Z/&]{1,7}(?:\s+[A-Z/&]{1,4})?|[A-Z]\s[A-Z]{1,3})"   # "CECS", "C E", "E E"
+        r"\s+"
+        r"(?P<number>[A-Z]?\d{1,3}[A-Z]{0,2})"
+        r"(?:\s+[-:]?\s*(?P<rest>.+))?"
+    ),
+    student_name=r"\b(?:name|student name)\s*:\s*(?P<student_name>.+)$",
+    student_id=r"\b(?:student id|campus id|emplid)\s*:\s*(?P<student_id>[A-Z0-9-]+)\b",
+)
+
+# Quarter-system registrars print "Autumn Quarter 2023" headers and "Cumulative GPA" totals.
+QUARTER_RULES = TranscriptRules(
+    name="quarter",
+    summary=r"\b(?:Term|Quarter|Cumulative|Cum|Transfer|Combined)\s+(?:GPA|Totals?)\b",
+    term=r"\b(?:Autumn|Fall|Winter|Spring|Summer)\s+(?:Quarter\s+|Qtr\s+)?20\d{2}\b",
+    course=DEFAULT_RULES.course,
+    student_name=DEFAULT_RULES.student_name,
+    student_id=r"\b(?:student id|student no|sid|emplid)\s*[:#]\s*(?P<student_id>[A-Z0-9-]+)\b",
+)
+
+
+class LineClassifier:
+    """
+    Labels transcript lines with one compiled pattern.
+
+    The summary, term, course and course-like rules become branches of a
+    single anchored alternation, tried in priority order, so each line costs
+    one regex call however many rules an institution has. Branches other than
+    the course row are zero-width lookaheads; the outer named group of the
+    branch that matched is the label. Student name/id only ever appear in the
+    header, so they are searched for separately in the first few lines.
+    """
+
+    def __init__(self, rules: TranscriptRules) -> None:
+        self.rules = rules
+        # Existence-only lookaheads scan greedily (faster in sre); the term needs its first occurrence.
+        self._pattern = re.compile(
+            "^(?:"
+            f"(?P<{SUMMARY}>(?=.*(?i:{rules.summary})))"
+            f"|(?P<{TERM}>(?=.*?(?P<term_text>(?i:{rules.term}))))"
+            f"|(?P<{COURSE}>{rules.course}$)"
+            f"|(?P<{UNPARSED}>(?=.*{rules.course_like_number})(?=.*{rules.course_like_word}))"
+            ")"
+        )
+        self._student_name = re.compile(rules.student_name, re.IGNORECASE)
+        self._student_id = re.compile(rules.student_id, re.IGNORECASE)
+
+    def classify(self, line: str) -> Tuple[str, Optional[re.Match]]:
+        match = self._pattern.match(line)
+        if match is None:
+            return NOISE, None
+        return match.lastgroup or NOISE, match
+
+    def iter_lines(self, text: str) -> Iterator[Tuple[str, str, Optional[re.Match]]]:
+        """(label, whitespace-normalized line, match) for every non-blank line of `text`."""
+        classify = self._pattern.match
+        for raw in text.splitlines():
+            line = " ".join(raw.split())
+            if not line:
+                continue
+            match = classify(line)
+            yield (match.lastgroup or NOISE) if match else NOISE, line, match
+
+    def student_info(self, line: str) -> Tuple[Optional[str], Optional[str]]:
+        name = self._student_name.search(line)
+        student_id = self._student_id.search(line)
+        return (
+            name.group("student_name").strip(" :") if name else None,
+            student_id.group("student_id").strip() if student_id else None,
+        )
+
+
+_rule_sets: Dict[str, TranscriptRules] = {DEFAULT_RULES.name: DEFAULT_RULES, QUARTER_RULES.name: QUARTER_RULES}
+_classifiers: Dict[str, LineClassifier] = {}
+_rules_lock = threading.Lock()
+
+
+def register_rule_set(rules: TranscriptRules) -> None:
+    """Add or replace an institution's rule set (compiled lazily on first use)."""
+    with _rules_lock:
+        _rule_sets[rules.name] = rules
+        _classifiers.pop(rules.name, None)
+
+
+def rule_set_names() -> list[str]:
+    with _rules_lock:
+        return sorted(_rule_sets)
+
+
+def configured_rule_set() -> str:
+    return os.getenv("TRANSCRIPT_RULES", DEFAULT_RULES.name).strip() or DEFAULT_RULES.name
+
+
+def get_classifier(name: Optional[str] = None) -> LineClassifier:
+    key = name or configured_rule_set()
+    classifier = _classifiers.get(key)
+    if classifier is not None:
+        return classifier
+    with _rules_lock:
+        rules = _rule_sets.get(key)
+        if rules is None:
+            raise RuntimeError(f"Unknown transcript rule set: {key}")
+        classifier = _classifiers.get(key)
+        if classifier is None:
+            classifier = LineClassifier(rules)
+            _classifiers[key] = classifier
+    return classifier
@@ -0,0 +1,341 @@
+"""Core scheduling backend logic for Upstream."""
+
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.metrics import observe_upstream
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class UpstreamError(RuntimeError):
+    """An upstream call failed after retries (or was never attempted)."""
+
+    def __init__(self, upstream: str, message: str, status: Optional[int] = None) -> None:
+        super().__init__(f"{upstream}: {message}")
+        self.upstream = upstream
+        self.status = status
+
+
+class CircuitOpenError(UpstreamError):
+    """The upstream's breaker is open, so the call failed fast without any I/O."""
+
+
+class UpstreamBusyError(UpstreamError):
+    """Every connection slot for the upstream stayed busy for the whole acquire timeout."""
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)).strip() or default)
+    except ValueError:
+        return default
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker.
+
+    Opens after `failure_threshold` failed calls in a row, rejects calls for
+    `reset_timeout_s`, then lets a single probe through (half-open); the probe's
+    outcome closes or re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_s = reset_timeout_s
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state_locked()
+
+    def _state_locked(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout_s:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state_locked()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release_probe(self) -> None:
+        """Give back a half-open probe slot that ended up never calling the upstream."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self) -> bool:
+        """Count one failed call; returns True when this failure (re)opened the breaker."""
+        with self._lock:
+            self._failures += 1
+            was_probe = self._probe_in_flight
+            self._probe_in_flight = False
+            if was_probe or self._failures >= self.failure_threshold:
+                reopened = self._opened_at is None or was_probe
+                self._opened_at = time.monotonic()
+                return reopened
+            return False
+
+
+# Per-upstream call counters plus a window of recent latencies for percentiles.
+class UpstreamStats:
+    def __init__(self, window: int = 512) -> None:
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.status_counts: Dict[str, int] = {}
+        self._latencies_ms: deque = deque(maxlen=window)
+        self.latency_total_ms = 0.0
+        self.latency_count = 0
+
+    def incr(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + amount
+
+    def observe(self, elapsed_ms: float, status: Optional[int]) -> None:
+        with self._lock:
+            self._latencies_ms.append(elapsed_ms)
+            self.latency_total_ms += elapsed_ms
+            self.latency_count += 1
+            key = str(status) if status is not None else "network_error"
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self._latencies_ms)
+
+            def _pct(p: float) -> Optional[float]:
+                if not ordered:
+                    return None
+                return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))], 1)
+
+            return {
+                **self.counts,
+                "status": dict(self.status_counts),
+                "attempts": self.latency_count,
+                "avg_ms": round(self.latency_total_ms / self.latency_count, 1) if self.latency_count else None,
+                "p50_ms": _pct(0.50),
+                "p95_ms": _pct(0.95),
+                "max_ms": round(ordered[-1], 1) if ordered else None,
+            }
+
+
+class UpstreamClient:
+    """
+    Pooled, keep-alive JSON client for one upstream host.
+
+    Every call is bounded three ways: a concurrency cap (callers wait at most
+    `acquire_timeout_s` for a slot), a per-call deadline covering all retries,
+    and a circuit breaker that fails fast while the upstream is down. Only
+    5xx, 429 and network errors count against the breaker.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_concurrency: int = 8,
+        connect_timeout_s: float = 2.0,
+        read_timeout_s: float = 5.0,
+        deadline_s: float = 8.0,
+        retries: int = 2,
+        backoff_base_s: float = 0.2,
+        backoff_max_s: float = 2.0,
+        acquire_timeout_s: float = 1.0,
+        failure_threshold: int = 5,
+        reset_timeout_s: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self.connect_timeout_s = connect_timeout_s
+        self.read_timeout_s = read_timeout_s
+        self.deadline_s = deadline_s
+        self.retries = max(0, retries)
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.acquire_timeout_s = acquire_timeout_s
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout_s)
+        self.stats = UpstreamStats()
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=self.max_concurrency)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _observe(self, started: float, status: Optional[int]) -> None:
+        elapsed_s = time.perf_counter() - started
+        self.stats.observe(elapsed_s * 1000, status)
+        observe_upstream(self.name, elapsed_s, status)
+
+    def _backoff_s(self, attempt: int, retry_after: Optional[str]) -> float:
+        # Full jitter keeps retrying callers from stampeding a recovering upstream together.
+        delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt)))
+        if retry_after:
+            try:
+                delay = max(delay, min(float(retry_after), self.backoff_max_s))
+            except ValueError:
+                pass
+        return delay
+
+    def post_json(
+        self,
+        url: str,
+        payload: Dict[str, Any],
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        deadline_s: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """POST `payload` as JSON and return the decoded JSON body, or raise UpstreamError."""
+        if not self.breaker.allow():
+            self.stats.incr("short_circuited")
+            raise CircuitOpenError(self.name, "circuit open; failing fast")
+
+        if not self._slots.acquire(timeout=self.acquire_timeout_s):
+            self.stats.incr("rejected_busy")
+            # Saturation is not evidence the upstream is down, so the breaker is left alone.
+            self.breaker.release_probe()
+            raise UpstreamBusyError(self.name, f"all {self.max_concurrency} connection slots busy")
+
+        self.stats.incr("calls")
+        deadline = time.monotonic() + (deadline_s if deadline_s is not None else self.deadline_s)
+        last_error = "no attempt made"
+        last_status: Optional[int] = None
+        try:
+            for attempt in range(self.retries + 1):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    last_error = "deadline exceeded"
+                    break
+                if attempt:
+                    self.stats.incr("retries")
+
+                started = time.perf_counter()
+                status: Optional[int] = None
+                retry_after: Optional[str] = None
+                try:
+                    response = self._session.post(
+                        url,
+                        json=payload,
+                        headers=headers,
+                        timeout=(min(self.connect_timeout_s, remaining), min(self.read_timeout_s, remaining)),
+                    )
+                    status = response.status_code
+                    if status < 400:
+                        body = response.json()
+                        self._observe(started, status)
+                        self.breaker.record_success()
+                        self.stats.incr("success")
+                        return body
+                    retry_after = response.headers.get("Retry-After")
+                    last_error = f"HTTP {status}"
+                    last_status = status
+                except ValueError:
+                    self._observe(started, status)
+                    # A 2xx with an undecodable body will not improve on retry.
+                    self.breaker.record_success()
+                    raise UpstreamError(self.name, "response body was not JSON", status)
+                except requests.RequestException as exc:
+                    last_error = type(exc).__name__
+                self._observe(started, status)
+
+                if status is not None and status not in RETRYABLE_STATUS:
+                    break
+                if attempt < self.retries:
+                    pause = self._backoff_s(attempt, retry_after)
+                    if time.monotonic() + pause >= deadline:
+                        break
+                    time.sleep(pause)
+        finally:
+            self._slots.release()
+
+        if last_status is not None and 400 <= last_status < 500 and last_status not in RETRYABLE_STATUS:
+            # The upstream answered; a rejected request (bad input, auth) says nothing about its health.
+            self.stats.incr("client_errors")
+            self.breaker.record_success()
+            raise UpstreamError(self.name, last_error, last_status)
+
+        self.stats.incr("failures")
+        if self.breaker.record_failure():
+            self.stats.incr("circuit_opened")
+            logger.warning("Upstream %s circuit opened after: %s", self.name, last_error)
+        raise UpstreamError(self.name, last_error, last_status)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "circuit": self.breaker.state,
+            "max_concurrency": self.max_concurrency,
+            **self.stats.snapshot(),
+        }
+
+
+_clients: Dict[str, UpstreamClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_upstream(name: str, **defaults: Any) -> UpstreamClient:
+    """
+    Shared client for the named upstream, created on first use.
+
+    Keyword defaults can be overridden per upstream from the environment, e.g.
+    UPSTREAM_RMP_READ_TIMEOUT_SECONDS or UPSTREAM_OPENAI_MAX_CONCURRENCY.
+    """
+    existing = _clients.get(name)
+    if existing is not None:
+        return existing
+    with _clients_lock:
+        if name in _clients:
+            return _clients[name]
+        prefix = f"UPSTREAM_{name.upper()}_"
+        settings: Dict[str, Any] = dict(defaults)
+        env_keys = {
+            "max_concurrency": ("MAX_CONCURRENCY", int),
+            "connect_timeout_s": ("CONNECT_TIMEOUT_SECONDS", float),
+            "read_timeout_s": ("READ_TIMEOUT_SECONDS", float),
+            "deadline_s": ("DEADLINE_SECONDS", float),
+            "retries": ("RETRIES", int),
+            "acquire_timeout_s": ("ACQUIRE_TIMEOUT_SECONDS", float),
+            "failure_threshold": ("FAILURE_THRESHOLD", int),
+            "reset_timeout_s": ("RESET_TIMEOUT_SECONDS", float),
+        }
+        for key, (suffix, cast) in env_keys.items():
+            if os.getenv(prefix + suffix, "").strip():
+                settings[key] = cast(_env_number(prefix + suffix, settings.get(key, 0)))
+        client = UpstreamClient(name, **settings)
+        _clients[name] = client
+        return client
+
+
+def upstream_stats() -> Dict[str, Any]:
+    with _clients_lock:
+        clients = dict(_clients)
+    return {name: client.snapshot() for name, client in sorted(clients.items())}
@@ -1,5 +1,6 @@
 """Application entrypoint for this service."""
 
+import logging
 import os
 from pathlib import Path
 
@@ -9,6 +10,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api import routes
 
 from app.api.routes import router as api_router
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.core.normalize import load_configured_course_aliases
+from app.core.transcript_pool import shutdown_parse_pool
 
 
 def load_local_env() -> None:
@@ -18,6 +24,14 @@ def load_local_env() -> None:
         load_dotenv(dotenv_path=env_path, override=False)
 
 
+def configure_logging() -> None:
+    """Route app loggers (startup timings, load failures) to stderr next to uvicorn's."""
+    logging.basicConfig(
+        level=os.getenv("LOG_LEVEL", "INFO").strip().upper() or "INFO",
+        format="%(levelname)s:     %(name)s - %(message)s",
+    )
+
+
 def parse_cors_origins() -> list[str]:
     configured = os.getenv("CORS_ALLOW_ORIGINS", "").strip()
     if configured:
@@ -29,13 +43,34 @@ def parse_cors_origins() -> list[str]:
 
 
 load_local_env()
+configure_logging()
+load_configured_course_aliases()
 
 app = FastAPI(title="Scheduler Backend")
+
+
 @app.on_event("startup")
+def configure_from_env():
+    # Runs after load_local_env(), so queue and cache settings from .env apply.
+    routes.configure_from_env()
 
 
+@app.on_event("startup")
 def startup_load_data():
-    routes.startup_load()
+    # Load in the background so the server accepts connections immediately;
+    # data-backed routes answer 503 + Retry-After until /health/ready is 200.
+    routes.start_background_load()
+
+
+@app.on_event("shutdown")
+def stop_model_watchers():
+    routes.MODEL_STORE.stop()
+
+
+@app.on_event("shutdown")
+def stop_transcript_workers():
+    shutdown_parse_pool()
+
 
 app.include_router(api_router)
 
@@ -43,6 +78,12 @@ app.include_router(api_router)
 def root():
     return {"ok": True, "message": "Scheduler backend running. See /health and /docs"}
 
+# Innermost, so oversized transcript uploads are cut off before multipart parsing and the 413 still gets CORS headers.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    path_prefixes=("/transcript/",),
+    max_bytes=routes.transcript_max_body_bytes,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=parse_cors_origins(),
@@ -51,3 +92,6 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ProfilingMiddleware)
+# Outermost, so request timings include CORS handling and the Server-Timing header reaches every response.
+app.add_middleware(MetricsMiddleware)
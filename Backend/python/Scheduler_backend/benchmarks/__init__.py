@@ -0,0 +1 @@
+"""Standalone micro-benchmarks for backend hot paths (run with `python -m benchmarks.<name>`)."""
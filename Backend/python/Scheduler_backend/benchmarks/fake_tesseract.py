@@ -0,0 +1,33 @@
+"""Stand-in for the `tesseract` CLI when it is not installed.
+
+Reads a PNG on stdin, burns CPU roughly in proportion to the image size (like
+real OCR), and prints the transcript lines embedded by benchmarks.ocr_bench.
+
+    TESSERACT_CMD="python -m benchmarks.fake_tesseract" python -m benchmarks.ocr_bench
+"""
+
+from __future__ import annotations
+
+import hashlib
+import sys
+
+
+def main() -> None:
+    if len(sys.argv) < 3 or sys.argv[1] != "stdin" or sys.argv[2] != "stdout":
+        sys.stderr.write("usage: fake_tesseract stdin stdout\n")
+        sys.exit(2)
+    image = sys.stdin.buffer.read()
+    if not image.startswith(b"\x89PNG"):
+        sys.stderr.write("Error in pixReadStream: Unknown format: no pix returned\n")
+        sys.exit(1)
+
+    # ~0.3 s of hashing per page at 2x render scale on a typical core.
+    digest = image
+    for _ in range(max(1, len(image) // 40)):
+        digest = hashlib.sha256(digest).digest()
+
+    sys.stdout.write("Fall 2023\nCECS 174 Intro to Programming A 3.0\nMATH 122 Calculus I B 4.0\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Micro-benchmark for course-code normalization over a full term table.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m benchmarks.normalize_bench [--sections-per-course 8] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import re
+import time
+from pathlib import Path
+
+from app.core import normalize
+from app.core.normalize import norm_course_code, normalize_many
+
+DATA_CSV = Path(__file__).resolve().parents[1] / "data" / "pre_req_filtered.csv"
+
+
+def _baseline_norm_course_code(s: str) -> str:
+    # The pre-service implementation: compiles the pattern on every call.
+    COURSE_TOKEN_RE = re.compile(r"\b([A-Z][A-Z/]{1,10})\s*([0-9]{2,3})([A-Z]?)\b")
+    if not s:
+        return ""
+    s = s.strip().upper()
+    m = COURSE_TOKEN_RE.search(s)
+    if not m:
+        return s.replace(" ", "")
+    return f"{m.group(1)}{m.group(2)}{m.group(3)}"
+
+
+def build_term_table(sections_per_course: int) -> list[str]:
+    """One raw course-code cell per section row, in the spellings seen across sources."""
+    with DATA_CSV.open(newline="", encoding="utf-8-sig") as handle:
+        codes = [row["course_code_full"] for row in csv.DictReader(handle) if row.get("course_code_full")]
+
+    spellings = [
+        lambda c: c,
+        lambda c: c.lower(),
+        lambda c: c.replace(" ", ""),
+        lambda c: f"  {c}  ",
+    ]
+    rows: list[str] = []
+    for code in codes:
+        for i in range(sections_per_course):
+            rows.append(spellings[i % len(spellings)](code))
+    return rows
+
+
+def _time(label: str, fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<44} {best * 1000:9.2f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sections-per-course", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = build_term_table(args.sections_per_course)
+    print(f"term table: {len(rows)} section rows, {len(set(rows))} distinct raw cells\n")
+
+    baseline = _time(
+        "baseline (recompile, normalize twice/item)",
+        lambda: [_baseline_norm_course_code(c) for c in rows if _baseline_norm_course_code(c)],
+        args.repeat,
+    )
+
+    def _cold() -> None:
+        normalize._norm_course_code_cached.cache_clear()
+        normalize_many(rows)
+
+    _time("normalize_many, cold memo", _cold, args.repeat)
+    _time("norm_course_code loop, warm memo", lambda: [norm_course_code(c) for c in rows], args.repeat)
+    warm = _time("normalize_many, warm memo", lambda: normalize_many(rows), args.repeat)
+
+    expected = [code for code in (_baseline_norm_course_code(c) for c in rows) if code]
+    drift = sum(1 for a, b in zip(normalize_many(rows), expected) if a != b)
+    print(f"\nrows changed by alias table vs baseline: {drift}")
+    print(f"speedup (warm bulk vs baseline): {baseline / warm:.1f}x")
+    print(f"memo: {normalize.normalize_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Wall-clock scaling of transcript OCR with the worker-pool size.
+
+Builds synthetic scanned transcripts (text rendered to images, no text layer)
+and times `_extract_pdf_text_with_ocr` for several worker counts.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m benchmarks.ocr_bench [--pages 6] [--workers 1,2,4] [--repeat 2]
+    TESSERACT_CMD="python -m benchmarks.fake_tesseract" python -m benchmarks.ocr_bench   # without tesseract
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import fitz
+
+from app.core import transcript_parser
+from app.core.transcript_parser import configure_ocr_pool
+
+SUBJECTS = ["CECS", "MATH", "PHYS", "ENGL", "HIST", "CHEM", "BIOL", "ECON"]
+TERMS = ["Fall 2021", "Spring 2022", "Fall 2022", "Spring 2023", "Fall 2023", "Spring 2024"]
+GRADES = ["A", "A-", "B+", "B", "C", "CR"]
+
+
+def synthetic_transcript_lines(page: int, rows: int = 18) -> list[str]:
+    lines = ["CALIFORNIA STATE UNIVERSITY LONG BEACH", "Unofficial Transcript"]
+    if page == 0:
+        lines += ["Name: Jordan Example", "Student ID: 012345678"]
+    lines.append(TERMS[page % len(TERMS)])
+    for row in range(rows):
+        subject = SUBJECTS[(page * rows + row) % len(SUBJECTS)]
+        number = 100 + (page * 37 + row * 11) % 400
+        grade = GRADES[row % len(GRADES)]
+        lines.append(f"{subject} {number} Course Title {row + 1} {grade} 3.0")
+    lines.append("Term GPA 3.45 Totals 15.0")
+    return lines
+
+
+def build_pdf(pages: int, *, scanned: bool | list[bool] = True) -> bytes:
+    """A transcript PDF; scanned pages are images with no text layer, others are plain text."""
+    flags = scanned if isinstance(scanned, list) else [scanned] * pages
+    out = fitz.open()
+    for index in range(pages):
+        text_doc = fitz.open()
+        page = text_doc.new_page(width=612, height=792)
+        y = 60
+        for line in synthetic_transcript_lines(index):
+            page.insert_text((54, y), line, fontsize=11)
+            y += 16
+        if flags[index]:
+            pix = page.get_pixmap(matrix=fitz.Matrix(150 / 72, 150 / 72), colorspace=fitz.csGRAY)
+            scan = out.new_page(width=612, height=792)
+            scan.insert_image(scan.rect, stream=pix.tobytes("jpg", jpg_quality=70))
+        else:
+            out.insert_pdf(text_doc)
+        text_doc.close()
+    data = out.tobytes()
+    out.close()
+    return data
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=6)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    pdf = build_pdf(args.pages)
+    print(f"{args.pages}-page scanned PDF, {len(pdf) / 1024:.0f} KiB, cpu_count={os.cpu_count()}, "
+          f"ocr={os.getenv('TESSERACT_CMD', 'tesseract')}")
+
+    baseline = None
+    for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+        configure_ocr_pool(workers)
+        best = float("inf")
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            text, total_pages = transcript_parser._extract_pdf_text_with_ocr(pdf)
+            best = min(best, time.perf_counter() - started)
+        assert total_pages == args.pages and text.strip()
+        baseline = baseline or best
+        print(f"workers={workers:<2} {best * 1000:8.0f} ms   speedup x{baseline / best:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Cost of the section search counters in pick_ranked_schedules.
+
+Builds seeded synthetic section options (several courses, each with lecture
+sections on MW/TTh/F time slots) and times the uninstrumented search loop,
+kept below as the baseline, against pick_ranked_schedules with and without
+a SearchStats.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m benchmarks.section_search_bench [--courses 5] [--sections 12] [--repeat 7]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List, Set, Tuple
+
+from app.core.section_models import MeetingBlock, SectionOption
+from app.core.section_scheduler import (
+    SearchStats,
+    compute_schedule_metrics,
+    pick_ranked_schedules,
+    score_schedule_by_preference,
+    section_conflicts,
+)
+
+DAY_PATTERNS = [{0, 2}, {1, 3}, {0, 2, 4}, {4}]
+
+
+def build_options(courses: int, sections: int, seed: int = 7) -> Dict[str, List[SectionOption]]:
+    rng = random.Random(seed)
+    options: Dict[str, List[SectionOption]] = {}
+    for index in range(courses):
+        course = f"CECS{100 + index * 10}"
+        options[course] = []
+        for number in range(sections):
+            start = rng.randrange(8 * 60, 19 * 60, 30)
+            meeting = MeetingBlock(days=set(rng.choice(DAY_PATTERNS)), start_min=start, end_min=start + rng.choice([50, 75]))
+            options[course].append(
+                SectionOption(course=course, section_id=f"{number + 1:02d}", meetings=[meeting], instructor=f"Prof {number % 5}")
+            )
+    return options
+
+
+def _baseline_pick(
+    options_by_course,
+    *,
+    buffer_min=0,
+    max_solutions_checked=20000,
+    max_results=5,
+    ranking_preference="compact",
+    preferred_sections=None,
+    preferred_professors=None,
+):
+    # pick_ranked_schedules before the search counters were added.
+    courses = list(options_by_course.keys())
+    courses.sort(key=lambda c: len(options_by_course.get(c, [])))
+    checked = 0
+    candidates = []
+    seen_keys: Set[Tuple[Tuple[str, str], ...]] = set()
+
+    def _schedule_key(chosen):
+        return tuple(sorted((s.course, s.section_id) for s in chosen))
+
+    def backtrack(i, chosen):
+        nonlocal checked
+        if checked >= max_solutions_checked:
+            return
+        if i == len(courses):
+            checked += 1
+            key = _schedule_key(chosen)
+            if key in seen_keys:
+                return
+            seen_keys.add(key)
+            score = score_schedule_by_preference(
+                chosen,
+                ranking_preference,
+                preferred_sections=preferred_sections,
+                preferred_professors=preferred_professors,
+            )
+            metrics = compute_schedule_metrics(chosen)
+            candidates.append((chosen.copy(), score, metrics))
+            return
+        course = courses[i]
+        opts = options_by_course.get(course, [])
+        if not opts:
+            backtrack(i + 1, chosen)
+            return
+        for sec in opts:
+            if section_conflicts(sec, chosen, buffer_min=buffer_min):
+                continue
+            chosen.append(sec)
+            backtrack(i + 1, chosen)
+            chosen.pop()
+
+    backtrack(0, [])
+    candidates.sort(key=lambda t: t[1], reverse=True)
+    return candidates[: max(1, max_results)]
+
+
+def _time(label: str, fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<28} {best * 1000:9.2f} ms")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--courses", type=int, default=5)
+    parser.add_argument("--sections", type=int, default=12)
+    parser.add_argument("--buffer", type=int, default=10)
+    parser.add_argument("--max-checked", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    options = build_options(args.courses, args.sections)
+    kwargs = {"buffer_min": args.buffer, "max_solutions_checked": args.max_checked}
+    stats = SearchStats()
+    pick_ranked_schedules(options, stats=stats, **kwargs)
+    print(
+        f"{args.courses} courses x {args.sections} sections: nodes={stats.nodes} leaves={stats.leaves} "
+        f"conflict_checks={stats.conflict_checks} pruned={stats.pruned} budget_exhausted={stats.budget_exhausted}"
+    )
+
+    baseline = _time("baseline (no counters)", lambda: _baseline_pick(options, **kwargs), args.repeat)
+    _time("counters, stats=None", lambda: pick_ranked_schedules(options, **kwargs), args.repeat)
+    counted = _time("counters, stats=SearchStats", lambda: pick_ranked_schedules(options, stats=SearchStats(), **kwargs), args.repeat)
+    print(f"overhead with stats: {(counted / baseline - 1) * 100:+.1f}%")
+
+
+if __name__ == "__main__":
+    main()
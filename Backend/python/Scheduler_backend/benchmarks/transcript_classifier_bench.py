@@ -0,0 +1,155 @@
+"""Speed and extraction accuracy of transcript line classification.
+
+Runs the synthetic corpus from `benchmarks.transcript_corpus` through the
+pre-classifier line loop (one regex pass per rule, kept below as the baseline)
+and through `_parse_text_to_courses` with the compiled classifier, both with
+the default rule set everywhere and with each layout's own rule set.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m benchmarks.transcript_classifier_bench [--documents 200] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+
+from app.core.normalize import norm_course_code
+from app.core.transcript_parser import _parse_text_to_courses, _split_rest
+from app.core.transcript_rules import get_classifier
+from benchmarks.transcript_corpus import CorpusDocument, build_corpus
+
+KNOWN_COURSES = {"CECS326", "MATH122", "PHYS151", "ENGL100"}
+
+_BASE_SUMMARY_RE = re.compile(
+    r"\b(?:Term|Course Trans|Transfer Term|Combined|Cum|Transfer Cum|Combined Cum)\s+GPA\b",
+    re.IGNORECASE,
+)
+_BASE_TERM_RE = re.compile(r"\b(Spring|Summer|Fall|Winter)\s+20\d{2}\b", re.IGNORECASE)
+_BASE_COURSE_RE = re.compile(
+    r"^\s*"
+    r"(?P<subject>[A-Z][A-Z/&]{1,7}(?:\s+[A-Z/&]{1,4})?)"
+    r"\s+"
+    r"(?P<number>[A-Z]?\d{1,3}[A-Z]{0,2})"
+    r"(?:\s+[-:]?\s*(?P<rest>.+))?$"
+)
+_BASE_NAME_RE = re.compile(r"\b(?:name|student name)\s*:\s*(.+)$", re.IGNORECASE)
+_BASE_ID_RE = re.compile(r"\b(?:student id|campus id|emplid)\s*:\s*([A-Z0-9-]+)\b", re.IGNORECASE)
+
+
+def _baseline_parse(text: str, known_courses: set[str]) -> tuple[str | None, str | None, list[tuple[str, str | None]]]:
+    # The pre-classifier loop: clean, then summary/term/course regexes and two ad-hoc searches per line.
+    lines = [re.sub(r"\s+", " ", line).strip() for line in text.splitlines()]
+    lines = [line for line in lines if line]
+
+    student_name = student_id = None
+    for line in lines[:40]:
+        if student_name is None and (match := _BASE_NAME_RE.search(line)):
+            student_name = match.group(1).strip(" :")
+        if student_id is None and (match := _BASE_ID_RE.search(line)):
+            student_id = match.group(1).strip()
+
+    current_term = None
+    courses: list[dict] = []
+    unmatched: list[str] = []
+    for line in lines:
+        if _BASE_SUMMARY_RE.search(line):
+            continue
+        term_match = _BASE_TERM_RE.search(line)
+        if term_match:
+            current_term = term_match.group(0).title()
+            continue
+        match = _BASE_COURSE_RE.match(line)
+        if match:
+            subject = re.sub(r"\s+", " ", match.group("subject").upper()).strip()
+            number = match.group("number").upper().strip()
+            title, grade, units = _split_rest(match.group("rest") or "")
+            code = norm_course_code(f"{subject} {number}") or f"{subject} {number}"
+            courses.append({
+                "course_code": code,
+                "subject": subject,
+                "course_number": number,
+                "title": title,
+                "term": current_term,
+                "grade": grade,
+                "units": units,
+                "raw_line": line,
+                "matched_catalog": code in known_courses,
+                "confidence": min(0.55 + (0.15 if title else 0) + (0.1 if code in known_courses else 0), 1.0),
+            })
+            continue
+        if (
+            not _BASE_SUMMARY_RE.search(line)
+            and re.search(r"\b(?:[A-Z]?\d{1,3}[A-Z]?|\d{1,3}[A-Z]?)\b", line)
+            and re.search(r"\b[A-Z]{2,5}\b", line)
+        ):
+            unmatched.append(line)
+    return student_name, student_id, [(course["course_code"], course["term"]) for course in courses]
+
+
+def _classifier_parse(text: str, rule_set: str) -> tuple[str | None, str | None, list[tuple[str, str | None]]]:
+    name, student_id, courses, _, _, _ = _parse_text_to_courses(text, KNOWN_COURSES, get_classifier(rule_set))
+    return name, student_id, [(course["course_code"], course["term"]) for course in courses]
+
+
+def _score(corpus: list[CorpusDocument], results) -> dict[str, float]:
+    true_pos = extracted = expected = students = 0
+    for doc, (name, student_id, courses) in zip(corpus, results):
+        truth = [(norm_course_code(code), term.title()) for code, term in doc.courses]
+        expected += len(truth)
+        extracted += len(courses)
+        remaining = list(truth)
+        for row in courses:
+            if row in remaining:
+                remaining.remove(row)
+                true_pos += 1
+        students += int(name == doc.student_name and student_id == doc.student_id)
+    precision = true_pos / extracted if extracted else 0.0
+    recall = true_pos / expected if expected else 0.0
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "student_info": students / len(corpus),
+    }
+
+
+def _run(label: str, corpus: list[CorpusDocument], parse, repeat: int) -> None:
+    best = float("inf")
+    results = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        results = [parse(doc) for doc in corpus]
+        best = min(best, time.perf_counter() - started)
+    lines = sum(doc.text.count("\n") + 1 for doc in corpus)
+    score = _score(corpus, results)
+    print(
+        f"{label:<34} {best * 1000:8.1f} ms  {lines / best / 1000:7.0f}k lines/s  "
+        f"P={score['precision']:.3f} R={score['recall']:.3f} F1={score['f1']:.3f} student={score['student_info']:.3f}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.documents, seed=args.seed)
+    quarter = sum(1 for doc in corpus if doc.layout == "quarter")
+    print(f"{len(corpus)} documents ({quarter} quarter-system), {sum(len(doc.courses) for doc in corpus)} course rows")
+
+    _run("baseline (regex per rule)", corpus, lambda doc: _baseline_parse(doc.text, KNOWN_COURSES), args.repeat)
+    _run("classifier, default rules", corpus, lambda doc: _classifier_parse(doc.text, "default"), args.repeat)
+    _run(
+        "classifier, per-layout rules",
+        corpus,
+        lambda doc: _classifier_parse(doc.text, "quarter" if doc.layout == "quarter" else "default"),
+        args.repeat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""End-to-end load testing against local stand-ins for Supabase and RateMyProfessors (run with `python -m loadtest.run`)."""
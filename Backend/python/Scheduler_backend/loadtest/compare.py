@@ -0,0 +1,73 @@
+"""Compare two `loadtest.run` reports, e.g. the same load before and after a commit.
+
+Prints throughput and p50/p95/p99 per scenario with the relative change, and
+warns when the two runs used different load settings (a changed seed, scale,
+mix or concurrency makes the numbers incomparable). Differences within about
+10% are usually noise on a shared machine; rerun both sides before trusting them.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m loadtest.compare .cache/loadtest/<before>.json .cache/loadtest/<after>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Settings that must match for two runs to be comparable.
+COMPARABLE_KEYS = ["scale", "seed", "concurrency", "duration_s", "mix", "distinct", "app_workers", "postgrest_latency_ms", "rmp_latency_ms", "env"]
+METRICS = [("throughput_rps", "rps"), ("p50_ms", "p50"), ("p95_ms", "p95"), ("p99_ms", "p99")]
+
+
+def _load(path: str) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def _change(before: Optional[float], after: Optional[float]) -> str:
+    if before in (None, 0) or after is None:
+        return "   n/a"
+    return f"{(after - before) / before * 100:+6.1f}%"
+
+
+def _describe(report: Dict[str, Any]) -> str:
+    revision = report["revision"]
+    label = f" [{report['label']}]" if report.get("label") else ""
+    return f"{revision['commit'][:10]}{' (dirty)' if revision['dirty'] else ''}{label}  {revision.get('subject', '')}"
+
+
+def compare(before: Dict[str, Any], after: Dict[str, Any]) -> None:
+    print(f"before: {_describe(before)}")
+    print(f"after:  {_describe(after)}")
+    for key in COMPARABLE_KEYS:
+        if before["config"].get(key) != after["config"].get(key):
+            print(f"warning: {key} differs ({before['config'].get(key)} vs {after['config'].get(key)})")
+    if before.get("environment") != after.get("environment"):
+        print("warning: runs come from different machines or Python versions")
+
+    print(f"\n{'scenario':<12} {'metric':<6} {'before':>10} {'after':>10} {'change':>8}")
+    scenarios = sorted(set(before["results"]["scenarios"]) | set(after["results"]["scenarios"])) + ["total"]
+    for name in scenarios:
+        left = before["results"]["total"] if name == "total" else before["results"]["scenarios"].get(name, {})
+        right = after["results"]["total"] if name == "total" else after["results"]["scenarios"].get(name, {})
+        for key, label in METRICS:
+            old, new = left.get(key), right.get(key)
+            print(
+                f"{name:<12} {label:<6} {old if old is not None else '-':>10} {new if new is not None else '-':>10} {_change(old, new):>8}"
+            )
+        errors_before, errors_after = left.get("errors", 0), right.get("errors", 0)
+        if errors_before or errors_after:
+            print(f"{name:<12} {'errors':<6} {errors_before:>10} {errors_after:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+    compare(_load(args.before), _load(args.after))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Local stand-in for Supabase's PostgREST endpoint.
+
+Serves `GET /rest/v1/<table>` from in-memory rows with the subset of
+PostgREST the backend's loaders use: `select=` column lists, `offset`/`limit`
+paging (or a `Range: 0-999` header), `col=eq.value` filters and
+`Prefer: count=exact`. Tables come from a seed file written by
+`loadtest.seed`, or are generated on start.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m loadtest.fake_postgrest [--port 54321] [--seed-file .cache/loadtest/seed.json] [--latency-ms 0]
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_ROLE_KEY=loadtest.loadtest.loadtest uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from loadtest.seed import SCALES, build_scaled_dataset, load_dataset
+
+# supabase-py only checks that the key looks like a JWT; the fake server accepts any key.
+FAKE_SERVICE_KEY = "loadtest.loadtest.loadtest"
+REST_PREFIX = "/rest/v1/"
+
+
+class FakePostgRESTState:
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]], latency_ms: float = 0.0) -> None:
+        self.tables = tables
+        self.latency_ms = latency_ms
+        self.lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+        self.rows_served = 0
+
+    def count(self, table: str, rows: int) -> None:
+        with self.lock:
+            self.requests[table] = self.requests.get(table, 0) + 1
+            self.rows_served += rows
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                "tables": {name: len(rows) for name, rows in self.tables.items()},
+                "requests": dict(self.requests),
+                "rows_served": self.rows_served,
+            }
+
+
+def _parse_range(header: Optional[str]) -> Optional[Tuple[int, Optional[int]]]:
+    if not header:
+        return None
+    start, _, end = header.replace("items=", "").partition("-")
+    try:
+        return int(start), (int(end) if end.strip() else None)
+    except ValueError:
+        return None
+
+
+def query_rows(rows: List[Dict[str, Any]], params: List[Tuple[str, str]], range_header: Optional[str]) -> Tuple[List[Dict[str, Any]], int, int]:
+    """Apply filters, paging and column selection; returns (page, offset, total matching rows)."""
+    select: Optional[List[str]] = None
+    offset = 0
+    limit: Optional[int] = None
+    filters: List[Tuple[str, str]] = []
+    for key, value in params:
+        if key == "select":
+            select = None if value.strip() == "*" else [column.strip() for column in value.split(",") if column.strip()]
+        elif key == "offset":
+            offset = int(value)
+        elif key == "limit":
+            limit = int(value)
+        elif key == "order":
+            continue
+        elif value.startswith("eq."):
+            filters.append((key, value[3:]))
+        else:
+            raise ValueError(f"unsupported filter {key}={value}")
+
+    if "offset" not in dict(params) and "limit" not in dict(params):
+        requested = _parse_range(range_header)
+        if requested is not None:
+            offset, end = requested
+            limit = None if end is None else end - offset + 1
+
+    matching = [row for row in rows if all(str(row.get(column)) == expected for column, expected in filters)]
+    page = matching[offset:] if limit is None else matching[offset:offset + limit]
+    if select is not None:
+        page = [{column: row.get(column) for column in select} for row in page]
+    return page, offset, len(matching)
+
+
+def make_handler(state: FakePostgRESTState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            return
+
+        def _send_json(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            # postgrest-py sends a JSON body even on GET; drain it so the keep-alive connection stays in sync.
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            url = urlsplit(self.path)
+            if url.path.rstrip("/") == "/stats":
+                self._send_json(200, state.stats())
+                return
+            if not url.path.startswith(REST_PREFIX):
+                self._send_json(404, {"message": "not found"})
+                return
+            table = url.path[len(REST_PREFIX):].strip("/")
+            rows = state.tables.get(table)
+            if rows is None:
+                self._send_json(404, {"code": "42P01", "message": f'relation "public.{table}" does not exist'})
+                return
+            try:
+                page, offset, total = query_rows(rows, parse_qsl(url.query, keep_blank_values=True), self.headers.get("Range"))
+            except ValueError as exc:
+                self._send_json(400, {"code": "PGRST100", "message": str(exc)})
+                return
+            if state.latency_ms:
+                time.sleep(state.latency_ms / 1000)
+            state.count(table, len(page))
+            last = offset + len(page) - 1
+            total_text = str(total) if "count=exact" in (self.headers.get("Prefer") or "") else "*"
+            content_range = f"{offset}-{last}/{total_text}" if page else f"*/{total_text}"
+            self._send_json(200, page, {"Content-Range": content_range})
+
+    return Handler
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 54321,
+    tables: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+    latency_ms: float = 0.0,
+) -> ThreadingHTTPServer:
+    """Start the server on a daemon thread and return it (call .shutdown() to stop)."""
+    state = FakePostgRESTState(tables if tables is not None else build_scaled_dataset("small").tables, latency_ms)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-postgrest", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--seed-file", help="serve the tables from this loadtest.seed output")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="generate tables at this scale instead")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="artificial delay per request")
+    args = parser.parse_args()
+
+    dataset = load_dataset(args.seed_file) if args.seed_file else build_scaled_dataset(args.scale, seed=args.seed)
+    server = serve(args.host, args.port, dataset.tables, args.latency_ms)
+    sizes = ", ".join(f"{table}={len(rows)}" for table, rows in dataset.tables.items())
+    print(f"Fake PostgREST on http://{args.host}:{server.server_address[1]} ({sizes})")
+    print(f"SUPABASE_URL=http://{args.host}:{server.server_address[1]} SUPABASE_SERVICE_ROLE_KEY={FAKE_SERVICE_KEY}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
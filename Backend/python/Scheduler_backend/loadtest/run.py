@@ -0,0 +1,418 @@
+"""Concurrent load test of /term/schedule, /schedule/generate and /transcript/parse.
+
+By default this starts the whole stack locally: the fake PostgREST server
+seeded by `loadtest.seed`, the fake RMP server, and the app under uvicorn
+pointed at both. It then drives a closed-loop load (each of `--concurrency`
+workers sends its next request as soon as the last one returns) with a
+weighted mix of the three endpoints. After a warm-up it measures for
+`--duration` seconds and writes a JSON report keyed by the git commit, so
+runs from different commits can be compared with `loadtest.compare`.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m loadtest.run [--scale small] [--concurrency 8] [--duration 30] [--mix term=6,generate=3,transcript=1]
+    python -m loadtest.run --env TERM_SCHEDULE_CACHE_TTL_SECONDS=0 --label no-cache
+    python -m loadtest.run --url http://127.0.0.1:8000   # an already running app serving the same seed
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from loadtest import fake_postgrest
+from loadtest.seed import SCALES, Dataset, build_scaled_dataset, load_dataset, transcript_pdf
+from tools import fake_rmp_server
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+RANKING_PREFERENCES = ["compact", "fewest_days", "latest_start", "earliest_end", "highest_rated"]
+REPORT_FORMAT = 1
+
+
+# One request the workers can send: scenario name plus a callable that performs it on a session.
+@dataclass
+class RequestSpec:
+    scenario: str
+    send: Callable[[requests.Session, str], requests.Response]
+
+
+# Latencies and status codes collected by one worker.
+@dataclass
+class WorkerResult:
+    latencies_ms: Dict[str, List[float]] = field(default_factory=dict)
+    statuses: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def record(self, scenario: str, elapsed_ms: float, status: str) -> None:
+        self.latencies_ms.setdefault(scenario, []).append(elapsed_ms)
+        counts = self.statuses.setdefault(scenario, {})
+        counts[status] = counts.get(status, 0) + 1
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip():
+            mix[name.strip()] = float(weight or 1)
+    unknown = set(mix) - {"term", "generate", "transcript"}
+    if unknown:
+        raise SystemExit(f"Unknown scenarios in --mix: {', '.join(sorted(unknown))}")
+    return {name: weight for name, weight in mix.items() if weight > 0}
+
+
+def build_requests(dataset: Dataset, distinct: int, seed: int) -> Dict[str, List[RequestSpec]]:
+    """`distinct` different payloads per scenario; repeats across workers exercise the caches like real traffic."""
+    rng = random.Random(seed)
+    upper = [code for code in dataset.courses if dataset.prereqs.get(code)] or dataset.courses
+    out: Dict[str, List[RequestSpec]] = {"term": [], "generate": [], "transcript": []}
+
+    for _ in range(distinct):
+        requested = rng.sample(dataset.courses, k=min(len(dataset.courses), rng.randint(3, 5)))
+        completed = sorted({code for course in requested for code in dataset.prereq_closure(course)})
+        constraints: Dict[str, Any] = {
+            "buffer_minutes": rng.choice([0, 10, 15]),
+            "ranking_preference": rng.choice(RANKING_PREFERENCES),
+            "max_schedules": rng.choice([3, 5]),
+        }
+        if rng.random() < 0.3:
+            constraints["days_off"] = ["F"]
+        if rng.random() < 0.2:
+            constraints["min_instructor_ratings"] = 2.5
+        term_body = {"term": "Spring 2026", "requested_courses": requested, "completed_courses": completed, "constraints": constraints}
+        out["term"].append(RequestSpec("term", lambda session, url, body=term_body: session.post(f"{url}/term/schedule", json=body, timeout=60)))
+
+        targets = rng.sample(upper, k=min(len(upper), rng.randint(2, 4)))
+        generate_body = {"targets": targets, "completed": rng.sample(dataset.courses, k=min(len(dataset.courses), rng.randint(0, 6)))}
+        out["generate"].append(
+            RequestSpec("generate", lambda session, url, body=generate_body: session.post(f"{url}/schedule/generate", json=body, timeout=60))
+        )
+
+    for index in range(min(distinct, 20)):
+        pdf = transcript_pdf(dataset, index)
+        out["transcript"].append(
+            RequestSpec(
+                "transcript",
+                lambda session, url, pdf=pdf, index=index: session.post(
+                    f"{url}/transcript/parse", files={"file": (f"transcript-{index}.pdf", pdf, "application/pdf")}, timeout=180
+                ),
+            )
+        )
+    return out
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=10).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def git_revision() -> Dict[str, Any]:
+    commit = _git("rev-parse", "HEAD") or "unknown"
+    return {
+        "commit": commit,
+        "subject": _git("log", "-1", "--format=%s"),
+        "dirty": bool(_git("status", "--porcelain", "--", ".")),
+    }
+
+
+def wait_ready(url: str, process: Optional[subprocess.Popen], timeout_s: float = 90.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"The app exited with code {process.returncode} before becoming ready.")
+        try:
+            if requests.get(f"{url}/health/ready", timeout=2).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise SystemExit(f"{url} did not become ready within {timeout_s:.0f}s.")
+
+
+class LocalStack:
+    """Fake PostgREST + fake RMP on free ports, and the app under uvicorn configured to use them."""
+
+    def __init__(self, dataset: Dataset, *, app_workers: int, postgrest_latency_ms: float, rmp_latency_ms: float, env: Dict[str, str]) -> None:
+        self.workdir = tempfile.TemporaryDirectory(prefix="scheduler-loadtest-")
+        self.postgrest = fake_postgrest.serve(port=0, tables=dataset.tables, latency_ms=postgrest_latency_ms)
+        teachers = fake_rmp_server.synthetic_teachers(max(50, dataset.scale["departments"] * 20), seed=dataset.seed)
+        self.rmp = fake_rmp_server.serve(port=0, teachers=teachers, latency_ms=rmp_latency_ms)
+        self.postgrest_url = f"http://127.0.0.1:{self.postgrest.server_address[1]}"
+        port = _free_port()
+        self.url = f"http://127.0.0.1:{port}"
+
+        cache_dir = Path(self.workdir.name)
+        app_env = {
+            **os.environ,
+            "SUPABASE_URL": self.postgrest_url,
+            "SUPABASE_SERVICE_ROLE_KEY": fake_postgrest.FAKE_SERVICE_KEY,
+            "DEPS_LOCAL_CSV_OVERLAY": "0",
+            "RMP_GRAPHQL_URL": f"http://127.0.0.1:{self.rmp.server_address[1]}/graphql",
+            "RMP_CACHE_PATH": str(cache_dir / "ratings.sqlite3"),
+            "RMP_DIRECTORY_PATH": str(cache_dir / "instructor_directory.json"),
+            "TRANSCRIPT_CACHE_PATH": str(cache_dir / "transcripts.sqlite3"),
+            "DEPS_CACHE_DIR": str(cache_dir),
+            "PROFILE_DIR": str(cache_dir / "profiles"),
+            "OPENAI_API_KEY": "",   # heuristic explanations; the harness never calls a paid API
+            **env,
+        }
+        self.log = (cache_dir / "app.log").open("w")
+        self.process = subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "app.main:app",
+                "--host", "127.0.0.1", "--port", str(port),
+                "--workers", str(app_workers), "--log-level", "warning",
+            ],
+            cwd=BACKEND_DIR,
+            env=app_env,
+            stdout=self.log,
+            stderr=subprocess.STDOUT,
+        )
+
+    def app_log_tail(self, lines: int = 20) -> str:
+        self.log.flush()
+        text = (Path(self.workdir.name) / "app.log").read_text(errors="replace")
+        return "\n".join(text.splitlines()[-lines:])
+
+    def postgrest_stats(self) -> Dict[str, Any]:
+        return requests.get(f"{self.postgrest_url}/stats", timeout=5).json()
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.postgrest.shutdown()
+        self.rmp.shutdown()
+        self.log.close()
+        self.workdir.cleanup()
+
+
+def run_load(
+    url: str,
+    specs: Dict[str, List[RequestSpec]],
+    mix: Dict[str, float],
+    *,
+    concurrency: int,
+    duration_s: float,
+    warmup_s: float,
+    seed: int,
+) -> Tuple[List[WorkerResult], float]:
+    scenarios = sorted(mix)
+    weights = [mix[name] for name in scenarios]
+    measure_from = time.monotonic() + warmup_s
+    stop_at = measure_from + duration_s
+    results = [WorkerResult() for _ in range(concurrency)]
+
+    def _worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        session = requests.Session()
+        result = results[index]
+        while True:
+            now = time.monotonic()
+            if now >= stop_at:
+                break
+            spec = rng.choice(specs[rng.choices(scenarios, weights)[0]])
+            started = time.perf_counter()
+            try:
+                status = str(spec.send(session, url).status_code)
+            except requests.RequestException as exc:
+                status = type(exc).__name__
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if now >= measure_from:
+                result.record(spec.scenario, elapsed_ms, status)
+        session.close()
+
+    threads = [threading.Thread(target=_worker, args=(index,), name=f"load-{index}") for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    measured_s = max(0.001, time.monotonic() - measure_from)
+    return results, measured_s
+
+
+def percentile(ordered: List[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = max(1, int(round(p / 100 * len(ordered) + 0.5 - 1e-9)))
+    return round(ordered[min(rank, len(ordered)) - 1], 2)
+
+
+def summarize(results: List[WorkerResult], measured_s: float) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = {}
+    statuses: Dict[str, Dict[str, int]] = {}
+    for result in results:
+        for scenario, values in result.latencies_ms.items():
+            latencies.setdefault(scenario, []).extend(values)
+        for scenario, counts in result.statuses.items():
+            merged = statuses.setdefault(scenario, {})
+            for status, count in counts.items():
+                merged[status] = merged.get(status, 0) + count
+
+    def _block(values: List[float], counts: Dict[str, int]) -> Dict[str, Any]:
+        ordered = sorted(values)
+        ok = sum(count for status, count in counts.items() if status.startswith("2"))
+        return {
+            "requests": len(ordered),
+            "ok": ok,
+            "errors": len(ordered) - ok,
+            "status": dict(sorted(counts.items())),
+            "throughput_rps": round(len(ordered) / measured_s, 2),
+            "mean_ms": round(sum(ordered) / len(ordered), 2) if ordered else None,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "max_ms": round(ordered[-1], 2) if ordered else None,
+        }
+
+    scenarios = {name: _block(latencies[name], statuses.get(name, {})) for name in sorted(latencies)}
+    all_counts: Dict[str, int] = {}
+    for counts in statuses.values():
+        for status, count in counts.items():
+            all_counts[status] = all_counts.get(status, 0) + count
+    return {
+        "measured_s": round(measured_s, 2),
+        "scenarios": scenarios,
+        "total": _block([value for values in latencies.values() for value in values], all_counts),
+    }
+
+
+def _server_stats(url: str) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for name, path in (("term_schedule", "/term/schedule/stats"), ("schedule_generate", "/schedule/generate/stats"), ("transcripts", "/transcript/parse/stats")):
+        try:
+            out[name] = requests.get(f"{url}{path}", timeout=5).json()
+        except (requests.RequestException, ValueError):
+            out[name] = None
+    return out
+
+
+def print_summary(report: Dict[str, Any]) -> None:
+    revision = report["revision"]
+    print(f"\ncommit {revision['commit'][:10]}{' (dirty)' if revision['dirty'] else ''}  {revision['subject']}")
+    print(f"{'scenario':<12} {'reqs':>7} {'err':>5} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    rows = list(report["results"]["scenarios"].items()) + [("total", report["results"]["total"])]
+    for name, block in rows:
+        def _fmt(value: Optional[float]) -> str:
+            return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+        print(
+            f"{name:<12} {block['requests']:>7} {block['errors']:>5} {block['throughput_rps']:>8.1f} "
+            f"{_fmt(block['p50_ms'])} {_fmt(block['p95_ms'])} {_fmt(block['p99_ms'])} {_fmt(block['max_ms'])}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--seed-file", help="use this loadtest.seed output instead of generating one")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds, after the warm-up")
+    parser.add_argument("--warmup", type=float, default=5.0)
+    parser.add_argument("--mix", default="term=6,generate=3,transcript=1", help="scenario weights")
+    parser.add_argument("--distinct", type=int, default=50, help="distinct payloads per scenario")
+    parser.add_argument("--url", help="load an already running app instead of starting the local stack")
+    parser.add_argument("--app-workers", type=int, default=1, help="uvicorn worker processes for the local app")
+    parser.add_argument("--postgrest-latency-ms", type=float, default=0.0)
+    parser.add_argument("--rmp-latency-ms", type=float, default=0.0)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="extra environment for the local app")
+    parser.add_argument("--label", default="", help="free-form tag stored in the report and file name")
+    parser.add_argument("--out", default=".cache/loadtest", help="directory for JSON reports")
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    dataset = load_dataset(args.seed_file) if args.seed_file else build_scaled_dataset(args.scale, seed=args.seed)
+    specs = build_requests(dataset, args.distinct, args.seed)
+    extra_env = dict(item.split("=", 1) for item in args.env if "=" in item)
+
+    stack: Optional[LocalStack] = None
+    url = args.url.rstrip("/") if args.url else ""
+    try:
+        if not url:
+            stack = LocalStack(
+                dataset,
+                app_workers=args.app_workers,
+                postgrest_latency_ms=args.postgrest_latency_ms,
+                rmp_latency_ms=args.rmp_latency_ms,
+                env=extra_env,
+            )
+            url = stack.url
+            try:
+                wait_ready(url, stack.process)
+            except SystemExit:
+                print(stack.app_log_tail(), file=sys.stderr)
+                raise
+        else:
+            wait_ready(url, None)
+
+        print(
+            f"Loading {url}: {args.concurrency} workers, {args.warmup:g}s warm-up + {args.duration:g}s, mix {mix}, "
+            f"{len(dataset.courses)} courses / {len(dataset.tables.get('spring_2026', []))} section rows"
+        )
+        results, measured_s = run_load(
+            url, specs, mix, concurrency=args.concurrency, duration_s=args.duration, warmup_s=args.warmup, seed=args.seed
+        )
+        report = {
+            "format": REPORT_FORMAT,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "label": args.label,
+            "revision": git_revision(),
+            "config": {
+                "scale": dataset.scale,
+                "seed": dataset.seed,
+                "concurrency": args.concurrency,
+                "duration_s": args.duration,
+                "warmup_s": args.warmup,
+                "mix": mix,
+                "distinct": args.distinct,
+                "app_workers": args.app_workers if stack else None,
+                "external_url": bool(args.url),
+                "postgrest_latency_ms": args.postgrest_latency_ms,
+                "rmp_latency_ms": args.rmp_latency_ms,
+                "env": extra_env,
+            },
+            "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+            "results": summarize(results, measured_s),
+            "server": _server_stats(url),
+        }
+        if stack is not None:
+            report["server"]["postgrest"] = stack.postgrest_stats()
+    finally:
+        if stack is not None:
+            stack.close()
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    revision = report["revision"]
+    name = f"{revision['commit'][:10]}{'-dirty' if revision['dirty'] else ''}{'-' + args.label if args.label else ''}-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    (out_dir / name).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print_summary(report)
+    print(f"\nReport: {out_dir / name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Synthetic catalog, dependency and section tables for the fake PostgREST server.
+
+Tables use the backend's default names and columns (`spring_courses`,
+`course_dependencies` in edges_split shape, `spring_2026`), so the app needs
+no column overrides. Instructors are drawn from the fake RMP roster, so rating
+lookups resolve. Generation is seeded; the same scale and seed always give the
+same rows.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m loadtest.seed [--scale small|medium|large] [--seed 7] [--out .cache/loadtest/seed.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import zlib
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from tools.fake_rmp_server import synthetic_teachers
+
+DEPARTMENTS = [
+    "CECS", "MATH", "PHYS", "ENGL", "HIST", "CHEM", "BIOL", "ECON", "ART", "PSY", "COMM", "KIN",
+    "E E", "C E", "M E", "ACCT", "FIN", "MKTG", "SOC", "POSC", "GEOG", "MUS", "THEA", "DANC",
+    "NRSG", "HHS", "JOUR", "LING", "PHIL", "REL", "ANTH", "GEOL", "ASTR", "STAT", "ITAL", "SPAN",
+    "FREN", "GERM", "JAPN", "CHIN",
+]
+TITLE_WORDS = [
+    "Introduction to", "Principles of", "Topics in", "Advanced", "Applied", "Foundations of",
+    "Seminar in", "Methods in", "Theory of", "Survey of",
+]
+TITLE_SUBJECTS = [
+    "Programming", "Calculus", "Mechanics", "Composition", "World History", "Chemistry", "Cell Biology",
+    "Microeconomics", "Design", "Cognition", "Rhetoric", "Kinesiology", "Circuits", "Statics",
+    "Data Structures", "Algorithms", "Linear Algebra", "Statistics", "Ethics", "Networks",
+]
+# Meeting day patterns and their lecture length in minutes.
+DAY_PATTERNS = {"MW": 75, "TuTh": 75, "MWF": 50, "TTh": 75, "F": 150, "W": 150}
+LECTURE_SLOTS = [(8, 0), (9, 30), (11, 0), (12, 30), (14, 0), (15, 30), (17, 0), (18, 30)]
+BUILDINGS = ["ECS", "VEC", "LA5", "PH1", "HSCI", "USU", "LAB", "AS"]
+
+# Preset scales: departments x courses per department x sections per course.
+SCALES = {
+    "small": (8, 15, 4),
+    "medium": (20, 30, 6),
+    "large": (40, 60, 10),
+}
+
+
+# One seeded dataset: the PostgREST tables plus derived facts the load generator needs.
+@dataclass
+class Dataset:
+    seed: int
+    scale: Dict[str, int]
+    tables: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    courses: List[str] = field(default_factory=list)
+    prereqs: Dict[str, List[str]] = field(default_factory=dict)
+
+    def prereq_closure(self, course: str) -> Set[str]:
+        seen: Set[str] = set()
+        stack = list(self.prereqs.get(course, []))
+        while stack:
+            code = stack.pop()
+            if code not in seen:
+                seen.add(code)
+                stack.extend(self.prereqs.get(code, []))
+        return seen
+
+
+def _clock(hour: int, minute: int) -> str:
+    suffix = "AM" if hour < 12 else "PM"
+    display = hour if 1 <= hour <= 12 else (hour - 12 if hour > 12 else 12)
+    return f"{display}:{minute:02d}{suffix}"
+
+
+def _time_range(start_hour: int, start_minute: int, length_min: int) -> str:
+    end = start_hour * 60 + start_minute + length_min
+    return f"{_clock(start_hour, start_minute)}-{_clock(end // 60, end % 60)}"
+
+
+def build_dataset(
+    departments: int,
+    courses_per_department: int,
+    sections_per_course: int,
+    *,
+    seed: int = 7,
+    lab_share: float = 0.2,
+    prereq_share: float = 0.6,
+) -> Dataset:
+    rng = random.Random(seed)
+    teachers = synthetic_teachers(max(50, departments * 20), seed=seed)
+    instructor_names = [f"{teacher['firstName']} {teacher['lastName']}" for teacher in teachers]
+
+    dataset = Dataset(
+        seed=seed,
+        scale={"departments": departments, "courses_per_department": courses_per_department, "sections_per_course": sections_per_course},
+    )
+    catalog: List[Dict[str, Any]] = []
+    deps: List[Dict[str, Any]] = []
+    sections: List[Dict[str, Any]] = []
+
+    for dept in DEPARTMENTS[:departments]:
+        numbers = sorted(rng.sample(range(100, 500), courses_per_department))
+        dept_courses: List[str] = []
+        for number in numbers:
+            code = f"{dept} {number}"
+            units = rng.choice([1, 3, 3, 3, 4])
+            catalog.append({
+                "course_code_full": code,
+                "course_title": f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_SUBJECTS)}",
+                "units": str(units),
+            })
+            # Upper-division courses depend on one or two lower-numbered courses in the same department.
+            prereqs: List[str] = []
+            if dept_courses and number >= 200 and rng.random() < prereq_share:
+                prereqs = rng.sample(dept_courses[-6:], k=min(len(dept_courses[-6:]), rng.choice([1, 1, 2])))
+            deps.append({"course_code": code, "prereq_code": "|".join(prereqs) or None, "coreq_code": None})
+            dataset.prereqs[code] = prereqs
+            dept_courses.append(code)
+            dataset.courses.append(code)
+
+            has_lab = rng.random() < lab_share
+            for index in range(sections_per_course):
+                section_id = f"{index + 1:02d}"
+                days = rng.choice(sorted(DAY_PATTERNS))
+                hour, minute = rng.choice(LECTURE_SLOTS)
+                length = DAY_PATTERNS[days]
+                instructor = rng.choice(instructor_names)
+                sections.append({
+                    "course_code_full": code,
+                    "sec": section_id,
+                    "type": "LEC",
+                    "days": days,
+                    "time": _time_range(hour, minute, length),
+                    "location": f"{rng.choice(BUILDINGS)}-{rng.randint(100, 499)}",
+                    "instructor": instructor,
+                    "comment": None,
+                })
+                if has_lab:
+                    lab_hour, lab_minute = rng.choice(LECTURE_SLOTS)
+                    sections.append({
+                        "course_code_full": code,
+                        "sec": section_id,
+                        "type": "LAB",
+                        "days": rng.choice(["M", "Tu", "W", "Th", "F"]),
+                        "time": _time_range(lab_hour, lab_minute, 110),
+                        "location": f"LAB-{rng.randint(100, 199)}",
+                        "instructor": instructor,
+                        "comment": "Lab",
+                    })
+            # A few TBA rows, which the loader skips, as in the real table.
+            if rng.random() < 0.05:
+                sections.append({
+                    "course_code_full": code, "sec": "99", "type": "LEC", "days": "TBA", "time": "TBA",
+                    "location": "ONLINE", "instructor": "Staff", "comment": "Asynchronous",
+                })
+
+    dataset.tables = {"spring_courses": catalog, "course_dependencies": deps, "spring_2026": sections}
+    return dataset
+
+
+def build_scaled_dataset(scale: str = "small", *, seed: int = 7, **overrides: Optional[int]) -> Dataset:
+    departments, courses, sections = SCALES[scale]
+    return build_dataset(
+        overrides.get("departments") or departments,
+        overrides.get("courses_per_department") or courses,
+        overrides.get("sections_per_course") or sections,
+        seed=seed,
+    )
+
+
+def save_dataset(dataset: Dataset, path: str) -> None:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(json.dumps(asdict(dataset)), encoding="utf-8")
+
+
+def load_dataset(path: str) -> Dataset:
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    return Dataset(**raw)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def text_pdf(lines: List[str], lines_per_page: int = 55) -> bytes:
+    """A minimal text-layer PDF (Helvetica, one text block per page) that pypdf can extract."""
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects: List[bytes] = [b"", b""]   # 1: catalog, 2: page tree, filled in below
+    font_id = 3
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    page_ids: List[int] = []
+    for page_lines in pages:
+        body = "BT /F1 10 Tf 12 TL 50 760 Td " + " ".join(f"({_pdf_escape(line)}) '" for line in page_lines) + " ET"
+        stream = body.encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (" ".join(f"{pid} 0 R" for pid in page_ids).encode(), len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def transcript_pdf(dataset: Dataset, index: int, terms: int = 6, rows_per_term: int = 5) -> bytes:
+    """Transcript number `index` for this dataset: a student who took seeded catalog courses."""
+    rng = random.Random(zlib.crc32(f"{dataset.seed}:{index}".encode()))
+    lines = [
+        "CALIFORNIA STATE UNIVERSITY LONG BEACH",
+        "Unofficial Transcript - Not Valid for Transfer",
+        f"Name: Student {index}",
+        f"Student ID: {rng.randint(0, 999999999):09d}",
+        "Course Description Attempted Earned Grade Points",
+    ]
+    for term_index in range(terms):
+        lines.append(f"{['Fall', 'Spring'][term_index % 2]} {2021 + term_index // 2}")
+        for code in rng.sample(dataset.courses, k=min(rows_per_term, len(dataset.courses))):
+            lines.append(f"{code} {rng.choice(TITLE_SUBJECTS)} {rng.choice(['A', 'B+', 'B', 'C', 'CR'])} 3.0")
+        lines.append(f"Term GPA {rng.uniform(2, 4):.2f} Totals 15.0")
+    lines.append("End of Unofficial Transcript")
+    return text_pdf(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--departments", type=int)
+    parser.add_argument("--courses-per-department", type=int)
+    parser.add_argument("--sections-per-course", type=int)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=".cache/loadtest/seed.json")
+    args = parser.parse_args()
+
+    dataset = build_scaled_dataset(
+        args.scale,
+        seed=args.seed,
+        departments=args.departments,
+        courses_per_department=args.courses_per_department,
+        sections_per_course=args.sections_per_course,
+    )
+    save_dataset(dataset, args.out)
+    sizes = ", ".join(f"{table}={len(rows)}" for table, rows in dataset.tables.items())
+    print(f"Wrote {args.out}: {sizes}")
+
+
+if __name__ == "__main__":
+    main()
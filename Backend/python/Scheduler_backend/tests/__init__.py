@@ -0,0 +1 @@
+"""Unit tests for the scheduler backend (run with `python -m pytest` from this folder)."""
@@ -0,0 +1,131 @@
+"""Shared fixtures: fake PostgREST query builders and isolated cache paths."""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+
+# Records the calls a loader makes on a supabase-py query builder and serves rows from memory.
+class FakeQuery:
+    def __init__(self, table: "FakeTable") -> None:
+        self.table = table
+        self.calls: List[tuple] = []
+
+    def select(self, columns: str) -> "FakeQuery":
+        self.calls.append(("select", columns))
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeQuery":
+        self.calls.append(("eq", column, value))
+        return self
+
+    def order(self, column: str, **kwargs: Any) -> "FakeQuery":
+        self.calls.append(("order", column))
+        return self
+
+    def range(self, start: int, end: int) -> "FakeQuery":
+        self.calls.append(("range", start, end))
+        return self
+
+    def execute(self) -> Any:
+        self.table.queries.append(self.calls)
+        rows = self.table.rows
+        for call in self.calls:
+            if call[0] == "eq":
+                rows = [row for row in rows if str(row.get(call[1])) == str(call[2])]
+        ordered = any(call[0] == "order" for call in self.calls)
+        if ordered:
+            keys = [call[1] for call in self.calls if call[0] == "order"]
+            rows = sorted(rows, key=lambda row: tuple(str(row.get(key)) for key in keys))
+        elif self.table.shuffle_unordered:
+            # Postgres gives no order guarantee without ORDER BY; rotate per page to show it.
+            shift = len(self.table.queries) % max(1, len(rows))
+            rows = rows[shift:] + rows[:shift]
+        start, end = next(((call[1], call[2]) for call in self.calls if call[0] == "range"), (0, len(rows) - 1))
+        return type("Response", (), {"data": rows[start:end + 1]})()
+
+
+class FakeTable:
+    def __init__(self, rows: List[Dict[str, Any]], shuffle_unordered: bool = True) -> None:
+        self.rows = rows
+        self.shuffle_unordered = shuffle_unordered
+        self.queries: List[List[tuple]] = []
+
+
+class FakeSupabase:
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.tables = {name: FakeTable(rows) for name, rows in tables.items()}
+
+    def table(self, name: str) -> FakeQuery:
+        return FakeQuery(self.tables[name])
+
+
+@pytest.fixture
+def fake_supabase():
+    def _make(tables: Optional[Dict[str, List[Dict[str, Any]]]] = None) -> FakeSupabase:
+        return FakeSupabase(tables or {})
+
+    return _make
+
+
+@pytest.fixture(autouse=True)
+def _isolated_caches(tmp_path, monkeypatch):
+    # Keep every on-disk cache out of the developer's .cache/ directory.
+    monkeypatch.setenv("DEPS_CACHE_DIR", str(tmp_path / "deps"))
+    monkeypatch.setenv("RMP_CACHE_PATH", str(tmp_path / "ratings.sqlite3"))
+    monkeypatch.setenv("TRANSCRIPT_CACHE_PATH", str(tmp_path / "transcripts.sqlite3"))
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "profiles"))
+
+
+def make_sections(courses, per_course: int = 4):
+    """Deterministic non-trivial section options: alternating MW/TuTh slots across the day."""
+    from app.core.section_models import MeetingBlock, SectionOption
+
+    out = {}
+    for course_index, course in enumerate(sorted(set(courses))):
+        options = []
+        for k in range(per_course):
+            start = 480 + ((course_index * 2 + k) % 10) * 60
+            days = {0, 2} if k % 2 == 0 else {1, 3}
+            instructor = f"Prof{k} Example"
+            options.append(SectionOption(
+                course=course,
+                section_id=f"{k + 1:02d}",
+                meetings=[MeetingBlock(days=days, start_min=start, end_min=start + 75, instructor=instructor)],
+                instructor=instructor,
+            ))
+        out[course] = options
+    return out
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """
+    TestClient over the real app with a small in-memory model and fake sections.
+
+    Startup hooks are not run, so no Supabase load or watcher threads start.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.api import routes
+    from app.core.deps_model import DependencyModel
+    from app.core.model_store import ModelStore
+    from app.main import app
+
+    def _builder(set_stage, timings):
+        model = DependencyModel(courses={}, prereqs={}, coreqs={})
+        for code in ["CECS100", "CECS174", "CECS274", "MATH122", "MATH123", "PHYS151"]:
+            model.ensure_course(code)
+        model.add_prereq("CECS274", "CECS174")
+        return model, None
+
+    store = ModelStore(_builder)
+    store.reload("test", wait=True)
+    monkeypatch.setattr(routes, "MODEL_STORE", store)
+    monkeypatch.setattr(routes, "load_section_options_for_courses", lambda courses: make_sections(courses))
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    routes.TERM_SCHEDULE_CACHE.clear()
+    yield TestClient(app)
+    routes.TERM_SCHEDULE_CACHE.clear()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+from app.core.deps_index import build_reverse_index, unlock_priority_key
+from app.core.deps_model import DependencyModel
+from app.core.scheduler_engine import generate_plan
+
+
+def _model(edges):
+    model = DependencyModel(courses={}, prereqs={}, coreqs={})
+    for course, prereqs in edges.items():
+        model.ensure_course(course)
+        for prereq in prereqs:
+            model.add_prereq(course, prereq)
+    return model
+
+
+# HUB gates many courses the student is not planning; CORE gates two planned ones.
+EDGES = {
+    "HUB": [], "CORE": [], "OTHER": [],
+    "X1": ["HUB"], "X2": ["HUB"], "X3": ["X1"], "X4": ["X2"],
+    "T1": ["CORE"], "T2": ["T1"],
+}
+
+
+def test_reverse_index_descendants():
+    index = build_reverse_index(_model(EDGES))
+    assert index.transitive_dependents("HUB") == ["X1", "X2", "X3", "X4"]
+    assert index.direct_dependents("CORE") == ["T1"]
+    assert index.by_unlock_count[0] == "HUB"
+
+
+def test_priority_counts_only_courses_in_the_plan():
+    model = _model(EDGES)
+    index = build_reverse_index(model)
+    working = {"HUB", "CORE", "T1", "T2"}
+
+    catalog_wide = unlock_priority_key(index, model)
+    in_plan = unlock_priority_key(index, model, within=working)
+
+    assert sorted(["HUB", "CORE"], key=catalog_wide) == ["HUB", "CORE"]
+    assert sorted(["HUB", "CORE"], key=in_plan) == ["CORE", "HUB"]
+
+
+def test_plan_front_loads_the_course_gating_planned_work():
+    model = _model(EDGES)
+    index = build_reverse_index(model)
+    targets = {"HUB", "T2"}
+    working = model.dependency_closure(targets)
+
+    plan = generate_plan(
+        model=model,
+        targets=targets,
+        completed=set(),
+        terms=["Fall", "Spring", "Fall"],
+        max_courses=1,
+        priority_key=unlock_priority_key(index, model, within=working),
+    )
+
+    # Catalog-wide counts would put HUB first; inside the plan CORE gates more.
+    assert [term.courses for term in plan.terms][:2] == [["CORE"], ["T1"]]
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from app.core import deps_loader
+from app.core.normalize import norm_course_code
+
+
+def _rows(count: int):
+    return [{"course_code": f"CECS {100 + i}", "prereq_code": f"CECS {99 + i}" if i else None, "coreq_code": None} for i in range(count)]
+
+
+def test_fetch_all_rows_orders_every_page(monkeypatch, fake_supabase):
+    sb = fake_supabase({"course_dependencies": _rows(25)})
+    monkeypatch.setattr(deps_loader, "get_supabase", lambda: sb)
+
+    rows = deps_loader._fetch_all_rows("course_dependencies", "course_code,prereq_code,coreq_code", 10, ["course_code"])
+
+    queries = sb.tables["course_dependencies"].queries
+    assert len(queries) == 3
+    assert all(("order", "course_code") in calls for calls in queries)
+    codes = [row["course_code"] for row in rows]
+    assert len(codes) == 25 and len(set(codes)) == 25
+
+
+def test_unordered_paging_would_lose_rows(monkeypatch, fake_supabase):
+    sb = fake_supabase({"course_dependencies": _rows(25)})
+    monkeypatch.setattr(deps_loader, "get_supabase", lambda: sb)
+
+    rows = deps_loader._fetch_all_rows("course_dependencies", "course_code", 10, [])
+
+    assert len({row["course_code"] for row in rows}) < 25
+
+
+def test_loader_uses_configured_order_column(monkeypatch, fake_supabase):
+    sb = fake_supabase({"course_dependencies": [{**row, "id": i} for i, row in enumerate(_rows(5))]})
+    monkeypatch.setattr(deps_loader, "get_supabase", lambda: sb)
+    monkeypatch.setenv("DEPS_LOCAL_CSV_OVERLAY", "0")
+    monkeypatch.setenv("DEPS_ORDER_COL", "id")
+
+    model = deps_loader.load_dependency_model_from_supabase()
+
+    assert ("order", "id") in sb.tables["course_dependencies"].queries[0]
+    assert model.prereqs[norm_course_code("CECS 101")] == {norm_course_code("CECS 100")}
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import random
+
+from app.core.deps_model import DependencyModel
+from app.core.eligibility import build_eligibility_index
+
+
+def _model() -> DependencyModel:
+    model = DependencyModel(courses={}, prereqs={}, coreqs={})
+    for code in ["A", "B", "C", "D", "E", "F"]:
+        model.ensure_course(code)
+    model.add_prereq("C", "A")
+    model.add_prereq("C", "B")
+    model.add_prereq_group("D", {"A", "B"})    # A or B
+    model.add_prereq("E", "D")
+    model.add_prereq_group("F", {"C", "E"})
+    return model
+
+
+def test_or_groups_and_and_terms():
+    index = build_eligibility_index(_model())
+    assert index.eligible_courses(set()) == {"A", "B"}
+    assert index.eligible_courses({"A"}) == {"B", "D"}
+    assert index.eligible_courses({"A", "B"}) == {"C", "D"}
+    assert index.eligible_courses({"A", "B", "C"}) == {"D", "F"}
+
+
+def test_tracker_reports_newly_unlocked_courses():
+    tracker = build_eligibility_index(_model()).tracker()
+    assert tracker.add("A") == {"D"}
+    assert tracker.add("A") == set()
+    assert tracker.add("B") == {"C"}
+    assert tracker.is_eligible("C") and not tracker.is_eligible("E")
+
+
+def test_matches_per_course_prereq_scan():
+    model = _model()
+    index = build_eligibility_index(model)
+    rng = random.Random(3)
+    for _ in range(50):
+        completed = {code for code in model.courses if rng.random() < 0.5}
+        tracker = index.tracker(completed)
+        for course in model.courses:
+            assert tracker.is_eligible(course) == (not model.unmet_prereq_labels(course, completed))
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core import rmp_client
+from app.core.instructor_directory import InstructorDirectory
+
+
+def _teacher(first: str, last: str, ratings: int = 10, legacy_id: int = 1) -> dict:
+    return {"firstName": first, "lastName": last, "numRatings": ratings, "legacyId": legacy_id, "avgRating": 4.0}
+
+
+@pytest.fixture
+def directory() -> InstructorDirectory:
+    return InstructorDirectory(
+        [
+            _teacher("John", "Smith", legacy_id=1),
+            _teacher("Jane", "Smith", legacy_id=2),
+            _teacher("Maria", "Garcia", legacy_id=3),
+            _teacher("Jonathan", "Lee", legacy_id=4),
+        ],
+        school_id="S1",
+        school_name="Test U",
+        synced_at=0,
+    )
+
+
+def _match(directory: InstructorDirectory, name: str):
+    node = directory.match(rmp_client._normalize_instructor_name(name), rmp_client._score_match)
+    return node["legacyId"] if node else None
+
+
+def test_exact_names_hit(directory):
+    assert _match(directory, "John Smith") == 1
+    assert _match(directory, "Smith, Jane") == 2
+    assert _match(directory, "Smith J") in {1, 2}           # section listings give only an initial
+    assert _match(directory, "Garcia M") == 3
+
+
+def test_first_name_typo_is_forgiven(directory):
+    assert _match(directory, "Jon Smith") == 1
+    assert _match(directory, "Mariah Garcia") == 3
+
+
+def test_last_name_near_miss_is_a_miss(directory):
+    # "johnsmyth" shares over half its trigrams with "johnsmith"; it used to come back as John Smith.
+    assert _match(directory, "John Smyth") is None
+    assert _match(directory, "Maria Garcias") is None
+    assert _match(directory, "Smyth J") is None
+
+
+def test_different_teacher_with_the_same_first_name_does_not_match(directory):
+    assert _match(directory, "John Garcia") is None           # Maria Garcia is someone else
+    assert _match(directory, "Maria Lopez") is None
+    assert _match(directory, "Jonathan Smithers") is None
+
+
+def test_directory_miss_falls_through_to_upstream(directory, monkeypatch):
+    from app.api.professor_models import ProfessorRatingLookupResponse
+    from app.core.cache import SqliteTTLCache
+
+    calls = []
+
+    def _fetch(name, normalized_name):
+        calls.append(normalized_name)
+        return ProfessorRatingLookupResponse(query=name, normalized_name=normalized_name, found=False), True
+
+    monkeypatch.setattr(rmp_client, "get_directory", lambda: directory)
+    monkeypatch.setattr(rmp_client, "_fetch_professor_rating", _fetch)
+    monkeypatch.setattr(rmp_client, "_rating_cache", SqliteTTLCache(None, namespace=rmp_client.RATING_CACHE_NAMESPACE))
+
+    assert rmp_client.lookup_professor_rating("John Smith").found
+    assert not rmp_client.lookup_professor_rating("John Smyth").found
+    assert calls == ["John Smyth"]
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.api import routes
+from app.core import schedule_explainer
+from app.core.cache import MemoryLRUCache
+from app.core.jobs import JobQueueFullError, JobStore
+
+
+def _blocking(release: threading.Event):
+    def _work(value):
+        release.wait(5)
+        return value
+    return _work
+
+
+def test_submit_runs_and_wait_returns_result():
+    store = JobStore("t", max_workers=1)
+    job = store.submit("echo", lambda value: value * 2, 21)
+    finished = store.wait(job.id, 5)
+    assert finished.status == "done" and finished.result == 42
+
+
+def test_failed_job_records_error():
+    store = JobStore("t", max_workers=1)
+
+    def _boom():
+        raise ValueError("bad pdf")
+
+    job = store.wait(store.submit("boom", _boom).id, 5)
+    assert job.status == "failed" and job.error == "bad pdf" and job.error_type == "ValueError"
+
+
+def test_max_pending_rejects_until_a_slot_frees():
+    release = threading.Event()
+    store = JobStore("t", max_workers=1, max_pending=2)
+    first = store.submit("slow", _blocking(release), 1)
+    store.submit("slow", _blocking(release), 2)
+    with pytest.raises(JobQueueFullError):
+        store.submit("slow", _blocking(release), 3)
+    assert store.rejected == 1 and store.pending() == 2
+
+    release.set()
+    assert store.wait(first.id, 5).finished
+    deadline = time.monotonic() + 5
+    while store.pending() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    store.submit("fast", lambda: None)
+
+
+def test_finished_jobs_expire_after_ttl_and_registry_is_bounded():
+    store = JobStore("t", max_workers=1, ttl_s=0.05, max_jobs=3)
+    first = store.submit("quick", lambda: 1)
+    store.wait(first.id, 5)
+    time.sleep(0.1)
+    store.submit("quick", lambda: 2)      # pruning happens on submit
+    assert store.get(first.id) is None
+
+    ids = [store.wait(store.submit("quick", lambda: 3).id, 5).id for _ in range(5)]
+    assert sum(store.get(job_id) is not None for job_id in ids) <= 3
+
+
+def test_wait_after_status_wakes_on_each_transition():
+    release = threading.Event()
+    store = JobStore("t", max_workers=1)
+    job = store.submit("slow", _blocking(release), "x")
+    running = store.wait(job.id, 5, after_status="queued")
+    assert running.status == "running"
+    release.set()
+    assert store.wait(job.id, 5, after_status="running").status == "done"
+
+
+def _term_request(courses):
+    return {"term": "Spring 2026", "requested_courses": courses, "completed_courses": ["CECS174"]}
+
+
+def test_full_explanation_queue_falls_back_to_heuristics(api, monkeypatch):
+    release = threading.Event()
+
+    def _slow_llm(system_prompt, prompt, deadline_s=None):
+        release.wait(5)
+        return {"schedules": [], "bullets": ["llm"]}
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(schedule_explainer, "_chat_json", _slow_llm)
+    monkeypatch.setattr(schedule_explainer, "_memory_cache", MemoryLRUCache(64))
+    monkeypatch.setattr(routes, "EXPLANATION_JOBS", JobStore("explanations", max_workers=1, max_pending=1))
+
+    try:
+        queued = api.post("/term/schedule", json=_term_request(["CECS274", "MATH122"])).json()
+        assert queued["explanation_job_id"]
+
+        overflow = api.post("/term/schedule", json=_term_request(["MATH123", "PHYS151"]))
+        assert overflow.status_code == 200
+        body = overflow.json()
+        assert body["explanation_job_id"] is None
+        assert body["generated_schedules"] and all(s["explanation_bullets"] for s in body["generated_schedules"])
+        assert routes.EXPLANATION_JOBS.rejected == 1
+        # Not cached, so the same request is re-solved rather than served without a job.
+        assert routes.TERM_SCHEDULE_CACHE.snapshot()["entries"] == 1
+    finally:
+        release.set()
+
+
+def test_configure_applies_before_the_pool_starts():
+    store = JobStore("t", max_workers=4, ttl_s=600, max_pending=64)
+    store.configure(max_workers=1, ttl_s=5, max_pending=2)
+    assert (store.max_workers, store.ttl_s, store.max_pending) == (1, 5, 2)
+
+    store.wait(store.submit("echo", lambda: 1).id, 5)
+    store.configure(max_workers=8)
+    assert store.max_workers == 1                       # the running pool keeps its size
+
+
+def _sse_events(api, url):
+    with api.stream("GET", url) as response:
+        assert response.headers["content-type"].startswith("text/event-stream")
+        return [line.split(": ", 1)[1] for line in response.iter_lines() if line.startswith("event: ")]
+
+
+@pytest.mark.parametrize(
+    "store_name, url, result, status",
+    [
+        ("EXPLANATION_JOBS", "/schedule/explanations/{}/events", {"schedules": [{"rank": 1, "explanation_bullets": ["x"]}]}, "done"),
+        ("TRANSCRIPT_JOBS", "/transcript/jobs/{}/events", ValueError("bad pdf"), "failed"),
+    ],
+    ids=["explanations", "transcripts"],
+)
+def test_job_event_streams_report_each_status_and_end(api, monkeypatch, store_name, url, result, status):
+    store = JobStore(store_name.lower(), max_workers=1)
+    monkeypatch.setattr(routes, store_name, store)
+    release = threading.Event()
+
+    def _work():
+        release.wait(5)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    job = store.submit("test", _work)
+    store.wait(job.id, 5, after_status="queued")
+    threading.Timer(0.2, release.set).start()
+
+    assert _sse_events(api, url.format(job.id)) == ["running", status]
+    assert api.get(url.format("missing")).status_code == 404
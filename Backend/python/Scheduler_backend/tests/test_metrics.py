@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.core import metrics
+
+
+def test_counter_renders_labels_and_escapes_values():
+    counter = metrics.Counter("t_events_total", "Test events.", ("event",))
+    counter.inc(2, "a")
+    counter.inc(1, 'say "hi"\n')
+
+    lines = counter.render()
+
+    assert lines[:2] == ["# HELP t_events_total Test events.", "# TYPE t_events_total counter"]
+    assert 't_events_total{event="a"} 2' in lines
+    assert 't_events_total{event="say \\"hi\\"\\n"} 1' in lines
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = metrics.Histogram("t_seconds", "Test latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "/x")
+
+    lines = histogram.render()
+
+    assert 't_seconds_bucket{route="/x",le="0.1"} 2' in lines     # le is inclusive
+    assert 't_seconds_bucket{route="/x",le="1"} 3' in lines
+    assert 't_seconds_bucket{route="/x",le="+Inf"} 4' in lines
+    assert 't_seconds_sum{route="/x"} 3.65' in lines
+    assert 't_seconds_count{route="/x"} 4' in lines
+
+
+def test_stage_feeds_histogram_and_request_timings():
+    token = metrics._request_timings.set([])
+    try:
+        with metrics.stage("test_stage"):
+            pass
+        timings = metrics._request_timings.get()
+    finally:
+        metrics._request_timings.reset(token)
+
+    assert [name for name, _ in timings] == ["test_stage"]
+    assert any(line.startswith('scheduler_stage_duration_seconds_count{stage="test_stage"}') for line in metrics.STAGE_SECONDS.render())
+
+
+def test_broken_collector_does_not_break_the_scrape(monkeypatch):
+    monkeypatch.setattr(metrics, "_collectors", [])
+
+    def _broken():
+        raise RuntimeError("boom")
+
+    def _gauges():
+        return [("t_entries", "gauge", "Entries.", [({"cache": "a"}, 3), ({"cache": "b"}, None)])]
+
+    metrics.register_collector(_broken)
+    metrics.register_collector(_gauges)
+    text = metrics.render_metrics()
+
+    assert "# collector _broken failed: boom" in text
+    assert 't_entries{cache="a"} 3' in text
+    assert 'cache="b"' not in text    # None means "no value", not zero
+
+
+def test_server_timing_header_lists_stages(monkeypatch):
+    monkeypatch.setenv("SERVER_TIMING", "1")
+
+    async def _app(scope, receive, send):
+        with metrics.stage("solve"):
+            pass
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def _send(message):
+        sent.append(message)
+
+    middleware = metrics.MetricsMiddleware(_app)
+    asyncio.run(middleware({"type": "http", "method": "GET", "path": "/x"}, None, _send))
+
+    header = dict(sent[0]["headers"])[b"server-timing"].decode()
+    assert header.startswith("solve;dur=") and ", total;dur=" in header
+
+
+def test_metrics_endpoint(api, monkeypatch):
+    api.get("/health")
+    response = api.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.PROMETHEUS_CONTENT_TYPE
+    assert 'scheduler_http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert "scheduler_jobs_rejected_total" in response.text
+
+    monkeypatch.setenv("METRICS_ENABLED", "0")
+    assert api.get("/metrics").status_code == 404
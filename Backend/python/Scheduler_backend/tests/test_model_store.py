@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.core.deps_model import DependencyModel
+from app.core.model_store import ModelStore
+
+
+def _model(tag: str) -> DependencyModel:
+    model = DependencyModel(courses={}, prereqs={}, coreqs={})
+    model.ensure_course(tag)
+    return model
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+# Builder whose behavior each test scripts: a list of outcomes consumed per call.
+class ScriptedBuilder:
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, set_stage, timings):
+        self.calls += 1
+        self.release.wait(5)
+        outcome = self.outcomes.pop(0) if self.outcomes else "ok"
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _model(f"V{self.calls}"), None
+
+
+def test_reload_publishes_versions_and_derived():
+    builder = ScriptedBuilder(["ok", "ok"])
+    store = ModelStore(builder)
+    store.register_derived("course_count", lambda model: len(model.courses))
+    swapped = []
+    store.on_swap(lambda snapshot: swapped.append(snapshot.version))
+
+    assert store.status() == "pending"
+    assert store.reload("startup", wait=True)
+    first = store.current()
+    assert first.version == 1 and first.derived("course_count", lambda m: -1) == 1
+
+    assert store.reload("admin", wait=True)
+    assert store.current().version == 2
+    assert swapped == [1, 2]
+    # A request holding the old snapshot still sees its own model.
+    assert "V1" in first.dep_model.courses
+
+
+def test_failed_rebuild_keeps_previous_version():
+    store = ModelStore(ScriptedBuilder(["ok", RuntimeError("supabase down")]))
+    store.reload("startup", wait=True)
+    store.reload("admin", wait=True)
+
+    assert store.current().version == 1
+    assert store.status() == "ready"
+    assert store.last_error == "supabase down"
+
+
+def test_reload_is_refused_while_one_is_running():
+    builder = ScriptedBuilder(["ok"])
+    builder.release.clear()
+    store = ModelStore(builder)
+    assert store.reload("startup")
+    assert not store.reload("admin")
+    builder.release.set()
+    assert _wait_for(lambda: store.current() is not None)
+
+
+def test_csv_change_during_running_reload_is_not_lost(tmp_path):
+    csv_path = tmp_path / "overlay.csv"
+    csv_path.write_text("v1")
+    builder = ScriptedBuilder([])
+    store = ModelStore(builder)
+    store.reload("startup", wait=True)
+
+    # Hold an admin reload open, then touch the CSV while it runs.
+    builder.release.clear()
+    store.reload("admin")
+    store.start_watchers(watch_path=csv_path, poll_s=0.05)
+    try:
+        time.sleep(0.1)
+        csv_path.write_text("v2 with a new overlay row")
+        time.sleep(1.3)   # at least one watcher tick while the admin reload is still running
+        assert store.version == 1
+        builder.release.set()
+
+        assert _wait_for(lambda: store.current().reason == "csv_changed")
+        assert store.version == 3
+    finally:
+        store.stop()
+
+
+def test_failed_first_load_is_retried_with_backoff():
+    builder = ScriptedBuilder([RuntimeError("boom"), RuntimeError("boom again"), "ok"])
+    store = ModelStore(builder)
+    store.reload("startup", wait=True)
+    assert store.status() == "failed"
+
+    store.start_watchers(poll_s=30, retry_base_s=0.1, retry_max_s=0.2)
+    try:
+        assert _wait_for(lambda: store.current() is not None)
+        assert builder.calls == 3
+        assert store.current().reason == "retry"
+        assert store.last_error is None
+    finally:
+        store.stop()
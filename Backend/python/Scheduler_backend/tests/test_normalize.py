@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from app.core import normalize
+from app.core.normalize import (
+    alias_fingerprint,
+    load_course_aliases_from_file,
+    norm_course_code,
+    normalize_cache_info,
+    normalize_many,
+    set_course_aliases,
+    split_codes,
+)
+
+
+@pytest.fixture(autouse=True)
+def _default_aliases():
+    set_course_aliases()
+    yield
+    set_course_aliases()
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("CECS 274", "CECS274"),
+        ("cecs274", "CECS274"),
+        ("  CECS  274 ", "CECS274"),
+        ("MATH 122A", "MATH122A"),
+        ("AST 600", "A/ST600"),   # built-in department alias
+        ("", ""),
+    ],
+)
+def test_norm_course_code(raw, expected):
+    assert norm_course_code(raw) == expected
+
+
+def test_normalize_many_keeps_order_and_dedupes():
+    raw = ["CECS 274", None, "", "cecs274", "MATH 123"]
+    assert normalize_many(raw) == ["CECS274", "CECS274", "MATH123"]
+    assert normalize_many(raw, dedupe=True) == ["CECS274", "MATH123"]
+    assert split_codes("CECS 274|MATH 123|") == ["CECS274", "MATH123"]
+
+
+def test_repeated_codes_hit_the_memo():
+    norm_course_code("PHYS 151")
+    hits = normalize_cache_info().hits
+    norm_course_code("PHYS 151")
+    assert normalize_cache_info().hits == hits + 1
+
+
+def test_alias_change_clears_memo_and_fingerprint(tmp_path):
+    before = alias_fingerprint()
+    assert norm_course_code("CECS 228H") == "CECS228H"
+
+    path = tmp_path / "aliases.json"
+    path.write_text(json.dumps({"departments": {"CS": "CECS"}, "courses": {"CECS 228H": "CECS 228"}}))
+    load_course_aliases_from_file(path)
+
+    assert norm_course_code("CECS 228H") == "CECS228"
+    assert norm_course_code("CS 274") == "CECS274"
+    assert alias_fingerprint() != before
+    assert normalize._department_aliases["AST"] == "A/ST"   # defaults are kept
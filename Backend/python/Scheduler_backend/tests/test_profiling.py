@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from app.core import profiling
+from app.core.cache import DEFAULT_CACHE_DIR
+
+
+def test_profile_dir_defaults_to_the_cache_dir_not_the_working_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv("PROFILE_DIR", raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    assert profiling.profile_dir() == DEFAULT_CACHE_DIR / "profiles"
+    assert profiling.profile_dir().is_absolute()
+
+
+def test_profile_dir_override(monkeypatch, tmp_path):
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "p"))
+    assert profiling.profile_dir() == tmp_path / "p"
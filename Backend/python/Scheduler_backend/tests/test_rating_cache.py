@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.api.professor_models import ProfessorRatingLookupResponse
+from app.core import rmp_client
+from app.core.cache import SqliteTTLCache
+
+
+def test_sqlite_cache_round_trip_and_stale_entries(tmp_path):
+    cache = SqliteTTLCache(tmp_path / "c.sqlite3", namespace="t")
+    cache.set("fresh", {"a": 1}, ttl_s=60)
+    cache.set("old", {"b": 2}, ttl_s=-1)
+
+    assert cache.get("fresh").value == {"a": 1} and cache.get("fresh").fresh
+    stale = cache.get("old")
+    assert stale.value == {"b": 2} and not stale.fresh   # served stale, not dropped
+    assert cache.get("missing") is None
+
+
+def test_sqlite_cache_is_shared_across_connections_and_namespaced(tmp_path):
+    path = tmp_path / "shared.sqlite3"
+    worker_a = SqliteTTLCache(path, namespace="ratings")
+    worker_b = SqliteTTLCache(path, namespace="ratings")
+    other = SqliteTTLCache(path, namespace="other")
+
+    worker_a.set("k", "v", ttl_s=60)
+    assert worker_b.get("k").value == "v"
+    assert other.get("k") is None
+    other.clear()
+    assert worker_b.size() == 1
+
+
+def test_sqlite_cache_prunes_oldest_beyond_max_entries():
+    cache = SqliteTTLCache(None, namespace="t", max_entries=10)
+    for i in range(25):
+        cache.set(f"k{i}", i, ttl_s=60)
+        time.sleep(0.001)
+    assert cache.size() == 10
+    assert cache.get("k24") is not None
+    assert cache.get("k0") is None
+
+
+# Upstream stand-in that counts calls and can be held open to test coalescing.
+class FakeUpstream:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, name, normalized_name):
+        self.calls += 1
+        self.release.wait(5)
+        return ProfessorRatingLookupResponse(query=name, normalized_name=normalized_name, found=True, avg_rating=4.0 + self.calls / 10), True
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    fake = FakeUpstream()
+    monkeypatch.setattr(rmp_client, "_fetch_professor_rating", fake)
+    monkeypatch.setattr(rmp_client, "get_directory", lambda: None)
+    monkeypatch.setattr(rmp_client, "_rating_cache", SqliteTTLCache(None, namespace=rmp_client.RATING_CACHE_NAMESPACE))
+    return fake
+
+
+def test_lookup_caches_hits(upstream):
+    first = rmp_client.lookup_professor_rating("Jane Doe")
+    second = rmp_client.lookup_professor_rating("jane  doe")
+    assert upstream.calls == 1
+    assert second.avg_rating == first.avg_rating and second.query == "jane  doe"
+
+
+def test_lookup_serves_stale_and_refreshes_in_background(upstream):
+    rmp_client.lookup_professor_rating("Jane Doe")
+    key = rmp_client._rating_cache_key(rmp_client._normalize_instructor_name("Jane Doe"))
+    cached = rmp_client._rating_cache.get(key).value
+    rmp_client._rating_cache.set(key, cached, ttl_s=-1)
+
+    stale = rmp_client.lookup_professor_rating("Jane Doe")
+    assert stale.avg_rating == pytest.approx(4.1)
+
+    deadline = time.monotonic() + 5
+    while upstream.calls < 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    deadline = time.monotonic() + 5
+    while not rmp_client._rating_cache.get(key).fresh and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert rmp_client.lookup_professor_rating("Jane Doe").avg_rating == pytest.approx(4.2)
+
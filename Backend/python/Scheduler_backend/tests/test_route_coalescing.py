@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.api import routes
+from app.api.models import GenerateRequest
+from app.api.term_models import TermScheduleRequest
+from app.core.singleflight import SingleFlight
+
+from tests.conftest import make_sections
+
+TERM_REQUEST = {"term": "Fall 2025", "requested_courses": ["CECS100", "MATH122"], "constraints": {}}
+
+
+@pytest.fixture
+def flights(api, monkeypatch):
+    monkeypatch.setattr(routes, "TERM_SCHEDULE_FLIGHTS", SingleFlight())
+    monkeypatch.setattr(routes, "GENERATE_FLIGHTS", SingleFlight())
+    return routes
+
+
+# Section loads that block until released, so every request arrives while the first is still solving.
+@pytest.fixture
+def slow_load(flights, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def _load(courses):
+        calls.append(sorted(courses))
+        release.wait(5)
+        return make_sections(courses)
+
+    monkeypatch.setattr(routes, "load_section_options_for_courses", _load)
+    return release, calls
+
+
+def _in_threads(count, target):
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(target())) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def _wait_for_waiters(flights: SingleFlight, count: int) -> None:
+    deadline = time.monotonic() + 5
+    while flights.coalesced < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_concurrent_term_schedule_requests_share_one_solve(api, slow_load):
+    release, calls = slow_load
+
+    threads, responses = _in_threads(5, lambda: api.post("/term/schedule", json=TERM_REQUEST))
+    _wait_for_waiters(routes.TERM_SCHEDULE_FLIGHTS, 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert [response.status_code for response in responses] == [200] * 5
+    assert len({response.text for response in responses}) == 1
+    assert api.get("/term/schedule/stats").json()["coalesced"] == 4
+
+
+def test_concurrent_generate_requests_share_one_plan(api, flights, monkeypatch):
+    release = threading.Event()
+    calls = []
+    real = routes._generate_plan_response
+
+    def _slow(req, snapshot):
+        calls.append(req.targets)
+        release.wait(5)
+        return real(req, snapshot)
+
+    monkeypatch.setattr(routes, "_generate_plan_response", _slow)
+    body = {"targets": ["CECS274"], "completed": ["CECS174"]}
+
+    threads, responses = _in_threads(4, lambda: api.post("/schedule/generate", json=body))
+    _wait_for_waiters(routes.GENERATE_FLIGHTS, 3)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len({response.text for response in responses}) == 1
+    assert api.get("/schedule/generate/stats").json() == {"executed": 1, "coalesced": 3, "in_flight": 0}
+
+
+def _tamper(response) -> None:
+    response.warnings.append("tampered")
+    response.generated_schedules[0].explanation_bullets.append("tampered")
+    response.selected_sections.clear()
+
+
+def test_coalesced_callers_get_independent_copies(api, slow_load):
+    release, _ = slow_load
+    req = TermScheduleRequest(**TERM_REQUEST)
+
+    threads, results = _in_threads(3, lambda: routes.term_schedule(req))
+    _wait_for_waiters(routes.TERM_SCHEDULE_FLIGHTS, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    expected = results[0].model_dump()
+    assert all(response.model_dump() == expected for response in results)
+    for index, response in enumerate(results):
+        _tamper(response)
+        assert all(other.model_dump() == expected for other in results[index + 1:])
+    # Every caller's copy, the leader's included, is detached from the result cache.
+    assert routes.term_schedule(req).model_dump() == expected
+
+
+def test_mutating_a_cached_response_does_not_change_the_next_one(api):
+    req = TermScheduleRequest(**TERM_REQUEST)
+    hits = routes.TERM_SCHEDULE_CACHE.snapshot().get("hit", 0)
+
+    first = routes.term_schedule(req)
+    expected = first.model_dump()
+    _tamper(first)
+    second = routes.term_schedule(req)
+    assert second.model_dump() == expected
+
+    _tamper(second)
+    assert routes.term_schedule(req).model_dump() == expected
+    assert routes.TERM_SCHEDULE_CACHE.snapshot()["hit"] == hits + 2
+
+
+def test_mutating_a_shared_generate_plan_does_not_leak(api, flights, monkeypatch):
+    release = threading.Event()
+    real = routes._generate_plan_response
+
+    def _slow(req, snapshot):
+        release.wait(5)
+        return real(req, snapshot)
+
+    monkeypatch.setattr(routes, "_generate_plan_response", _slow)
+    req = GenerateRequest(targets=["CECS274"], completed=["CECS174"])
+
+    threads, results = _in_threads(3, lambda: routes.schedule_generate(req))
+    _wait_for_waiters(routes.GENERATE_FLIGHTS, 2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    expected = results[0].model_dump()
+    results[1].plan.clear()
+    assert results[0].model_dump() == expected and results[2].model_dump() == expected
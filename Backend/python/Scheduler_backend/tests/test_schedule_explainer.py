@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core import schedule_explainer
+from app.core.cache import MemoryLRUCache
+from app.core.section_models import MeetingBlock, SectionOption
+from app.core.section_scheduler import compute_schedule_metrics
+
+
+def _candidate(course: str, section_id: str, start: int):
+    section = SectionOption(course=course, section_id=section_id, meetings=[MeetingBlock(days={0, 2}, start_min=start, end_min=start + 75)])
+    return [section], compute_schedule_metrics([section])
+
+
+# Stand-in for the OpenAI call: answers batches for every schedule and records each request.
+class FakeLLM:
+    def __init__(self, fail_batch: bool = False) -> None:
+        self.calls = []
+        self.fail_batch = fail_batch
+
+    def __call__(self, system_prompt, prompt, deadline_s=None):
+        self.calls.append((system_prompt, prompt))
+        if system_prompt == schedule_explainer.BATCH_SYSTEM_PROMPT:
+            if self.fail_batch:
+                raise RuntimeError("batch failed")
+            count = prompt.count("Schedule ")
+            return {"schedules": [{"index": i, "bullets": [f"batch bullet {i}"]} for i in range(1, count + 1)]}
+        return {"bullets": ["single bullet"]}
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    fake = FakeLLM()
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.delenv("EXPLANATION_CACHE_PATH", raising=False)
+    monkeypatch.setattr(schedule_explainer, "_chat_json", fake)
+    monkeypatch.setattr(schedule_explainer, "_memory_cache", MemoryLRUCache(64))
+    return fake
+
+
+def test_batch_prompt_asks_for_standalone_explanations():
+    prompt = schedule_explainer.BATCH_SYSTEM_PROMPT.lower()
+    assert "distinguishes" not in prompt
+    assert "never compare" in prompt
+
+
+def test_batch_answers_are_cached_per_schedule(llm):
+    first = [_candidate("CECS274", "01", 480), _candidate("CECS274", "02", 600)]
+    assert schedule_explainer.generate_schedule_benefits_batch(first, "compact") == [["batch bullet 1"], ["batch bullet 2"]]
+    assert len(llm.calls) == 1
+
+    # A later response with different siblings reuses the per-schedule entry and only asks about the new one.
+    second = [_candidate("CECS274", "02", 600), _candidate("CECS274", "03", 720)]
+    bullets = schedule_explainer.generate_schedule_benefits_batch(second, "compact")
+    assert bullets[0] == ["batch bullet 2"]
+    assert len(llm.calls) == 2 and llm.calls[1][1].count("Schedule ") == 1
+
+
+def test_failed_batch_falls_back_per_schedule(llm):
+    llm.fail_batch = True
+    candidates = [_candidate("MATH122", "01", 480), _candidate("MATH122", "02", 600)]
+    assert schedule_explainer.generate_schedule_benefits_batch(candidates, "compact", budget_s=5) == [["single bullet"]] * 2
+
+
+def test_cache_key_tracks_prompt_version_and_preference(monkeypatch):
+    sections, metrics = _candidate("CECS274", "01", 480)
+    key = schedule_explainer.explanation_cache_key(sections, metrics, "compact")
+    assert key == schedule_explainer.explanation_cache_key(sections, metrics, " Compact ")
+    assert key != schedule_explainer.explanation_cache_key(sections, metrics, "fewest_days")
+    monkeypatch.setattr(schedule_explainer, "EXPLANATION_PROMPT_VERSION", schedule_explainer.EXPLANATION_PROMPT_VERSION + 1)
+    assert key != schedule_explainer.explanation_cache_key(sections, metrics, "compact")
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+
+from app.api import routes
+from app.api.professor_models import ProfessorRatingLookupResponse
+from app.core import rmp_client
+from app.core.cache import CacheStats, SqliteTTLCache
+from app.core.section_ratings import prefetch_instructor_ratings
+
+from tests.conftest import make_sections
+
+
+# RMP stand-in: rates every instructor 4.0, or fails every call while `down` is set.
+class FakeRMP:
+    def __init__(self) -> None:
+        self.down = False
+        self.calls = 0
+
+    def __call__(self, name, normalized_name):
+        self.calls += 1
+        if self.down:
+            return ProfessorRatingLookupResponse(query=name, normalized_name=normalized_name, found=False), False
+        return ProfessorRatingLookupResponse(
+            query=name, normalized_name=normalized_name, found=True, avg_rating=4.0, num_ratings=12,
+        ), True
+
+
+@pytest.fixture
+def rmp(monkeypatch):
+    fake = FakeRMP()
+    monkeypatch.setattr(rmp_client, "_fetch_professor_rating", fake)
+    monkeypatch.setattr(rmp_client, "get_directory", lambda: None)
+    monkeypatch.setattr(rmp_client, "_rating_cache", SqliteTTLCache(None, namespace=rmp_client.RATING_CACHE_NAMESPACE))
+    monkeypatch.setattr(rmp_client, "RATING_CACHE_STATS", CacheStats())
+    return fake
+
+
+@pytest.fixture
+def solves(api, monkeypatch):
+    """Counts real solves: a result-cache hit never loads sections."""
+    calls = []
+
+    def _load(courses):
+        calls.append(sorted(courses))
+        return make_sections(courses)
+
+    monkeypatch.setattr(routes, "load_section_options_for_courses", _load)
+    return calls
+
+
+def _request(**constraints):
+    return {"term": "Fall 2025", "requested_courses": ["CECS100", "MATH122"], "constraints": constraints}
+
+
+def test_upstream_errors_are_unresolved_even_when_served_from_the_error_cache(rmp):
+    rmp.down = True
+
+    first = prefetch_instructor_ratings(["Jane Doe", "John Roe"], timeout_s=5)
+    again = prefetch_instructor_ratings(["Jane Doe", "John Roe"], timeout_s=5)
+
+    assert (first.requested, first.resolved, first.errors, first.complete) == (2, 0, 2, False)
+    assert (again.resolved, again.errors, again.complete) == (0, 2, False)
+    assert rmp.calls == 2                        # the second pass was answered by the short error entries
+    stats = rmp_client.rating_cache_stats()
+    assert stats.get("hit", 0) == 0 and stats["cached_error"] == 2
+
+
+def test_unrated_instructors_still_count_as_resolved(rmp, monkeypatch):
+    monkeypatch.setattr(
+        rmp_client,
+        "_fetch_professor_rating",
+        lambda name, normalized: (ProfessorRatingLookupResponse(query=name, normalized_name=normalized, found=False), True),
+    )
+    prefetch = prefetch_instructor_ratings(["Jane Doe"], timeout_s=5)
+    assert prefetch.complete and prefetch.ratings == {"Jane Doe": None}
+
+
+@pytest.mark.parametrize(
+    "constraints",
+    [
+        {"min_instructor_ratings": 3.5},
+        {"min_instructor_ratings": 3.5, "unrated_instructor_policy": "exclude"},
+        {"ranking_preference": "highest_rated"},
+    ],
+    ids=["min_rating", "exclude", "highest_rated"],
+)
+def test_rmp_outage_warns_and_is_not_cached(api, rmp, solves, constraints):
+    rmp.down = True
+
+    first = api.post("/term/schedule", json=_request(**constraints))
+    second = api.post("/term/schedule", json=_request(**constraints))
+
+    assert first.status_code == 200
+    assert any("Instructor ratings were unavailable" in warning for warning in first.json()["warnings"])
+    assert len(solves) == 2                      # solved again rather than served from the result cache
+    if constraints.get("unrated_instructor_policy") == "exclude":
+        assert first.json()["generated_schedules"] == []
+
+    rmp.down = False
+    rmp_client._rating_cache.clear()
+    recovered = api.post("/term/schedule", json=_request(**constraints))
+    assert recovered.json()["generated_schedules"]
+    assert not any("unavailable" in warning for warning in recovered.json()["warnings"])
+    assert all(
+        section["instructor_rating"] == 4.0
+        for section in recovered.json()["selected_sections"]
+    )
+
+
+def test_complete_ratings_are_cached(api, rmp, solves):
+    api.post("/term/schedule", json=_request(min_instructor_ratings=3.5))
+    api.post("/term/schedule", json=_request(min_instructor_ratings=3.5))
+
+    assert len(solves) == 1
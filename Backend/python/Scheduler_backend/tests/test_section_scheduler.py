@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from app.core.section_models import MeetingBlock, SectionOption
+from app.core.section_scheduler import SearchStats, pick_ranked_schedules, section_conflicts
+
+
+def _options(courses=("CECS100", "MATH122", "PHYS151"), per_course=3):
+    """Every combination is conflict-free: each course owns its own day, sections differ by hour."""
+    out = {}
+    for day, course in enumerate(courses):
+        out[course] = [
+            SectionOption(
+                course=course,
+                section_id=f"{k + 1:02d}",
+                meetings=[MeetingBlock(days={day}, start_min=480 + k * 120, end_min=555 + k * 120)],
+                instructor=f"Prof{k} Example",
+            )
+            for k in range(per_course)
+        ]
+    return out
+
+
+def _ids(ranked):
+    return [tuple((sec.course, sec.section_id) for sec in sections) for sections, _, _ in ranked]
+
+
+def test_exhausted_budget_returns_a_partial_ranking_and_says_so():
+    full_stats = SearchStats()
+    full, _ = pick_ranked_schedules(_options(), max_results=50, stats=full_stats)
+    stats = SearchStats()
+
+    ranked, failures = pick_ranked_schedules(_options(), max_solutions_checked=5, max_results=50, stats=stats)
+
+    assert failures == {}
+    assert stats.budget_exhausted is True
+    assert (stats.leaves, stats.candidates, stats.max_solutions_checked) == (5, 5, 5)
+    assert 0 < stats.nodes < full_stats.nodes
+    assert len(ranked) == 5
+    assert set(_ids(ranked)) <= set(_ids(full))           # a subset of the real schedules, still ranked
+    assert [score for _, score, _ in ranked] == sorted((score for _, score, _ in ranked), reverse=True)
+    for sections, _, _ in ranked:
+        assert not any(section_conflicts(sec, sections[:i]) for i, sec in enumerate(sections))
+
+
+def test_budget_that_is_not_reached_leaves_the_output_unchanged():
+    baseline, baseline_failures = pick_ranked_schedules(_options(), max_results=10)
+    stats = SearchStats()
+
+    ranked, failures = pick_ranked_schedules(_options(), max_solutions_checked=27, max_results=10, stats=stats)
+
+    assert _ids(ranked) == _ids(baseline) and failures == baseline_failures
+    assert [score for _, score, _ in ranked] == [score for _, score, _ in baseline]
+    assert stats.budget_exhausted is False
+    assert (stats.leaves, stats.candidates, stats.duplicates) == (27, 27, 0)
+    assert stats.max_solutions_checked == 27 and stats.solve_ms >= 0
+
+
+def test_conflicts_are_pruned_and_counted():
+    options = _options(per_course=2)
+    clash = SectionOption(
+        course="MATH122",
+        section_id="99",
+        meetings=[MeetingBlock(days={0}, start_min=480, end_min=555)],   # same slot as CECS100 section 01
+    )
+    options["MATH122"].append(clash)
+    stats = SearchStats()
+
+    ranked, _ = pick_ranked_schedules(options, max_results=50, stats=stats)
+
+    assert stats.pruned >= 1 and stats.leaves == len(ranked) == 2 * 3 * 2 - 2
+    assert all(("MATH122", "99") not in ids or ("CECS100", "01") not in ids for ids in map(set, _ids(ranked)))
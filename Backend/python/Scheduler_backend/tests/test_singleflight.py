@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from app.api.professor_models import ProfessorRatingLookupResponse
+from app.core import rmp_client
+from app.core.cache import SqliteTTLCache
+from app.core.singleflight import SingleFlight
+
+
+def _run_concurrently(count, target):
+    results, errors = [], []
+
+    def _call():
+        try:
+            results.append(target())
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=_call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def _work():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    threads, results, errors = _run_concurrently(6, lambda: flights.do("k", _work))
+    time.sleep(0.2)
+    assert flights.in_flight() == 1
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and not errors
+    assert sorted(shared for _, shared in results) == [False] + [True] * 5
+    assert flights.executed == 1 and flights.coalesced == 5
+    assert flights.in_flight() == 0
+
+
+def test_errors_are_shared_and_nothing_is_cached():
+    flights = SingleFlight()
+    release = threading.Event()
+
+    def _fail():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    threads, results, errors = _run_concurrently(3, lambda: flights.do("k", _fail))
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 3 and all(isinstance(exc, ValueError) for exc in errors)
+
+    assert flights.do("k", lambda: "recovered") == ("recovered", False)
+
+
+def test_concurrent_rating_misses_share_one_upstream_call(monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def _fetch(name, normalized_name):
+        calls.append(name)
+        release.wait(5)
+        return ProfessorRatingLookupResponse(query=name, normalized_name=normalized_name, found=True, avg_rating=4.5), True
+
+    monkeypatch.setattr(rmp_client, "_fetch_professor_rating", _fetch)
+    monkeypatch.setattr(rmp_client, "get_directory", lambda: None)
+    monkeypatch.setattr(rmp_client, "_rating_cache", SqliteTTLCache(None, namespace=rmp_client.RATING_CACHE_NAMESPACE))
+
+    threads, results, errors = _run_concurrently(5, lambda: rmp_client.lookup_professor_rating("Ann Lee"))
+    time.sleep(0.2)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1 and not errors
+    assert [result.avg_rating for result in results] == pytest.approx([4.5] * 5)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from app.api import routes
+from app.core import metrics, rmp_client, schedule_explainer
+from app.core.result_cache import ResultCache
+
+
+def test_route_settings_are_read_at_startup_not_import(monkeypatch):
+    # Values that only appear after import, as ones from the local .env file do.
+    monkeypatch.setenv("EXPLANATION_QUEUE_MAX", "3")
+    monkeypatch.setenv("EXPLANATION_JOB_TTL_SECONDS", "30")
+    monkeypatch.setenv("TRANSCRIPT_QUEUE_MAX", "2")
+    monkeypatch.setenv("TERM_SCHEDULE_CACHE_SIZE", "5")
+    monkeypatch.setenv("TERM_SCHEDULE_CACHE_TTL_SECONDS", "0")
+    for name in ("EXPLANATION_JOBS", "TRANSCRIPT_JOBS"):
+        monkeypatch.setattr(routes, name, routes.JobStore(name.lower()))
+    monkeypatch.setattr(routes, "TERM_SCHEDULE_CACHE", ResultCache("term_schedule"))
+
+    routes.configure_from_env()
+
+    assert (routes.EXPLANATION_JOBS.max_pending, routes.EXPLANATION_JOBS.ttl_s) == (3, 30)
+    assert routes.TRANSCRIPT_JOBS.max_pending == 2
+    assert routes.TERM_SCHEDULE_CACHE.snapshot()["max_entries"] == 5
+    assert not routes.TERM_SCHEDULE_CACHE.enabled
+
+
+def test_app_startup_configures_before_loading():
+    from app.main import app
+
+    names = [handler.__name__ for handler in app.router.on_startup]
+    assert names.index("configure_from_env") < names.index("startup_load_data")
+
+
+def test_result_cache_resize_evicts_oldest():
+    cache = ResultCache("t", max_entries=3)
+    for key in "abc":
+        cache.put(key, key)
+    cache.configure(max_entries=2)
+    assert cache.get("a") is None and cache.get("c") == "c"
+
+
+def test_metrics_flag_is_read_on_first_use(monkeypatch):
+    monkeypatch.setattr(metrics, "_enabled", None)
+    monkeypatch.setenv("METRICS_ENABLED", "0")
+    assert metrics.stage("solve") is metrics._NULL_STAGE
+
+
+def test_pools_and_caches_are_sized_on_first_use(monkeypatch):
+    monkeypatch.setenv("RMP_BULK_CONCURRENCY", "3")
+    monkeypatch.setenv("EXPLANATION_CACHE_SIZE", "7")
+    monkeypatch.setenv("RMP_SCHOOL_NAME", "Example State")
+    monkeypatch.setattr(rmp_client, "_bulk_pool", None)
+    monkeypatch.setattr(schedule_explainer, "_memory_cache", None)
+
+    assert rmp_client._get_bulk_pool()._max_workers == 3
+    assert schedule_explainer._get_memory_cache().max_entries == 7
+    assert rmp_client._school_name() == "Example State"
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import pytest
+
+from app.api import routes
+from app.api.term_models import TermScheduleRequest
+
+from tests.conftest import make_sections
+
+
+def _request(**overrides) -> dict:
+    body = {"term": "Fall 2025", "requested_courses": ["CECS100", "MATH122"], "constraints": {}}
+    body.update(overrides)
+    return body
+
+
+def _key(body: dict) -> str:
+    return routes._term_schedule_fingerprint(TermScheduleRequest(**body), routes.MODEL_STORE.current())
+
+
+@pytest.fixture
+def solves(api, monkeypatch):
+    """Counts real solves: a result-cache hit never loads sections."""
+    calls = []
+
+    def _load(courses):
+        calls.append(sorted(courses))
+        return make_sections(courses)
+
+    monkeypatch.setattr(routes, "load_section_options_for_courses", _load)
+    return calls
+
+
+def test_key_ignores_spelling_order_and_locks_the_solver_drops(api):
+    base = _key(_request())
+
+    assert _key(_request(requested_courses=["math 122", "cecs100", "CECS 100"])) == base
+    assert _key(_request(constraints={"ranking_preference": " Compact "})) == base
+    # CECS274 is not eligible without CECS174, and a blank id is not a lock.
+    assert _key(_request(locked_sections=[{"course": "CECS274", "section_id": "01"}])) == base
+    assert _key(_request(locked_sections=[{"course": "CECS100", "section_id": "  "}])) == base
+
+
+def test_key_changes_with_what_the_solver_uses(api):
+    base = _key(_request())
+
+    assert _key(_request(locked_sections=[{"course": "cecs 100", "section_id": "02"}])) != base
+    assert _key(_request(constraints={"ranking_preference": "highest_rated"})) != base
+    assert _key(_request(constraints={"max_schedules": 2})) != base
+    assert _key(_request(completed_courses=["CECS174"])) != base
+
+
+def test_locked_map_is_shared_by_key_and_solve():
+    locks = [
+        type("Lock", (), {"course": "cecs 100", "section_id": " 02 "})(),
+        type("Lock", (), {"course": "CECS274", "section_id": "01"})(),
+        type("Lock", (), {"course": "MATH122", "section_id": ""})(),
+    ]
+    assert routes._locked_sections_by_course(locks, {"CECS100", "MATH122"}) == {"CECS100": "02"}
+
+
+def test_equivalent_requests_hit_the_result_cache(api, solves):
+    first = api.post("/term/schedule", json=_request())
+    second = api.post("/term/schedule", json=_request(
+        requested_courses=["MATH 122", "cecs100"],
+        locked_sections=[{"course": "CECS274", "section_id": "01"}],
+        constraints={"ranking_preference": "COMPACT"},
+    ))
+
+    assert len(solves) == 1
+    assert second.json()["generated_schedules"] == first.json()["generated_schedules"]
+
+
+def test_different_requests_miss_the_result_cache(api, solves):
+    api.post("/term/schedule", json=_request())
+    api.post("/term/schedule", json=_request(locked_sections=[{"course": "CECS100", "section_id": "02"}]))
+    api.post("/term/schedule", json=_request(constraints={"max_schedules": 1}))
+
+    assert len(solves) == 3
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core import normalize, transcript_cache
+from app.core.cache import SqliteTTLCache
+from app.core.transcript_parser import ParsedTranscript
+
+PDF = b"%PDF-1.4 fake transcript bytes"
+
+
+def _parsed(**overrides) -> ParsedTranscript:
+    fields = dict(
+        student_name="Ada Lovelace",
+        student_id="000000001",
+        courses=[{"course_code": "CECS174", "grade": "A"}],
+        grouped_by_term=[],
+        unmatched_lines=[],
+        warnings=[],
+        total_pages=1,
+        extracted_text_chars=120,
+    )
+    fields.update(overrides)
+    return ParsedTranscript(**fields)
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    store = SqliteTTLCache(None, namespace=transcript_cache.TRANSCRIPT_CACHE_NAMESPACE)
+    monkeypatch.setattr(transcript_cache, "_transcript_cache", store)
+    monkeypatch.setattr(transcript_cache, "_transcript_cache_ready", True)
+    monkeypatch.setattr(transcript_cache, "TRANSCRIPT_CACHE_STATS", transcript_cache.CacheStats())
+    return store
+
+
+# Counts parser invocations so tests can tell hits from misses.
+class CountingParser:
+    def __init__(self, result: ParsedTranscript) -> None:
+        self.result = result
+        self.calls = 0
+
+    def __call__(self, file_bytes, known):
+        self.calls += 1
+        return self.result
+
+
+def test_key_changes_with_everything_that_changes_the_parse(monkeypatch):
+    base = transcript_cache.transcript_cache_key(PDF, "cat1")
+
+    assert transcript_cache.transcript_cache_key(PDF, "cat1") == base
+    assert transcript_cache.transcript_cache_key(PDF + b" ", "cat1") != base
+    assert transcript_cache.transcript_cache_key(PDF, "cat2") != base
+
+    monkeypatch.setattr(transcript_cache, "TRANSCRIPT_PARSER_VERSION", transcript_cache.TRANSCRIPT_PARSER_VERSION + 1)
+    assert transcript_cache.transcript_cache_key(PDF, "cat1") != base
+    monkeypatch.undo()
+
+    monkeypatch.setenv("TRANSCRIPT_OCR_MIN_PAGE_CHARS", "80")
+    assert transcript_cache.transcript_cache_key(PDF, "cat1") != base
+    monkeypatch.delenv("TRANSCRIPT_OCR_MIN_PAGE_CHARS")
+
+    try:
+        normalize.set_course_aliases(courses={"CS101": "CECS174"})
+        assert transcript_cache.transcript_cache_key(PDF, "cat1") != base
+    finally:
+        normalize.set_course_aliases()
+    assert transcript_cache.transcript_cache_key(PDF, "cat1") == base
+
+
+def test_catalog_fingerprint_ignores_order():
+    assert transcript_cache.known_courses_fingerprint(["B", "A"]) == transcript_cache.known_courses_fingerprint({"A", "B"})
+    assert transcript_cache.known_courses_fingerprint(["A"]) != transcript_cache.known_courses_fingerprint(["A", "B"])
+
+
+def test_second_parse_of_same_pdf_is_a_hit(cache):
+    parser = CountingParser(_parsed())
+
+    first, first_hit = transcript_cache.parse_transcript_pdf_cached(PDF, {"CECS174"}, parse_fn=parser)
+    second, second_hit = transcript_cache.parse_transcript_pdf_cached(PDF, {"CECS174"}, parse_fn=parser)
+
+    assert (first_hit, second_hit) == (False, True)
+    assert parser.calls == 1
+    assert second == first
+
+    # A different catalog is a different key, so it parses again.
+    transcript_cache.parse_transcript_pdf_cached(PDF, {"CECS174", "CECS274"}, parse_fn=parser)
+    assert parser.calls == 2
+
+
+def test_ocr_failure_results_are_not_cached(cache):
+    parser = CountingParser(_parsed(warnings=["OCR fallback was unavailable or failed for pages 2"]))
+
+    transcript_cache.parse_transcript_pdf_cached(PDF, {"CECS174"}, parse_fn=parser)
+    _, hit = transcript_cache.parse_transcript_pdf_cached(PDF, {"CECS174"}, parse_fn=parser)
+
+    assert not hit and parser.calls == 2
+    assert cache.size() == 0
+
+
+def test_entry_that_no_longer_fits_parsed_transcript_is_dropped(cache):
+    key = transcript_cache.transcript_cache_key(PDF, transcript_cache.known_courses_fingerprint({"CECS174"}))
+    cache.set(key, {"student_name": "old layout", "removed_field": 1}, ttl_s=60)
+    parser = CountingParser(_parsed())
+
+    parsed, hit = transcript_cache.parse_transcript_pdf_cached(PDF, {"CECS174"}, parse_fn=parser)
+
+    assert not hit and parser.calls == 1 and parsed.student_name == "Ada Lovelace"
+    assert transcript_cache.transcript_cache_stats()["invalid"] == 1
+    # The bad row was replaced by the fresh parse, so the next upload is a hit.
+    _, hit = transcript_cache.parse_transcript_pdf_cached(PDF, {"CECS174"}, parse_fn=parser)
+    assert hit and parser.calls == 1
+
+
+def test_bad_entry_is_deleted_even_when_result_is_not_cacheable(cache):
+    key = transcript_cache.transcript_cache_key(PDF, transcript_cache.known_courses_fingerprint({"CECS174"}))
+    cache.set(key, {"removed_field": 1}, ttl_s=60)
+    parser = CountingParser(_parsed(warnings=["OCR fallback was unavailable or failed for pages 1"]))
+
+    transcript_cache.parse_transcript_pdf_cached(PDF, {"CECS174"}, parse_fn=parser)
+
+    assert cache.get(key) is None
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core import transcript_parser
+from app.core.transcript_parser import NO_COURSES_WARNING, _parse_text_to_courses
+
+TEXT_PAGE = "Name: ADA LOVELACE\nFall 2023\nCECS 174 Intro to Programming A 3.00\nMATH 122 Calculus I B 4.00"
+PROSE_PAGE = "This page is a letter from the registrar with plenty of ordinary readable words on it."
+
+
+@pytest.fixture
+def pages(monkeypatch):
+    """Serve a list of text-layer pages for any PDF and make every OCR attempt a no-op."""
+    layers: list[str] = []
+    monkeypatch.setattr(transcript_parser, "_extract_pdf_pages", lambda file_bytes: list(layers))
+    monkeypatch.setattr(transcript_parser, "_ocr_pages", lambda file_bytes, indexes=None: ({}, len(layers)))
+    return layers
+
+
+def test_text_without_course_rows_warns():
+    *_, courses, _, _, warnings = _parse_text_to_courses(PROSE_PAGE, set())
+
+    assert courses == []
+    assert warnings == [NO_COURSES_WARNING]
+
+
+def test_text_with_course_rows_does_not_warn():
+    *_, warnings = _parse_text_to_courses(TEXT_PAGE, set())
+    assert NO_COURSES_WARNING not in warnings
+
+
+def test_pdf_without_course_rows_warns_once_and_last(pages):
+    pages.extend([PROSE_PAGE, "Page 2 CSULB 2 of 2 with other readable text for the checker"])
+
+    parsed = transcript_parser.parse_transcript_pdf(b"%PDF", set())
+
+    assert parsed.courses == []
+    assert parsed.warnings.count(NO_COURSES_WARNING) == 1
+    assert parsed.warnings[-1] == NO_COURSES_WARNING
+
+
+SCANNED_PAGE_OCR = "Spring 2024\nPHYS 151 Mechanics B 4.00"
+
+
+# Stands in for PyMuPDF + tesseract: records which pages were asked for and returns canned text.
+class FakeOCR:
+    def __init__(self, texts: dict[int, str], total_pages: int, fail: bool = False) -> None:
+        self.texts = texts
+        self.total_pages = total_pages
+        self.fail = fail
+        self.requested: list[list[int]] = []
+
+    def __call__(self, file_bytes, page_indexes=None):
+        self.requested.append(list(page_indexes))
+        if self.fail:
+            raise RuntimeError("tesseract not installed")
+        return {index: self.texts[index] for index in page_indexes if index in self.texts}, self.total_pages
+
+
+@pytest.mark.parametrize(
+    "text, needs_ocr",
+    [
+        ("", True),
+        ("   \n\t ", True),
+        ("Page 1", True),                                                   # under 40 readable chars
+        ("§¶•€ " * 30 + "abc", True),                                        # broken font encoding
+        (TEXT_PAGE, False),
+        (PROSE_PAGE, False),
+    ],
+)
+def test_page_needs_ocr(text, needs_ocr):
+    assert transcript_parser._page_needs_ocr(text) is needs_ocr
+
+
+def test_ocr_threshold_is_configurable(monkeypatch):
+    monkeypatch.setenv("TRANSCRIPT_OCR_MIN_PAGE_CHARS", "5")
+    assert not transcript_parser._page_needs_ocr("Page 12")
+
+
+def test_ocr_text_replaces_only_pages_it_improves(monkeypatch):
+    page_texts = [TEXT_PAGE, "", "§¶•€ ab"]
+    fake = FakeOCR({1: SCANNED_PAGE_OCR, 2: "", 3: "Extra page the text layer missed"}, total_pages=4)
+    monkeypatch.setattr(transcript_parser, "_ocr_pages", fake)
+
+    replaced, rendered = transcript_parser._ocr_into_pages(b"%PDF", page_texts, [1, 2, 3])
+
+    assert fake.requested == [[1, 2, 3]]
+    assert replaced == [1, 3] and rendered == 4
+    assert page_texts == [TEXT_PAGE, SCANNED_PAGE_OCR, "§¶•€ ab", "Extra page the text layer missed"]
+
+
+def test_only_scanned_pages_are_ocrd_and_reported(pages, monkeypatch):
+    pages.extend([TEXT_PAGE, "", PROSE_PAGE])
+    fake = FakeOCR({1: SCANNED_PAGE_OCR}, total_pages=3)
+    monkeypatch.setattr(transcript_parser, "_ocr_pages", fake)
+
+    parsed = transcript_parser.parse_transcript_pdf(b"%PDF", {"PHYS151"})
+
+    assert fake.requested == [[1]]
+    assert parsed.ocr_pages == [2]                                     # 1-based
+    assert [(c["course_code"], c["term"]) for c in parsed.courses] == [
+        ("CECS174", "Fall 2023"), ("MATH122", "Fall 2023"), ("PHYS151", "Spring 2024"),
+    ]
+    assert "Used OCR for 1 of 3 page(s) where the PDF text layer was missing or unreadable." in parsed.warnings
+
+
+def test_pages_without_course_rows_get_a_second_ocr_pass(pages, monkeypatch):
+    # A readable text layer with no rows at all (e.g. text drawn as outlines) is OCR'd as a last resort.
+    pages.extend([PROSE_PAGE, PROSE_PAGE])
+    fake = FakeOCR({1: TEXT_PAGE}, total_pages=2)
+    monkeypatch.setattr(transcript_parser, "_ocr_pages", fake)
+
+    parsed = transcript_parser.parse_transcript_pdf(b"%PDF", set())
+
+    assert fake.requested == [[0, 1]]
+    assert parsed.ocr_pages == [2] and len(parsed.courses) == 2
+    assert NO_COURSES_WARNING not in parsed.warnings
+
+
+def test_ocr_failure_is_reported_once_and_not_retried(pages, monkeypatch):
+    pages.extend(["", PROSE_PAGE])
+    fake = FakeOCR({}, total_pages=2, fail=True)
+    monkeypatch.setattr(transcript_parser, "_ocr_pages", fake)
+
+    parsed = transcript_parser.parse_transcript_pdf(b"%PDF", set())
+
+    assert fake.requested == [[0]]
+    assert parsed.ocr_pages == []
+    assert parsed.warnings[0] == "OCR fallback was unavailable or failed: tesseract not installed"
+
+
+@pytest.fixture
+def three_page_pdf():
+    fitz = pytest.importorskip("fitz")
+    doc = fitz.open()
+    for number in range(1, 4):
+        doc.new_page().insert_text((72, 72), f"Scanned page {number}")
+    data = doc.tobytes()
+    # The same rendering _ocr_pages does, so the fake tesseract can tell pages apart by image.
+    images = {doc[index].get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False).tobytes("png"): index for index in range(3)}
+    doc.close()
+    return data, images
+
+
+@pytest.fixture
+def ocr_pool(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    pool = ThreadPoolExecutor(max_workers=3)
+    monkeypatch.setattr(transcript_parser, "_get_ocr_pool", lambda: pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_threaded_ocr_returns_pages_in_order_when_they_finish_out_of_order(three_page_pdf, ocr_pool, monkeypatch):
+    import time
+
+    data, images = three_page_pdf
+    finished = []
+
+    def _fake_tesseract(image_png):
+        index = images[image_png]
+        time.sleep(0.05 * (3 - index))                 # the last page finishes first
+        finished.append(index)
+        return f"text of page {index + 1}"
+
+    monkeypatch.setattr(transcript_parser, "_run_tesseract", _fake_tesseract)
+
+    texts, total = transcript_parser._ocr_pages(data, [2, 0, 1])
+    joined, _ = transcript_parser._extract_pdf_text_with_ocr(data)
+
+    assert finished[:3] == [2, 1, 0]
+    assert total == 3
+    assert texts == {0: "text of page 1", 1: "text of page 2", 2: "text of page 3"}
+    assert joined == "text of page 1\ntext of page 2\ntext of page 3"
+
+
+def test_tesseract_failure_names_the_page(three_page_pdf, ocr_pool, monkeypatch):
+    data, images = three_page_pdf
+
+    def _fake_tesseract(image_png):
+        if images[image_png] == 1:
+            raise RuntimeError("Tesseract failed: Error in pixReadMem")
+        return "ok"
+
+    monkeypatch.setattr(transcript_parser, "_run_tesseract", _fake_tesseract)
+
+    with pytest.raises(RuntimeError, match=r"page 2: Tesseract failed: Error in pixReadMem"):
+        transcript_parser._ocr_pages(data, [0, 1, 2])
+
+
+def test_run_tesseract_reports_stderr(monkeypatch):
+    import subprocess
+
+    monkeypatch.setattr(
+        transcript_parser.subprocess,
+        "run",
+        lambda *args, **kwargs: subprocess.CompletedProcess(args, 1, stdout=b"", stderr=b"Error in pixReadMem\n"),
+    )
+    with pytest.raises(RuntimeError, match="Tesseract failed: Error in pixReadMem"):
+        transcript_parser._run_tesseract(b"png")
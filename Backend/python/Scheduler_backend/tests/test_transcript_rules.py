@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core.transcript_parser import _parse_text_to_courses
+from app.core.transcript_rules import COURSE, NOISE, SUMMARY, TERM, UNPARSED, get_classifier
+
+
+@pytest.mark.parametrize(
+    "line, label",
+    [
+        ("Term GPA 3.50 Totals 15.00", SUMMARY),
+        ("Fall 2023", TERM),
+        ("Semester: fall 2023 (continued)", TERM),
+        ("CECS 174 Intro to Programming A 3.00", COURSE),
+        ("E E 381 Probability B 3.0", COURSE),             # single-letter subjects
+        ("Page 1 of 2 CSULB 2", UNPARSED),
+        ("Student ID: 012345678", NOISE),
+        ("random words here", NOISE),
+    ],
+)
+def test_default_rules_label_lines(line, label):
+    assert get_classifier("default").classify(line)[0] == label
+
+
+def test_term_text_is_the_first_term_on_the_line():
+    _, match = get_classifier("default").classify("Fall 2023 continued from Spring 2023")
+    assert match.group("term_text") == "Fall 2023"
+
+
+def test_quarter_rules():
+    classifier = get_classifier("quarter")
+
+    label, match = classifier.classify("Autumn Quarter 2023")
+    assert label == TERM and match.group("term_text") == "Autumn Quarter 2023"
+    assert classifier.classify("Cumulative GPA 3.2")[0] == SUMMARY
+    assert classifier.student_info("Student No: A123") == (None, "A123")
+
+
+def test_parse_groups_courses_by_term_and_reads_header():
+    text = "\n".join([
+        "Name: ADA LOVELACE",
+        "Student ID: 012345678",
+        "Fall 2023",
+        "CECS   174 Intro to Programming A 3.00",
+        "Term GPA 4.00",
+        "Spring 2024",
+        "E E 381 Probability B 3.0",
+    ])
+
+    name, student_id, courses, grouped, unmatched, warnings = _parse_text_to_courses(text, {"CECS174"})
+
+    assert (name, student_id) == ("ADA LOVELACE", "012345678")
+    assert [(c["course_code"], c["term"], c["matched_catalog"]) for c in courses] == [
+        ("CECS174", "Fall 2023", True),
+        ("EE381", "Spring 2024", False),
+    ]
+    assert [group["term"] for group in grouped] == ["Fall 2023", "Spring 2024"]
+    assert courses[0]["raw_line"] == "CECS 174 Intro to Programming A 3.00"   # whitespace collapsed
+    assert unmatched == [] and warnings == []
+
+
+def test_course_like_header_lines_stay_in_unmatched_lines():
+    # Matches the pre-classifier loop: student info is read from the line but it is still reported.
+    text = "Name: ADA LOVELACE CECS 2\nFall 2023\nCECS 174 Intro to Programming"
+
+    name, _, courses, _, unmatched, warnings = _parse_text_to_courses(text, set())
+
+    assert name == "ADA LOVELACE CECS 2"
+    assert unmatched == ["Name: ADA LOVELACE CECS 2"]
+    assert warnings and len(courses) == 1
+
+
+def test_student_info_is_only_read_from_the_header():
+    header = ["filler line"] * get_classifier("default").rules.student_info_lines
+    text = "\n".join(header + ["Student ID: 012345678"])
+
+    _, student_id, *_ = _parse_text_to_courses(text, set())
+
+    assert student_id is None
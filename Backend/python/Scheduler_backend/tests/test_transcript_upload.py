@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from app.api import routes
+from app.core import transcript_cache
+from app.core.body_limit import BodySizeLimitMiddleware
+from app.core.cache import SqliteTTLCache
+from app.core.jobs import JobStore
+from app.core.transcript_parser import ParsedTranscript
+
+LIMIT = 4096
+
+
+def _parsed() -> ParsedTranscript:
+    return ParsedTranscript(
+        student_name="Ada Lovelace",
+        student_id="000000001",
+        courses=[],
+        grouped_by_term=[],
+        unmatched_lines=[],
+        warnings=[],
+        total_pages=1,
+        extracted_text_chars=10,
+    )
+
+
+@pytest.fixture
+def transcripts(api, monkeypatch):
+    """The api client with a small upload limit, an in-memory parse cache and an in-process fake parser."""
+    calls = []
+
+    def _fake_parse(file_bytes, known):
+        calls.append(len(file_bytes))
+        return _parsed()
+
+    monkeypatch.setenv("TRANSCRIPT_MAX_UPLOAD_BYTES", str(LIMIT))
+    monkeypatch.setattr(routes, "parse_transcript_pdf_isolated", _fake_parse)
+    monkeypatch.setattr(routes, "TRANSCRIPT_JOBS", JobStore("transcripts-test", max_workers=2, max_pending=1))
+    monkeypatch.setattr(transcript_cache, "_transcript_cache", SqliteTTLCache(None, namespace="transcript_parse"))
+    monkeypatch.setattr(transcript_cache, "_transcript_cache_ready", True)
+    api.parse_calls = calls
+    return api
+
+
+def _multipart(payload: bytes, boundary: str = "testboundary") -> bytes:
+    return (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="t.pdf"\r\n'
+        "Content-Type: application/pdf\r\n\r\n"
+    ).encode() + payload + f"\r\n--{boundary}--\r\n".encode()
+
+
+def test_declared_oversized_upload_is_refused_before_the_route_runs(transcripts):
+    response = transcripts.post("/transcript/parse", files={"file": ("t.pdf", b"x" * (LIMIT * 40), "application/pdf")})
+
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Request body is larger")   # the middleware, not the route
+    assert transcripts.parse_calls == []
+
+
+def test_chunked_oversized_upload_is_refused(transcripts):
+    body = _multipart(b"x" * (LIMIT * 40))
+
+    def _chunks():
+        for start in range(0, len(body), 1024):
+            yield body[start:start + 1024]
+
+    response = transcripts.post(
+        "/transcript/parse",
+        content=_chunks(),
+        headers={"content-type": "multipart/form-data; boundary=testboundary"},
+    )
+
+    assert response.status_code == 413
+    assert response.json()["detail"].startswith("Request body is larger")   # the middleware, not the route
+    assert transcripts.parse_calls == []
+
+
+def test_upload_exactly_at_the_limit_is_parsed(transcripts):
+    response = transcripts.post("/transcript/parse", files={"file": ("t.pdf", b"x" * LIMIT, "application/pdf")})
+
+    assert response.status_code == 200
+    assert transcripts.parse_calls == [LIMIT]
+
+
+def test_middleware_stops_reading_once_the_body_passes_the_limit():
+    received = []
+
+    async def _app(scope, receive, send):
+        while True:
+            message = await receive()
+            if not message.get("more_body"):
+                break
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    async def _receive():
+        received.append(1)
+        return {"type": "http.request", "body": b"x" * 1000, "more_body": True}
+
+    sent = []
+
+    async def _send(message):
+        sent.append(message)
+
+    middleware = BodySizeLimitMiddleware(_app, path_prefixes=("/transcript/",), max_bytes=lambda: 2500)
+    scope = {"type": "http", "method": "POST", "path": "/transcript/parse", "headers": []}
+    asyncio.run(middleware(scope, _receive, _send))
+
+    assert len(received) == 3            # stopped on the chunk that crossed 2500 bytes
+    assert sent[0]["status"] == 413
+
+
+def test_other_paths_are_not_limited():
+    async def _app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    sent = []
+
+    async def _send(message):
+        sent.append(message)
+
+    middleware = BodySizeLimitMiddleware(_app, path_prefixes=("/transcript/",), max_bytes=lambda: 10)
+    scope = {"type": "http", "method": "POST", "path": "/schedule/generate", "headers": [(b"content-length", b"99999")]}
+    asyncio.run(middleware(scope, None, _send))
+
+    assert sent[0]["status"] == 200
+
+
+def test_cache_hit_is_answered_while_the_parse_queue_is_full(transcripts):
+    pdf = b"%PDF-1.4 cached transcript"
+    first = transcripts.post("/transcript/parse", files={"file": ("t.pdf", pdf, "application/pdf")})
+    assert first.status_code == 200 and first.json()["cache_hit"] is False
+
+    release = threading.Event()
+    blocker = routes.TRANSCRIPT_JOBS.submit("blocker", release.wait, 10)
+    try:
+        miss = transcripts.post("/transcript/jobs", files={"file": ("t.pdf", b"%PDF other", "application/pdf")})
+        assert miss.status_code == 429
+
+        hit = transcripts.post("/transcript/parse", files={"file": ("t.pdf", pdf, "application/pdf")})
+        assert hit.status_code == 200 and hit.json()["cache_hit"] is True
+
+        job = transcripts.post("/transcript/jobs", files={"file": ("t.pdf", pdf, "application/pdf")})
+        assert job.status_code == 202
+        assert job.json()["status"] == "done" and job.json()["result"]["cache_hit"] is True
+        polled = transcripts.get(f"/transcript/jobs/{job.json()['job_id']}")
+        assert polled.json()["status"] == "done"
+    finally:
+        release.set()
+        routes.TRANSCRIPT_JOBS.wait(blocker.id, 5)
+
+    assert len(transcripts.parse_calls) == 1
+    assert routes.TRANSCRIPT_JOBS.rejected == 1
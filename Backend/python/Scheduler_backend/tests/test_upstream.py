@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.upstream import CircuitBreaker, CircuitOpenError, UpstreamClient, UpstreamError
+
+
+def test_breaker_opens_half_opens_and_closes():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout_s=0.1)
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow()
+
+    time.sleep(0.12)
+    assert breaker.state == "half_open"
+    assert breaker.allow()          # the single probe
+    assert not breaker.allow()      # everyone else still fails fast
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_failed_probe_reopens_immediately():
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_s=0.05)
+    for _ in range(3):
+        breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.record_failure()
+    assert breaker.state == "open"
+
+
+# Serves a scripted sequence of status codes to POST requests.
+@pytest.fixture
+def scripted_server():
+    statuses = []
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            return
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            status = statuses.pop(0) if statuses else 200
+            hits.append(status)
+            body = json.dumps({"ok": status < 400}).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/", statuses, hits
+    server.shutdown()
+
+
+def _client(**overrides):
+    settings = dict(retries=2, backoff_base_s=0.001, backoff_max_s=0.002, failure_threshold=3, reset_timeout_s=30)
+    settings.update(overrides)
+    return UpstreamClient("test", **settings)
+
+
+def test_client_errors_do_not_trip_the_breaker(scripted_server):
+    url, statuses, hits = scripted_server
+    client = _client()
+    statuses.extend([400, 401, 404, 422, 400, 403])
+    for _ in range(6):
+        with pytest.raises(UpstreamError) as info:
+            client.post_json(url, {})
+        assert info.value.status in {400, 401, 403, 404, 422}
+
+    assert len(hits) == 6             # not retried
+    assert client.breaker.state == "closed"
+    assert client.snapshot()["client_errors"] == 6
+    assert client.post_json(url, {}) == {"ok": True}
+
+
+def test_server_errors_are_retried_then_open_the_breaker(scripted_server):
+    url, statuses, hits = scripted_server
+    client = _client(retries=1)
+    statuses.extend([503] * 6)
+    for _ in range(3):
+        with pytest.raises(UpstreamError):
+            client.post_json(url, {})
+    assert len(hits) == 6             # one retry per call
+    assert client.breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        client.post_json(url, {})
+    assert len(hits) == 6             # failed fast, no I/O
+
+
+def test_retry_recovers_from_transient_error(scripted_server):
+    url, statuses, hits = scripted_server
+    client = _client()
+    statuses.extend([502])
+    assert client.post_json(url, {}) == {"ok": True}
+    assert hits == [502, 200]
+    assert client.snapshot()["retries"] == 1
+
+
+def test_network_errors_count_as_failures():
+    client = _client(retries=0, failure_threshold=2, connect_timeout_s=0.2)
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            client.post_json("http://127.0.0.1:9/", {})
+    assert client.breaker.state == "open"
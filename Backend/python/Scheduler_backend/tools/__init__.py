@@ -0,0 +1 @@
+"""Local development helpers (stand-in upstream servers, sync CLIs)."""
@@ -0,0 +1,186 @@
+"""Local stand-in for the RateMyProfessors GraphQL endpoint.
+
+Answers the three queries the backend sends (school search, teacher search and
+the paginated directory query) from a deterministic synthetic roster, so the
+rating lookup and directory sync can be exercised offline.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m tools.fake_rmp_server [--port 8765] [--teachers 3000] [--latency-ms 0]
+    RMP_GRAPHQL_URL=http://127.0.0.1:8765/graphql uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+SCHOOL_ID = base64.b64encode(b"School-18846").decode("ascii")
+SCHOOL_NAME = "California State University Long Beach"
+
+FIRST_NAMES = [
+    "Alice", "Brian", "Carmen", "David", "Elena", "Farid", "Grace", "Hector", "Irene", "James",
+    "Kavya", "Luis", "Maria", "Nguyen", "Olivia", "Pedro", "Quinn", "Rosa", "Samuel", "Tara",
+]
+LAST_NAMES = [
+    "Anderson", "Bautista", "Chen", "Delgado", "Evans", "Flores", "Garcia", "Hernandez", "Ito", "Johnson",
+    "Kim", "Lopez", "Martinez", "Nakamura", "Ortiz", "Patel", "Quintero", "Ramirez", "Singh", "Tran",
+    "Umali", "Vasquez", "Williams", "Xu", "Yamamoto", "Zhang",
+]
+DEPARTMENTS = ["Computer Science", "Mathematics", "Physics", "English", "History", "Biology", "Chemistry"]
+
+
+def synthetic_teachers(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    teachers: List[Dict[str, Any]] = []
+    for i in range(count):
+        first = FIRST_NAMES[i % len(FIRST_NAMES)]
+        last = LAST_NAMES[(i // len(FIRST_NAMES)) % len(LAST_NAMES)]
+        # Past the first full cycle, suffix last names so every teacher stays distinct.
+        cycle = i // (len(FIRST_NAMES) * len(LAST_NAMES))
+        if cycle:
+            last = f"{last}{chr(ord('a') + (cycle - 1) % 26)}"
+        legacy_id = 100000 + i
+        teachers.append(
+            {
+                "id": base64.b64encode(f"Teacher-{legacy_id}".encode()).decode("ascii"),
+                "legacyId": legacy_id,
+                "firstName": first,
+                "lastName": last,
+                "department": DEPARTMENTS[i % len(DEPARTMENTS)],
+                "avgRating": round(rng.uniform(1.5, 5.0), 1),
+                "avgDifficulty": round(rng.uniform(1.0, 5.0), 1),
+                "wouldTakeAgainPercent": round(rng.uniform(20, 100), 1),
+                "numRatings": rng.randint(0, 150),
+                "school": {"id": SCHOOL_ID, "name": SCHOOL_NAME},
+            }
+        )
+    return teachers
+
+
+def _matches(teacher: Dict[str, Any], text: str) -> bool:
+    haystack = f"{teacher['firstName']} {teacher['lastName']}".lower()
+    return all(token in haystack for token in text.lower().split())
+
+
+class FakeRMPState:
+    def __init__(self, teachers: List[Dict[str, Any]], latency_ms: float = 0.0) -> None:
+        self.teachers = teachers
+        self.latency_ms = latency_ms
+        self.lock = threading.Lock()
+        self.requests: Dict[str, int] = {}
+
+    def count(self, operation: str) -> None:
+        with self.lock:
+            self.requests[operation] = self.requests.get(operation, 0) + 1
+
+    def answer(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        if "NewSearchSchoolsQuery" in query:
+            self.count("schools")
+            return {"data": {"newSearch": {"schools": {"edges": [
+                {"node": {"id": SCHOOL_ID, "legacyId": 18846, "name": SCHOOL_NAME, "city": "Long Beach", "state": "CA"}}
+            ]}}}}
+
+        search = variables.get("query") or {}
+        text = str(search.get("text") or "")
+        if "TeacherDirectoryPageQuery" in query:
+            self.count("directory_page")
+            first = int(variables.get("first") or 1000)
+            after = variables.get("after") or ""
+            start = int(after) if str(after).isdigit() else 0
+            page = self.teachers[start:start + first]
+            end = start + len(page)
+            return {"data": {"search": {"teachers": {
+                "edges": [{"cursor": str(start + i + 1), "node": node} for i, node in enumerate(page)],
+                "pageInfo": {"hasNextPage": end < len(self.teachers), "endCursor": str(end)},
+            }}}}
+
+        self.count("teacher_search")
+        found = [t for t in self.teachers if _matches(t, text)][:1000]
+        return {"data": {
+            "search": {"teachers": {"edges": [{"node": node} for node in found]}},
+            "school": {"__typename": "School", "name": SCHOOL_NAME, "id": SCHOOL_ID},
+        }}
+
+
+def make_handler(state: FakeRMPState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            return
+
+        def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path.rstrip("/") == "/stats":
+                with state.lock:
+                    self._send_json(200, {"teachers": len(state.teachers), "requests": dict(state.requests)})
+                return
+            self._send_json(404, {"error": "not found"})
+
+        def do_POST(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"errors": [{"message": "invalid JSON"}]})
+                return
+            if state.latency_ms:
+                time.sleep(state.latency_ms / 1000)
+            self._send_json(200, state.answer(str(payload.get("query") or ""), payload.get("variables") or {}))
+
+    return Handler
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    teachers: Optional[List[Dict[str, Any]]] = None,
+    latency_ms: float = 0.0,
+) -> ThreadingHTTPServer:
+    """Start the server on a daemon thread and return it (call .shutdown() to stop)."""
+    state = FakeRMPState(teachers if teachers is not None else synthetic_teachers(3000), latency_ms)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fake-rmp", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--teachers", type=int, default=3000, help="size of the synthetic roster")
+    parser.add_argument("--teachers-json", help="serve this JSON list of teacher nodes instead")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="artificial delay per request")
+    args = parser.parse_args()
+
+    if args.teachers_json:
+        with open(args.teachers_json, encoding="utf-8") as handle:
+            roster = json.load(handle)
+    else:
+        roster = synthetic_teachers(args.teachers)
+
+    server = serve(args.host, args.port, roster, args.latency_ms)
+    print(f"Fake RMP GraphQL on http://{args.host}:{server.server_address[1]}/graphql ({len(roster)} teachers)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Re-run pick_ranked_schedules on an input captured by a debug profile.
+
+Profiled /term/schedule requests save the solver's exact input as
+`<profile id>.inputs.json` (download it from
+`/debug/profiles/<id>/inputs`). This rebuilds the sections and runs the
+search locally, optionally under cProfile, so a slow production input can be
+reproduced without Supabase or the rest of the request.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m tools.replay_solver_input profile.inputs.json [--repeat 5] [--profile]
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import json
+import pstats
+import time
+from typing import Any, Dict, List
+
+from app.core.section_models import MeetingBlock, SectionOption
+from app.core.section_scheduler import SearchStats, pick_ranked_schedules
+
+
+def load_solver_input(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as handle:
+        payload = json.load(handle)
+    captured = payload.get("pick_ranked_schedules")
+    if captured is None:
+        raise SystemExit(f"{path} has no pick_ranked_schedules input.")
+
+    options_by_course: Dict[str, List[SectionOption]] = {}
+    for course, sections in captured["options_by_course"].items():
+        options_by_course[course] = [
+            SectionOption(
+                **{
+                    **section,
+                    "meetings": [MeetingBlock(**{**meeting, "days": set(meeting["days"])}) for meeting in section["meetings"]],
+                }
+            )
+            for section in sections
+        ]
+    return {
+        "options_by_course": options_by_course,
+        "buffer_min": captured.get("buffer_min", 0),
+        "max_results": captured.get("max_results", 5),
+        "ranking_preference": captured.get("ranking_preference", "compact"),
+        "preferred_sections": captured.get("preferred_sections") or {},
+        "preferred_professors": set(captured.get("preferred_professors") or []),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", help="Path to a <profile id>.inputs.json artifact.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--profile", action="store_true", help="Print the top functions of one extra cProfile run.")
+    args = parser.parse_args()
+
+    kwargs = load_solver_input(args.inputs)
+    sizes = {course: len(options) for course, options in kwargs["options_by_course"].items()}
+    print(f"{len(sizes)} courses, section options per course: {sizes}")
+
+    best = float("inf")
+    stats = SearchStats()
+    for _ in range(args.repeat):
+        stats = SearchStats()
+        started = time.perf_counter()
+        ranked, failures = pick_ranked_schedules(**kwargs, stats=stats)
+        best = min(best, time.perf_counter() - started)
+    print(f"best of {args.repeat}: {best * 1000:.1f} ms, {len(ranked)} schedules, failures={failures}")
+    print(
+        f"nodes={stats.nodes} leaves={stats.leaves} conflict_checks={stats.conflict_checks} pruned={stats.pruned} "
+        f"duplicates={stats.duplicates} candidates={stats.candidates} budget_exhausted={stats.budget_exhausted}"
+    )
+
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.runcall(pick_ranked_schedules, **kwargs)
+        pstats.Stats(profiler).sort_stats("tottime").print_stats(15)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Download the school's RMP teacher directory into RMP_DIRECTORY_PATH.
+
+Usage (from Backend/python/Scheduler_backend):
+    python -m tools.sync_rmp_directory [--school "California State University Long Beach"]
+    RMP_GRAPHQL_URL=http://127.0.0.1:8765/graphql python -m tools.sync_rmp_directory
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from app.core.rmp_client import sync_instructor_directory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--school", default=None, help="school name (defaults to RMP_SCHOOL_NAME)")
+    parser.add_argument("--page-size", type=int, default=1000)
+    args = parser.parse_args()
+    print(json.dumps(sync_instructor_directory(args.school, page_size=args.page_size), indent=2))
+
+
+if __name__ == "__main__":
+    main()